@@ -25,7 +25,7 @@ def apply_commission_update():
         
         # Check if commission_type column already exists
         cursor.execute("PRAGMA table_info(customers)")
-        columns = [col[1] for col in cursor.fetchall()]
+        columns = {col[1] for col in cursor.fetchall()}
         
         if 'commission_type' in columns:
             print("✅ commission_type column already exists in customers table")
@@ -39,20 +39,14 @@ def apply_commission_update():
             with open(sql_file, 'r') as f:
                 sql_content = f.read()
             
-            # Execute the SQL commands
-            for statement in sql_content.split(';'):
-                statement = statement.strip()
-                if statement:
-                    try:
-                        cursor.execute(statement)
-                        print(f"✅ Executed: {statement[:50]}...")
-                    except sqlite3.OperationalError as e:
-                        if "duplicate column name" in str(e):
-                            print(f"⚠️  Column already exists, skipping...")
-                        else:
-                            raise
-            
-            conn.commit()
+            # Let SQLite tokenize and run the whole file in one transaction;
+            # the duplicate column case is already handled by the check above
+            try:
+                cursor.executescript(f"BEGIN IMMEDIATE;\n{sql_content}\nCOMMIT;")
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
             print("✅ Successfully added commission_type field!")
         else:
             # If SQL file doesn't exist, execute directly
@@ -77,11 +71,9 @@ def apply_commission_update():
                 else:
                     raise
         
-        # Verify the update
+        # Verify the update by re-reading the table schema
         cursor.execute("PRAGMA table_info(customers)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'commission_type' in columns:
+        if 'commission_type' in {col[1] for col in cursor.fetchall()}:
             print("✅ Verified: commission_type column is now in customers table")
             
             # Show current customers with their commission types
@@ -3,9 +3,18 @@
 
 import sys
 import os
+import logging
 from pathlib import Path
 import time
-from datetime import datetime, date
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from heapq import nsmallest
+from io import StringIO
+from operator import attrgetter
 
 # Add src directory to Python path
 src_path = Path(__file__).parent / "src"
@@ -13,11 +22,695 @@ sys.path.insert(0, str(src_path))
 
 import dearpygui.dearpygui as dpg
 
+# Advanced parsing system, imported once; the GUI falls back to simple mode without it
+try:
+    from src.business.data_processor import DataProcessor, ProcessingContext
+    _HAS_ADV = True
+except ImportError:
+    _HAS_ADV = False
+
+logger = logging.getLogger(__name__)
+
 # Global variables
 customers = []
+customers_by_name = {}  # name -> customer, kept in step with customers
+customers_by_id = {}  # id -> customer, kept in step with customers
+customer_names = []  # combo items, kept in step with customers
+_color_cache = {}  # customer name -> commission-type display color
+_combo_items = {}  # filter combo item lists, dropped whenever customers or bazars change
+_preview_state = {'preview': None}  # (entries, total, text) currently shown in the preview widgets
+_row_state = {}  # table tag -> {row key: (row tag, cell tags, cells)} for tables refreshed by patch_table_rows
 bazars = []
+_bazar_name_set = set()  # lowercased bazar names, kept in step with bazars
+bazar_name_by_display = {}  # display name -> bazar name, kept in step with bazars
 db_manager = None
 config_manager = None
+_processor = None  # Shared DataProcessor (parsers + calculation engine), built on first use
+
+# Debounced callbacks: a burst of requests under one name (keystrokes, date or
+# filter changes) collapses into a single call, run from the main loop once the
+# name has been quiet for its delay
+INPUT_DEBOUNCE_SECONDS = 0.15
+REFRESH_DEBOUNCE_SECONDS = 0.1
+_scheduled = {}  # name -> (deadline, callback)
+
+# Background database reads: fetches run on a small worker pool and their
+# results are rendered from the main loop, since widgets must be touched on the GUI thread
+_db_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="db-fetch")
+_fetch_results = queue.Queue()  # (name, generation, render, future) of finished fetches
+_fetch_generation = {}  # name -> number of the latest fetch, older results are dropped
+
+_last_render = {}  # table name -> (filter key, database data version) it was last rendered for
+
+# Pana and jodi values per (bazar, date, customer), read together in one call so filter-only
+# changes and switching between the pana and jodi tabs skip the database; an entry is only
+# used while the database data version it was read at is current
+TABLE_CACHE_SIZE = 32
+_slice_cache = OrderedDict()  # (bazar, date, customer or None for all) -> (data version, (pana values, jodi values))
+_cache_stats = {}  # cache name -> [hits, lookups], logged every CACHE_STATS_EVERY lookups
+CACHE_STATS_EVERY = 50
+
+# After a pana refresh the previous day and the neighbouring bazars are read into
+# _slice_cache in the background, as users tend to step to those next
+PREFETCH_LIMIT = 2
+_prefetching = set()  # cache keys being prefetched, at most PREFETCH_LIMIT
+_built_tabs = set()  # table window tabs whose contents have been built
+_date_picker_state = {'target': None}  # (table, date display tag, refresh) whose date button opened the shared date picker
+
+def get_data_processor():
+    """Get the shared DataProcessor, creating it on first use"""
+    global _processor
+    if _processor is None:
+        _processor = DataProcessor(db_manager)
+    return _processor
+
+def index_customers():
+    """Rebuild the name/id lookups for the loaded customers"""
+    global customers_by_name, customers_by_id, customer_names
+    customers_by_name = {c["name"]: c for c in customers}
+    customers_by_id = {c["id"]: c for c in customers}
+    customer_names = [c["name"] for c in customers]
+    _combo_items.pop("customers", None)
+
+def add_customer_record(customer):
+    """Append a customer and register it in the name/id lookups"""
+    customers.append(customer)
+    customers_by_name[customer["name"]] = customer
+    customers_by_id[customer["id"]] = customer
+    customer_names.append(customer["name"])
+    _combo_items.pop("customers", None)
+
+def index_bazars():
+    """Rebuild the bazar name lookups and drop the combo item lists built from the previous bazar list"""
+    global _bazar_name_set, bazar_name_by_display
+    _bazar_name_set = {b["name"].lower() for b in bazars}
+    # The first bazar with a display name wins, as with a front-to-back scan
+    bazar_name_by_display = {b["display_name"]: b["name"] for b in reversed(bazars)}
+    _combo_items.pop("bazars", None)
+    _combo_items.pop("all_bazars", None)
+
+def add_bazar_record(bazar):
+    """Append a bazar, register its name and drop the combo item lists built from the old list"""
+    bazars.append(bazar)
+    _bazar_name_set.add(bazar["name"].lower())
+    bazar_name_by_display.setdefault(bazar["display_name"], bazar["name"])
+    _combo_items.pop("bazars", None)
+    _combo_items.pop("all_bazars", None)
+
+def customer_filter_items():
+    """Customer filter combo items ("All Customers" first), built once per customer list"""
+    items = _combo_items.get("customers")
+    if items is None:
+        items = _combo_items["customers"] = ["All Customers"] + customer_names
+    return items
+
+def bazar_display_names():
+    """Bazar combo items (display names), built once per bazar list"""
+    items = _combo_items.get("bazars")
+    if items is None:
+        items = _combo_items["bazars"] = [b["display_name"] for b in bazars]
+    return items
+
+def bazar_filter_items():
+    """Bazar filter combo items ("All Bazars" first), built once per bazar list"""
+    items = _combo_items.get("all_bazars")
+    if items is None:
+        items = _combo_items["all_bazars"] = ["All Bazars"] + bazar_display_names()
+    return items
+
+def set_item_enabled(tag, enabled):
+    """Enable or disable a widget (setter for apply_widget_updates)"""
+    dpg.configure_item(tag, enabled=enabled)
+
+def set_item_default(tag, value):
+    """Replace a widget's default value (setter for apply_widget_updates)"""
+    dpg.configure_item(tag, default_value=value)
+
+def apply_widget_updates(updates):
+    """Apply precomputed (setter, tag, value) updates in one pass under the render lock"""
+    with dpg.mutex():
+        for setter, tag, value in updates:
+            setter(tag, value)
+
+def render_is_current(name, filter_key):
+    """True if table name already shows filter_key and the database has not changed since, otherwise record the new state"""
+    if db_manager is None:
+        return False
+    stamp = (filter_key, db_manager.data_version())
+    if _last_render.get(name) == stamp:
+        return True
+    _last_render[name] = stamp
+    return False
+
+def store_table_values(cache, key, version, values):
+    """Cache values for key as read at data version, dropping the oldest entry when full"""
+    cache[key] = (version, values)
+    cache.move_to_end(key)
+    if len(cache) > TABLE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def count_cache_lookup(name, hit):
+    """Count a lookup in cache name, logging its hit rate every CACHE_STATS_EVERY lookups"""
+    stats = _cache_stats.setdefault(name, [0, 0])
+    stats[0] += hit
+    stats[1] += 1
+    if stats[1] % CACHE_STATS_EVERY == 0:
+        logger.debug("%s cache: %d/%d lookups hit", name, stats[0], stats[1])
+
+def load_table_values(name, cache, key, fetch, render, empty):
+    """Pass key's values to render, from cache while still current, otherwise fetch() them on the worker pool and cache them (empty if that fails)"""
+    version = db_manager.data_version()  # taken before the read, so a concurrent write leaves the entry stale
+    entry = cache.get(key)
+    hit = entry is not None and entry[0] == version
+    count_cache_lookup(name, hit)
+    if hit:
+        cache.move_to_end(key)
+        supersede_fetches(name)
+        render(entry[1])
+        return
+    
+    def store_and_render(future):
+        try:
+            values = future.result()
+        except Exception as e:
+            print(f"Database error: {e}")
+            _last_render.pop(name, None)  # Retry on the next refresh
+            values = empty  # Show empty table
+        else:
+            store_table_values(cache, key, version, values)
+        render(values)
+    
+    fetch_in_background(name, fetch, store_and_render)
+
+def prefetch_table_values(cache, key, fetch):
+    """Read key's values into cache on the worker pool, unless they are current, already coming or PREFETCH_LIMIT prefetches are running"""
+    if key in _prefetching or len(_prefetching) >= PREFETCH_LIMIT:
+        return
+    version = db_manager.data_version()
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return
+    
+    def store(future):
+        _prefetching.discard(key)
+        try:
+            values = future.result()
+        except Exception:
+            return  # A refresh that needs these values fetches and reports it again
+        store_table_values(cache, key, version, values)
+    
+    _prefetching.add(key)
+    future = _db_pool.submit(fetch)
+    future.add_done_callback(lambda done: _fetch_results.put((None, None, store, done)))
+
+def prefetch_pana_neighbours(bazar_name, date_str):
+    """Prefetch the pana values of the previous day and of the bazars before and after bazar_name"""
+    try:
+        previous_day = (date.fromisoformat(date_str) - timedelta(days=1)).isoformat()
+    except ValueError:
+        return
+    neighbours = [(bazar_name, previous_day)]
+    names = [b["name"] for b in bazars]
+    if bazar_name in names:
+        index = names.index(bazar_name)
+        neighbours += [(names[i], date_str) for i in (index - 1, index + 1) if 0 <= i < len(names)]
+    for neighbour_bazar, neighbour_date in neighbours:
+        prefetch_table_values(_slice_cache, (neighbour_bazar, neighbour_date, None),
+                              lambda b=neighbour_bazar, d=neighbour_date: load_bazar_date_values(b, d))
+
+# Pana and jodi values are kept in lists indexed by number (0-999 and 00-99)
+PANA_NUMBERS = 1000
+JODI_NUMBERS = 100
+NO_PANA_VALUES = (0,) * PANA_NUMBERS
+NO_JODI_VALUES = (0,) * JODI_NUMBERS
+
+NO_SLICE_VALUES = (NO_PANA_VALUES, NO_JODI_VALUES)
+
+def load_bazar_date_values(bazar_name, date_str, customer_name=None):
+    """Get a bazar's (pana values, jodi values) for a date as lists indexed by number, jodi values for one customer or all when customer_name is None"""
+    pana_values = [0] * PANA_NUMBERS
+    jodi_values = [0] * JODI_NUMBERS
+    if hasattr(db_manager, 'get_bazar_date_slice'):
+        pana_data, jodi_data = db_manager.get_bazar_date_slice(bazar_name, date_str, customer_name)
+        # All rows share one shape, so check it once (Row object or dict) rather than per row
+        if pana_data and hasattr(pana_data[0], '__getitem__'):
+            for entry in pana_data:
+                if 0 <= entry['number'] < PANA_NUMBERS:
+                    pana_values[entry['number']] = entry['value']
+        if jodi_data and hasattr(jodi_data[0], '__getitem__'):
+            for entry in jodi_data:
+                if 0 <= entry['jodi_number'] < JODI_NUMBERS:
+                    jodi_values[entry['jodi_number']] = entry['value']
+    return pana_values, jodi_values
+
+def add_row_cells(cells, parent, before=0):
+    """Add a table row of (text, color) cells, returning (row tag, cell tags)"""
+    with dpg.table_row(parent=parent, before=before) as row:
+        cell_tags = tuple(dpg.add_text(text) if color is None else dpg.add_text(text, color=color)
+                          for text, color in cells)
+    return row, cell_tags
+
+@contextmanager
+def staged_into(container):
+    """Build items in a staging container and move them all into container when the block ends"""
+    with dpg.stage() as staging:
+        try:
+            yield staging
+        except Exception:
+            dpg.delete_item(staging)
+            raise
+    dpg.push_container_stack(container)
+    try:
+        dpg.unstage(staging)
+    finally:
+        dpg.pop_container_stack()
+
+def patch_table_rows(table, rows):
+    """Bring a table's rows in line with `rows`, a list of (key, cells) in display order.
+    
+    Rows whose key is gone are deleted, new keys get a row at their position and
+    rows that are still present only have their changed cells updated.
+    """
+    state = _row_state.setdefault(table, {})
+    wanted = dict(rows)
+    with dpg.mutex():
+        if not state:
+            # Nothing shown yet, so every row is new: build them off-table and attach them at once
+            with staged_into(table) as staging:
+                for key, cells in rows:
+                    row, cell_tags = add_row_cells(cells, staging)
+                    state[key] = (row, cell_tags, cells)
+            return
+        
+        for key in [key for key in state if key not in wanted]:
+            dpg.delete_item(state.pop(key)[0])
+        
+        # Walk bottom-up so each new row can be inserted above the row that follows it
+        next_row = 0
+        for key, cells in reversed(rows):
+            current = state.get(key)
+            if current is None:
+                row, cell_tags = add_row_cells(cells, table, next_row)
+                state[key] = (row, cell_tags, cells)
+            else:
+                row, cell_tags, old_cells = current
+                if cells != old_cells:
+                    for tag, (text, color), (old_text, old_color) in zip(cell_tags, cells, old_cells):
+                        if text != old_text:
+                            dpg.set_value(tag, text)
+                        if color != old_color and color is not None:
+                            dpg.configure_item(tag, color=color)
+                    state[key] = (row, cell_tags, cells)
+            next_row = row
+
+def schedule_callback(name, callback, delay=REFRESH_DEBOUNCE_SECONDS):
+    """Run callback once no further request for name arrives within delay (the latest callback wins)"""
+    _scheduled[name] = (time.monotonic() + delay, callback)
+
+def on_refresh_requested(sender, app_data, user_data):
+    """Widget callback that schedules a debounced refresh, user_data is (name, refresh function)"""
+    schedule_callback(*user_data)
+
+def fetch_in_background(name, fetch, render):
+    """Run fetch on the worker pool and pass its future to render on the GUI thread"""
+    generation = _fetch_generation[name] = _fetch_generation.get(name, 0) + 1
+    future = _db_pool.submit(fetch)
+    future.add_done_callback(lambda done: _fetch_results.put((name, generation, render, done)))
+
+def supersede_fetches(name):
+    """Drop the result of any fetch still running for name (its table was just drawn without it)"""
+    _fetch_generation[name] = _fetch_generation.get(name, 0) + 1
+
+def drain_fetch_results():
+    """Render the background fetches that have finished (called every frame)"""
+    while True:
+        try:
+            name, generation, render, future = _fetch_results.get_nowait()
+        except queue.Empty:
+            return
+        # A newer fetch for the same table supersedes this one (prefetches have no name and are always kept)
+        if name is None or _fetch_generation.get(name) == generation:
+            render(future)
+
+def run_scheduled_callbacks():
+    """Run the scheduled callbacks whose quiet period has passed (called every frame)"""
+    if not _scheduled:
+        return
+    now = time.monotonic()
+    for name in [name for name, (deadline, _) in _scheduled.items() if deadline <= now]:
+        _scheduled.pop(name)[1]()
+
+def _iso(d):
+    """YYYY-MM-DD string for a date (same as strftime("%Y-%m-%d"), without the strftime overhead)"""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+@lru_cache(maxsize=256)
+def _date_dict_to_iso(year, month, day):
+    """YYYY-MM-DD string for a date picker value (month is 0-based)"""
+    return _iso(date(year, month + 1, day))
+
+@lru_cache(maxsize=1)
+def _ordinal_to_iso(ordinal):
+    """YYYY-MM-DD string for a date ordinal (only today's is kept)"""
+    return _iso(date.fromordinal(ordinal))
+
+def _iso_to_date_dict(iso):
+    """Date picker value for a YYYY-MM-DD string (month is 0-based)"""
+    return {'month_day': int(iso[8:10]), 'month': int(iso[5:7]) - 1, 'year': int(iso[:4])}
+
+def _today_iso_cached():
+    """Today's date as YYYY-MM-DD, formatted once per day"""
+    return _ordinal_to_iso(date.today().toordinal())
+
+# Customer name colors by commission type
+_BLUE = (52, 152, 219, 255)  # Commission
+_ORANGE = (230, 126, 34, 255)  # Non-commission
+
+# Filler cells for placeholder table rows
+_GRAY = (150, 150, 150, 255)
+_EMPTY_CELLS = (("", None),) * 12
+_EMPTY_GRAY_CELLS = (("", _GRAY),) * 12
+_DASH_CELLS = (("-", None),) * 12
+
+# Pana grid layout: 10 numbers per row, upper section (12 rows) above the
+# separator row and lower section (10 rows) below it
+PANA_UPPER_SECTION = (
+    (128, 129, 120, 130, 140, 123, 124, 125, 126, 127),
+    (137, 138, 139, 149, 159, 150, 160, 134, 135, 136),
+    (146, 147, 148, 158, 168, 169, 179, 170, 180, 145),
+    (236, 156, 157, 167, 230, 178, 250, 189, 234, 190),
+    (245, 237, 238, 239, 249, 240, 269, 260, 270, 235),
+    (290, 246, 247, 248, 258, 259, 278, 279, 289, 280),
+    (380, 345, 256, 257, 267, 268, 340, 350, 360, 370),
+    (470, 390, 346, 347, 348, 349, 359, 369, 379, 389),
+    (489, 480, 490, 356, 357, 358, 368, 378, 450, 460),
+    (560, 570, 580, 590, 456, 367, 458, 459, 478, 479),
+    (579, 589, 670, 680, 690, 457, 467, 468, 469, 569),
+    (678, 679, 689, 789, 780, 790, 890, 567, 568, 578),
+)
+PANA_LOWER_SECTION = (
+    (100, 110, 166, 112, 113, 114, 115, 116, 117, 118),
+    (119, 200, 229, 220, 122, 277, 133, 224, 144, 226),
+    (155, 228, 300, 266, 177, 330, 188, 233, 199, 244),
+    (227, 255, 337, 338, 339, 448, 223, 288, 225, 299),
+    (335, 336, 355, 400, 366, 466, 377, 440, 388, 334),
+    (344, 499, 445, 446, 447, 556, 449, 477, 559, 488),
+    (399, 660, 599, 455, 500, 880, 557, 558, 577, 550),
+    (588, 688, 779, 699, 799, 899, 566, 800, 667, 668),
+    (669, 778, 788, 770, 889, 600, 700, 990, 900, 677),
+    (777, 444, 111, 888, 555, 222, 999, 666, 333, 0),
+)
+
+# Jodi number -> time table column, by tens digit:
+#   Col 1: 11,12,13,14,15,16,17,18,19,10
+#   Col 2: 21,22,23,24,25,26,27,28,29,20
+#   ...
+#   Col 0: 01,02,03,04,05,06,07,08,09,00
+_JODI_COL = tuple(jodi_number // 10 for jodi_number in range(100))
+
+def _jodi_grid_number(row, col):
+    """Jodi number shown at (row, col) of the 10x10 jodi grid"""
+    if col == 9:  # Last column (0X numbers)
+        if row == 9:  # Last row, last column = 00
+            return 0
+        return row + 1  # Other rows in last column = 1,2,3,4,5,6,7,8,9
+    tens_digit = col + 1  # Other columns (1X, 2X, ..., 9X)
+    if row == 9:  # Last row = X0 (10,20,30,40,50,60,70,80,90)
+        return tens_digit * 10
+    return tens_digit * 10 + (row + 1)  # Other rows = X1,X2,...,X9
+
+# Jodi grid layout and its two-digit labels:
+#   Row 1: 11, 21, 31, 41, 51, 61, 71, 81, 91, 1
+#   Row 2: 12, 22, 32, 42, 52, 62, 72, 82, 92, 2
+#   ...
+#   Row 9: 19, 29, 39, 49, 59, 69, 79, 89, 99, 9
+#   Row 10: 10, 20, 30, 40, 50, 60, 70, 80, 90, 0
+JODI_GRID = tuple(tuple(_jodi_grid_number(row, col) for col in range(10)) for row in range(10))
+JODI_LABELS = tuple(tuple(f"{jodi_number:02d}" for jodi_number in grid_row) for grid_row in JODI_GRID)
+
+# Grid cell colors
+_GREEN = (39, 174, 96, 255)  # Non-zero value
+_MUTED = (108, 117, 125, 255)  # Zero or filtered-out value
+
+# The pana and jodi grids are always 10 (number, value) pairs wide
+GRID_PAIRS = 10
+_GRID_SEPARATOR_CELLS = (("", (200, 200, 200, 255)),) * (2 * GRID_PAIRS)  # Empty row between the pana sections
+
+# (label, width) of the grid table columns: a number and a value column per pair
+_PANA_COLS = (("Number", 60), ("Value", 60)) * GRID_PAIRS
+_JODI_COLS = tuple(column for header in "1234567890" for column in ((header, 35), ("", 40)))
+
+# Constant preview fragments (the preview separates lines with a literal "\\n")
+_NL = "\\n"
+_HR = "=" * 40 + _NL
+
+SUBTOTAL_FIELDS = ('pana_total', 'type_total', 'time_total', 'multi_total', 'direct_total', 'jodi_total')
+
+_entry_value = attrgetter('value')
+_entry_number = attrgetter('number')
+
+def group_numbers_by_value(entries):
+    """Group entry numbers by value, in first-seen value order"""
+    # Pull the value and number columns out of the entry objects first, then group
+    groups = defaultdict(list)
+    for value, number in zip(map(_entry_value, entries), map(_entry_number, entries)):
+        groups[value].append(number)
+    return groups
+
+def head_numbers_by_value(entries, keep):
+    """Group entries by value in one pass, keeping only the first `keep` numbers plus a count per value"""
+    groups = {}
+    for value, number in zip(map(_entry_value, entries), map(_entry_number, entries)):
+        group = groups.get(value)
+        if group is None:
+            groups[value] = [[number], 1]
+        else:
+            if group[1] < keep:
+                group[0].append(number)
+            group[1] += 1
+    return groups
+
+@lru_cache(maxsize=128)
+def build_input_preview(input_text: str):
+    """Parse and calculate input text, returning (total_entries, total_value, preview_text) or None if nothing parsed"""
+    processor = get_data_processor()
+    parsed_result = processor.mixed_parser.parse(input_text)
+    if parsed_result.is_empty:
+        return None
+    
+    # Bind each entry list once
+    pana = parsed_result.pana_entries or []
+    ttype = parsed_result.type_entries or []
+    time_e = parsed_result.time_entries or []
+    multi = parsed_result.multi_entries or []
+    direct = getattr(parsed_result, 'direct_entries', None) or []
+    jodi = getattr(parsed_result, 'jodi_entries', None) or []
+    
+    # Calculate totals
+    calc_engine = processor.calculation_engine
+    calc_result = calc_engine.calculate_total(parsed_result)
+    total_entries = len(pana) + len(ttype) + len(time_e) + len(multi) + len(direct) + len(jodi)
+    
+    # Total value (one snapshot of the result's fields instead of a getattr per component)
+    totals = getattr(calc_result, '__dict__', {})
+    if 'grand_total' in totals:
+        total_value = totals['grand_total']
+    else:
+        # Calculate total from all components
+        total_value = sum(totals.get(key, 0) for key in SUBTOTAL_FIELDS)
+    
+    # Create comprehensive detailed preview showing ALL entries
+    preview = StringIO()
+    write = preview.write
+    
+    if pana:
+        write(f"[PANA] Entries ({len(pana)}):\\n")
+        # Group pana entries by value to show more efficiently
+        pana_by_value = group_numbers_by_value(pana)
+        
+        for value, numbers in pana_by_value.items():
+            # Only the 8 smallest numbers are shown, so select them instead of sorting the group
+            numbers_str = ", ".join(map(str, nsmallest(8, numbers)))
+            if len(numbers) <= 8:  # Reduced from 10 to 8 for better line width
+                write(f"   {numbers_str} = ₹{value:,}\\n")
+            else:
+                write(f"   {numbers_str}... (+{len(numbers)-8}) = ₹{value:,}\\n")
+        
+        if hasattr(calc_result, 'pana_total') and calc_result.pana_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.pana_total:,}\\n")
+        write(_NL)
+    
+    # Check for direct entries (new pattern type)
+    if direct:
+        write(f"[DIRECT] Number Assignments ({len(direct)}):\\n")
+        # Group direct entries by value to show more efficiently
+        direct_by_value = group_numbers_by_value(direct)
+        
+        for value, numbers in direct_by_value.items():
+            # Only the 8 smallest numbers are shown, so select them instead of sorting the group
+            numbers_str = ", ".join(map(str, nsmallest(8, numbers)))
+            if len(numbers) <= 8:  # Reduced for better line width
+                write(f"   {numbers_str} = ₹{value:,}\\n")
+            else:
+                write(f"   {numbers_str}... (+{len(numbers)-8}) = ₹{value:,}\\n")
+        
+        if hasattr(calc_result, 'direct_total') and calc_result.direct_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.direct_total:,}\\n")
+        write(_NL)
+    
+    if ttype:
+        write(f"[TYPE] Table Entries ({len(ttype)}):\\n")
+        # Group by table type
+        type_by_table = defaultdict(list)
+        for entry in ttype:
+            type_by_table[entry.table_type].append(f"{entry.column}={entry.value}")
+        
+        for table_type, entries in type_by_table.items():
+            entries_str = ", ".join(entries[:10])  # Show up to 10 entries
+            if len(entries) > 10:
+                entries_str += f"... (+{len(entries)-10})"
+            write(f"   {table_type}: {entries_str}\\n")
+        
+        if hasattr(calc_result, 'type_total') and calc_result.type_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.type_total:,}\\n")
+        write(_NL)
+    
+    if time_e:
+        write(f"[TIME] Column Assignments ({len(time_e)}):\\n")
+        for entry in time_e:
+            columns_str = " ".join(map(str, sorted(entry.columns)))
+            write(f"   Columns {columns_str} = ₹{entry.value:,}\\n")
+        
+        if hasattr(calc_result, 'time_total') and calc_result.time_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.time_total:,}\\n")
+        write(_NL)
+    
+    # Check for jodi entries (new pattern type)
+    if jodi:
+        write(f"[JODI] Jodi Numbers ({len(jodi)}):\\n")
+        for entry in jodi:
+            jodi_numbers_str = "-".join(map(str, entry.jodi_numbers))
+            if len(jodi_numbers_str) > 50:  # Truncate if too long
+                jodi_numbers_str = jodi_numbers_str[:50] + "..."
+            write(f"   {jodi_numbers_str} = ₹{entry.value:,}\\n")
+            write(f"   → {len(entry.jodi_numbers)} jodi numbers × ₹{entry.value:,} = ₹{len(entry.jodi_numbers) * entry.value:,}\\n")
+        
+        if hasattr(calc_result, 'jodi_total') and calc_result.jodi_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.jodi_total:,}\\n")
+        write(_NL)
+    
+    if multi:
+        write(f"[MULTI] Multiplication Entries ({len(multi)}):\\n")
+        # Group by value to show more efficiently
+        multi_by_value = head_numbers_by_value(multi, 12)
+        
+        for value, (numbers, count) in multi_by_value.items():
+            numbers_str = ", ".join(f"{number:02d}" for number in numbers)  # Show up to 12 entries
+            if count > 12:
+                numbers_str += f"... (+{count-12})"
+            write(f"   {numbers_str} × ₹{value:,}\\n")
+        
+        if hasattr(calc_result, 'multi_total') and calc_result.multi_total > 0:
+            write(f"   → Subtotal: ₹{calc_result.multi_total:,}\\n")
+        write(_NL)
+    
+    # Add grand total summary
+    write(_HR)
+    write(f"GRAND TOTAL: ₹{total_value:,}\\n")
+    write(f"Total Entries: {total_entries}")
+    
+    return total_entries, total_value, preview.getvalue()
+
+# Date and bazar callbacks (module level; per-table state comes in through user_data)
+
+def on_date_changed(sender, app_data, user_data):
+    """Handle date change"""
+    try:
+        date_dict = app_data
+        selected_date = date(
+            year=date_dict['year'],
+            month=date_dict['month'] + 1,  # Convert from 0-based to 1-based
+            day=date_dict['month_day']
+        )
+        dpg.set_value("status_text", f"Date set to: {selected_date.strftime('%d-%m-%Y')}")
+
+    except Exception as e:
+        dpg.set_value("status_text", f"Invalid date: {e}")
+
+def apply_date_change():
+    """Apply the selected date from picker to display"""
+    try:
+        date_dict = dpg.get_value("entry_date")
+        selected_date = date(
+            year=date_dict['year'],
+            month=date_dict['month'] + 1,  # Convert from 0-based to 1-based
+            day=date_dict['month_day']
+        )
+        # Update the display field
+        dpg.set_value("date_display", _date_dict_to_iso(date_dict['year'], date_dict['month'], date_dict['month_day']))
+        # Close the popup
+        dpg.configure_item("date_picker_popup", show=False)
+        # Update status
+        dpg.set_value("status_text", f"Date changed to: {selected_date.strftime('%d-%m-%Y')}")
+
+    except Exception as e:
+        dpg.set_value("status_text", f"Error applying date: {e}")
+
+def open_table_date_picker(sender, app_data, user_data):
+    """Open the shared table date picker, user_data is (table name, date display tag, refresh function)"""
+    _date_picker_state['target'] = user_data
+    try:
+        dpg.set_value("table_date_picker", _iso_to_date_dict(dpg.get_value(user_data[1])))
+    except Exception:
+        pass
+    dpg.configure_item("table_date_picker_popup", show=True, pos=dpg.get_mouse_pos(local=False))
+
+def apply_table_date_change():
+    """Apply the shared picker's date to the table that opened it"""
+    target, display_tag, refresh = _date_picker_state['target']
+    try:
+        date_dict = dpg.get_value("table_date_picker")
+        dpg.set_value(display_tag, _date_dict_to_iso(date_dict['year'], date_dict['month'], date_dict['month_day']))
+        dpg.configure_item("table_date_picker_popup", show=False)
+        schedule_callback(target, refresh)
+    except Exception as e:
+        dpg.set_value("status_text", f"Error applying {target} date: {e}")
+
+def set_table_date_today():
+    """Set the date of the table that opened the shared picker to today"""
+    target, display_tag, refresh = _date_picker_state['target']
+    dpg.set_value(display_tag, _today_iso_cached())
+    dpg.set_value("table_date_picker", _iso_to_date_dict(_today_iso_cached()))
+    dpg.configure_item("table_date_picker_popup", show=False)
+    schedule_callback(target, refresh)
+
+def close_table_date_picker():
+    """Hide the shared table date picker"""
+    dpg.configure_item("table_date_picker_popup", show=False)
+
+def create_table_date_picker_popup():
+    """Create the date picker popup shared by the pana, time, jodi and summary tables"""
+    today = date.today()
+    with dpg.window(tag="table_date_picker_popup", popup=True, show=False, no_title_bar=True, autosize=True):
+        dpg.add_text("Select Date:")
+        dpg.add_date_picker(
+            tag="table_date_picker",
+            default_value={
+                'month_day': today.day,
+                'month': today.month - 1,
+                'year': today.year
+            }
+        )
+        with dpg.group(horizontal=True):
+            dpg.add_button(label="Apply", callback=apply_table_date_change, width=60)
+            dpg.add_button(label="Today", callback=set_table_date_today, width=60)
+            dpg.add_button(label="Close", callback=close_table_date_picker, width=60)
+
+def on_bazar_selected(sender, app_data, user_data):
+    """Handle bazar selection"""
+    bazar_name = app_data
+    if bazar_name != "No Bazars":
+        dpg.set_value("status_text", f"Selected bazar: {bazar_name}")
 
 def create_working_main_gui():
     """Create a working main GUI with all features"""
@@ -37,9 +730,12 @@ def create_working_main_gui():
         print("✅ Database and config initialized")
         
         try:
+            customer_rows = db_manager.get_all_customers()
+            # Every row has the same columns, so check for commission_type once
+            has_commission_type = bool(customer_rows) and "commission_type" in customer_rows[0].keys()
             customers = [{"id": row["id"], "name": row["name"], 
-                         "commission_type": row["commission_type"] if "commission_type" in row.keys() else "commission"} 
-                        for row in db_manager.get_all_customers()]
+                         "commission_type": row["commission_type"] if has_commission_type else "commission"} 
+                        for row in customer_rows]
             bazars = [{"name": row["name"], "display_name": row["display_name"]} 
                      for row in db_manager.get_all_bazars()]
         except Exception as e:
@@ -56,35 +752,38 @@ def create_working_main_gui():
         customers = []
         bazars = []
     
+    index_customers()
+    index_bazars()
+    
     # Helper functions
     def get_customer_name_color(customer_name: str):
-        """Get color for customer name based on commission type"""
+        """Get color for customer name based on commission type (cached per name)"""
+        color = _color_cache.get(customer_name)
+        if color is not None:
+            return color
+        
         # Default to blue (commission)
-        default_color = (52, 152, 219, 255)  # Blue
+        color = _BLUE
         
         try:
-            # Find customer in the customers list
-            for customer in customers:
-                if customer['name'] == customer_name:
-                    commission_type = customer.get('commission_type', 'commission')
-                    if commission_type == 'commission':
-                        return (52, 152, 219, 255)  # Blue
-                    else:
-                        return (230, 126, 34, 255)  # Orange
-            
+            commission_type = 'commission'
+            # Find customer in the loaded customers
+            customer = customers_by_name.get(customer_name)
+            if customer is not None:
+                commission_type = customer.get('commission_type', 'commission')
             # If not found in memory, try database
-            if db_manager:
+            elif db_manager:
                 customer_row = db_manager.get_customer_by_name(customer_name)
                 if customer_row:
                     commission_type = customer_row['commission_type'] if 'commission_type' in customer_row.keys() else 'commission'
-                    if commission_type == 'commission':
-                        return (52, 152, 219, 255)  # Blue
-                    else:
-                        return (230, 126, 34, 255)  # Orange
+            
+            if commission_type != 'commission':
+                color = _ORANGE
+            _color_cache[customer_name] = color
         except Exception as e:
             print(f"Error getting customer color: {e}")
         
-        return default_color
+        return color
     
     # Callback functions
     
@@ -94,188 +793,37 @@ def create_working_main_gui():
             input_text = dpg.get_value("input_area")
             
             if not input_text.strip():
+                _preview_state['preview'] = None
                 dpg.set_value("validation_text", "Status: Ready")
                 dpg.configure_item("preview_area", default_value="Enter data above to see preview...")
                 return
             
-            # Use advanced parsing system
-            try:
-                from src.business.data_processor import DataProcessor
-                from src.business.calculation_engine import CalculationEngine
-                from src.parsing.mixed_input_parser import MixedInputParser
-                from datetime import date
-                
-                # Create processor with full parsing system
-                processor = DataProcessor(db_manager)
-                
-                # Test parsing without saving
-                from src.business.data_processor import ProcessingContext
-                test_context = ProcessingContext(
-                    customer_name=dpg.get_value("customer_combo"),
-                    bazar=dpg.get_value("bazar_combo"),
-                    entry_date=date.today(),
-                    input_text=input_text,
-                    validate_references=True,
-                    auto_create_customer=False
-                )
+            # Use advanced parsing system (cached per input text)
+            if _HAS_ADV:
+                preview = build_input_preview(input_text)
                 
-                # Parse input to get preview
-                mixed_parser = processor.mixed_parser
-                parsed_result = mixed_parser.parse(input_text)
+                if preview is not None and preview == _preview_state['preview']:
+                    # Same entries as the preview on screen (e.g. only whitespace changed)
+                    dpg.set_value("validation_status", f"✓ {preview[0]} entries detected")
+                    return
+                _preview_state['preview'] = preview
                 
-                if not parsed_result.is_empty:
-                    # Calculate totals
-                    calc_engine = processor.calculation_engine
-                    calc_result = calc_engine.calculate_total(parsed_result)
-                    total_entries = (len(parsed_result.pana_entries or []) + 
-                                   len(parsed_result.type_entries or []) + 
-                                   len(parsed_result.time_entries or []) + 
-                                   len(parsed_result.multi_entries or []) +
-                                   len(parsed_result.direct_entries or []) +
-                                   len(getattr(parsed_result, 'jodi_entries', []) or []))
-                    
-                    # Update validation status
-                    dpg.set_value("validation_status", f"✓ {total_entries} entries detected")
-                    
-                    # Update calculated total
-                    if hasattr(calc_result, 'grand_total'):
-                        total_value = calc_result.grand_total
-                    else:
-                        # Calculate total from all components
-                        total_value = (getattr(calc_result, 'pana_total', 0) + 
-                                     getattr(calc_result, 'type_total', 0) + 
-                                     getattr(calc_result, 'time_total', 0) + 
-                                     getattr(calc_result, 'multi_total', 0) + 
-                                     getattr(calc_result, 'direct_total', 0) + 
-                                     getattr(calc_result, 'jodi_total', 0))
-                    
-                    dpg.set_value("calculated_total", f"₹{total_value:,}")
-                    
-                    # Enable breakdown button if there are entries
-                    dpg.configure_item("breakdown_btn", enabled=total_entries > 0)
-                    
-                    # Create comprehensive detailed preview showing ALL entries
-                    preview_lines = []
-                    
-                    if parsed_result.pana_entries:
-                        preview_lines.append(f"[PANA] Entries ({len(parsed_result.pana_entries)}):")
-                        # Group pana entries by value to show more efficiently
-                        pana_by_value = {}
-                        for entry in parsed_result.pana_entries:
-                            if entry.value not in pana_by_value:
-                                pana_by_value[entry.value] = []
-                            pana_by_value[entry.value].append(entry.number)
-                        
-                        for value, numbers in pana_by_value.items():
-                            numbers_str = ", ".join(map(str, sorted(numbers)))
-                            if len(numbers) <= 8:  # Reduced from 10 to 8 for better line width
-                                preview_lines.append(f"   {numbers_str} = ₹{value:,}")
-                            else:
-                                # Show first 8 and count
-                                first_eight = ", ".join(map(str, sorted(numbers)[:8]))
-                                preview_lines.append(f"   {first_eight}... (+{len(numbers)-8}) = ₹{value:,}")
-                        
-                        if hasattr(calc_result, 'pana_total') and calc_result.pana_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.pana_total:,}")
-                        preview_lines.append("")
-                    
-                    # Check for direct entries (new pattern type)
-                    if hasattr(parsed_result, 'direct_entries') and parsed_result.direct_entries:
-                        preview_lines.append(f"[DIRECT] Number Assignments ({len(parsed_result.direct_entries)}):")
-                        # Group direct entries by value to show more efficiently
-                        direct_by_value = {}
-                        for entry in parsed_result.direct_entries:
-                            if entry.value not in direct_by_value:
-                                direct_by_value[entry.value] = []
-                            direct_by_value[entry.value].append(entry.number)
-                        
-                        for value, numbers in direct_by_value.items():
-                            numbers_str = ", ".join(map(str, sorted(numbers)))
-                            if len(numbers) <= 8:  # Reduced for better line width
-                                preview_lines.append(f"   {numbers_str} = ₹{value:,}")
-                            else:
-                                # Show first 8 and count
-                                first_eight = ", ".join(map(str, sorted(numbers)[:8]))
-                                preview_lines.append(f"   {first_eight}... (+{len(numbers)-8}) = ₹{value:,}")
-                        
-                        if hasattr(calc_result, 'direct_total') and calc_result.direct_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.direct_total:,}")
-                        preview_lines.append("")
-                    
-                    if parsed_result.type_entries:
-                        preview_lines.append(f"[TYPE] Table Entries ({len(parsed_result.type_entries)}):")
-                        # Group by table type
-                        type_by_table = {}
-                        for entry in parsed_result.type_entries:
-                            if entry.table_type not in type_by_table:
-                                type_by_table[entry.table_type] = []
-                            type_by_table[entry.table_type].append(f"{entry.column}={entry.value}")
-                        
-                        for table_type, entries in type_by_table.items():
-                            entries_str = ", ".join(entries[:10])  # Show up to 10 entries
-                            if len(entries) > 10:
-                                entries_str += f"... (+{len(entries)-10})"
-                            preview_lines.append(f"   {table_type}: {entries_str}")
-                        
-                        if hasattr(calc_result, 'type_total') and calc_result.type_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.type_total:,}")
-                        preview_lines.append("")
-                    
-                    if parsed_result.time_entries:
-                        preview_lines.append(f"[TIME] Column Assignments ({len(parsed_result.time_entries)}):")
-                        for entry in parsed_result.time_entries:
-                            columns_str = " ".join(map(str, sorted(entry.columns)))
-                            preview_lines.append(f"   Columns {columns_str} = ₹{entry.value:,}")
-                        
-                        if hasattr(calc_result, 'time_total') and calc_result.time_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.time_total:,}")
-                        preview_lines.append("")
-                    
-                    # Check for jodi entries (new pattern type)
-                    if hasattr(parsed_result, 'jodi_entries') and parsed_result.jodi_entries:
-                        preview_lines.append(f"[JODI] Jodi Numbers ({len(parsed_result.jodi_entries)}):")
-                        for entry in parsed_result.jodi_entries:
-                            jodi_numbers_str = "-".join(map(str, entry.jodi_numbers))
-                            if len(jodi_numbers_str) > 50:  # Truncate if too long
-                                jodi_numbers_str = jodi_numbers_str[:50] + "..."
-                            preview_lines.append(f"   {jodi_numbers_str} = ₹{entry.value:,}")
-                            preview_lines.append(f"   → {len(entry.jodi_numbers)} jodi numbers × ₹{entry.value:,} = ₹{len(entry.jodi_numbers) * entry.value:,}")
-                        
-                        if hasattr(calc_result, 'jodi_total') and calc_result.jodi_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.jodi_total:,}")
-                        preview_lines.append("")
-                    
-                    if parsed_result.multi_entries:
-                        preview_lines.append(f"[MULTI] Multiplication Entries ({len(parsed_result.multi_entries)}):")
-                        # Group by value to show more efficiently
-                        multi_by_value = {}
-                        for entry in parsed_result.multi_entries:
-                            if entry.value not in multi_by_value:
-                                multi_by_value[entry.value] = []
-                            multi_by_value[entry.value].append(f"{entry.number:02d}")
-                        
-                        for value, numbers in multi_by_value.items():
-                            numbers_str = ", ".join(numbers[:12])  # Show up to 12 entries
-                            if len(numbers) > 12:
-                                numbers_str += f"... (+{len(numbers)-12})"
-                            preview_lines.append(f"   {numbers_str} × ₹{value:,}")
-                        
-                        if hasattr(calc_result, 'multi_total') and calc_result.multi_total > 0:
-                            preview_lines.append(f"   → Subtotal: ₹{calc_result.multi_total:,}")
-                        preview_lines.append("")
-                    
-                    # Add grand total summary
-                    preview_lines.append("=" * 40)
-                    preview_lines.append(f"GRAND TOTAL: ₹{total_value:,}")
-                    preview_lines.append(f"Total Entries: {total_entries}")
-                    
-                    preview_text = "\\n".join(preview_lines)
-                    dpg.configure_item("preview_area", default_value=preview_text)
+                if preview is not None:
+                    total_entries, total_value, preview_text = preview
+                    apply_widget_updates((
+                        (dpg.set_value, "validation_status", f"✓ {total_entries} entries detected"),
+                        (dpg.set_value, "calculated_total", f"₹{total_value:,}"),
+                        # Enable breakdown button if there are entries
+                        (set_item_enabled, "breakdown_btn", total_entries > 0),
+                        (set_item_default, "preview_area", preview_text),
+                    ))
                 else:
-                    dpg.set_value("validation_text", "Status: No valid entries found")
-                    dpg.configure_item("preview_area", default_value="No valid data format detected")
+                    apply_widget_updates((
+                        (dpg.set_value, "validation_text", "Status: No valid entries found"),
+                        (set_item_default, "preview_area", "No valid data format detected"),
+                    ))
                     
-            except ImportError as ie:
+            else:
                 # Fallback to simple parsing
                 lines = [line.strip() for line in input_text.split('\n') if line.strip()]
                 
@@ -299,8 +847,8 @@ def create_working_main_gui():
             dpg.set_value("validation_text", f"Status: Error - {e}")
     
     def on_input_change():
-        """Handle input text changes"""
-        validate_input()
+        """Handle input text changes (preview is debounced via the main loop)"""
+        schedule_callback("preview", validate_input, INPUT_DEBOUNCE_SECONDS)
     
     def submit_data():
         """Submit data to database"""
@@ -319,30 +867,27 @@ def create_working_main_gui():
             if db_manager:
                 try:
                     # Get or create customer
-                    customer = next((c for c in customers if c["name"] == customer_name), None)
+                    customer = customers_by_name.get(customer_name)
                     if customer:
                         customer_id = customer["id"]
                     else:
                         customer_id = db_manager.add_customer(customer_name)
-                        customers.append({"id": customer_id, "name": customer_name})
+                        add_customer_record({"id": customer_id, "name": customer_name})
                     
                     # Parse input using advanced parsing system
-                    try:
-                        from src.business.data_processor import DataProcessor
-                        from datetime import date
-                        
-                        # Create processor with full parsing system
-                        processor = DataProcessor(db_manager)
+                    if _HAS_ADV:
+                        # Reuse the shared processor with full parsing system
+                        processor = get_data_processor()
                         
                         # Create processing context
                         # Get date from date display field
                         date_str = dpg.get_value("date_display")
                         try:
-                            entry_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                        except:
+                            # Fixed YYYY-MM-DD format (written by the date picker), parsed directly
+                            entry_date = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+                        except Exception:
                             entry_date = date.today()
                         
-                        from src.business.data_processor import ProcessingContext
                         context = ProcessingContext(
                             customer_name=customer_name,
                             bazar=bazar_name,
@@ -377,7 +922,7 @@ def create_working_main_gui():
                             # Also refresh customer list for the dropdown
                             try:
                                 customers = db_manager.get_all_customers()
-                                customer_names = [c["name"] for c in customers]
+                                index_customers()
                                 dpg.configure_item("customer_combo", items=customer_names)
                             except:
                                 pass
@@ -388,23 +933,25 @@ def create_working_main_gui():
                             dpg.set_value("status_text", error_message)
                             return
                         
-                    except ImportError as ie:
+                    else:
                         # Fallback to simple processing
-                        entries_saved = 0
+                        entry_date = _iso(datetime.now())
+                        entries = []
                         for i, line in enumerate(lines):
-                            entry_data = {
+                            entries.append({
                                 'customer_id': customer_id,
                                 'customer_name': customer_name,
-                                'entry_date': datetime.now().strftime('%Y-%m-%d'),
+                                'entry_date': entry_date,
                                 'bazar': bazar_name,
                                 'number': 100 + i,  # Simple number assignment
                                 'value': len(line.split()) * 10,  # Simple value calculation
                                 'entry_type': 'PANA',  # Use valid entry type
                                 'source_line': line
-                            }
-                            
-                            db_manager.add_universal_log_entry(entry_data)
-                            entries_saved += 1
+                            })
+                        
+                        # All lines in one executemany and one transaction
+                        db_manager.add_universal_log_entries(entries)
+                        entries_saved = len(entries)
                         
                         dpg.set_value("status_text", f"Success: {entries_saved} entries saved (simple mode)!")
                     
@@ -477,10 +1024,10 @@ def create_working_main_gui():
             else:
                 customer_id = len(customers) + 1
             
-            customers.append({"id": customer_id, "name": name, "commission_type": commission_type})
+            add_customer_record({"id": customer_id, "name": name, "commission_type": commission_type})
+            _color_cache.pop(name, None)
             
             # Update combo
-            customer_names = [c["name"] for c in customers]
             dpg.configure_item("customer_combo", items=customer_names, default_value=name)
             
             dpg.delete_item("add_customer_window")
@@ -497,10 +1044,9 @@ def create_working_main_gui():
             return
         
         # Find customer ID and auto-fill
-        for customer in customers:
-            if customer['name'] == customer_name:
-                dpg.set_value("customer_id_input", str(customer['id']))
-                break
+        customer = customers_by_name.get(customer_name)
+        if customer:
+            dpg.set_value("customer_id_input", str(customer['id']))
         
         dpg.set_value("status_text", f"Selected customer: {customer_name}")
     
@@ -513,11 +1059,11 @@ def create_working_main_gui():
                 return
             
             # Find customer by ID and auto-fill name
-            for customer in customers:
-                if customer['id'] == customer_id:
-                    dpg.set_value("customer_combo", customer['name'])
-                    dpg.set_value("status_text", f"Selected customer: {customer['name']}")
-                    return
+            customer = customers_by_id.get(customer_id)
+            if customer:
+                dpg.set_value("customer_combo", customer['name'])
+                dpg.set_value("status_text", f"Selected customer: {customer['name']}")
+                return
             
             # Customer ID not found
             dpg.set_value("status_text", f"Customer ID {customer_id} not found")
@@ -525,153 +1071,6 @@ def create_working_main_gui():
         except ValueError:
             dpg.set_value("status_text", "Invalid customer ID format")
     
-    def on_date_changed(sender, app_data, user_data):
-        """Handle date change"""
-        try:
-            date_dict = app_data
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,  # Convert from 0-based to 1-based
-                day=date_dict['month_day']
-            )
-            dpg.set_value("status_text", f"Date set to: {selected_date.strftime('%d-%m-%Y')}")
-            
-        except Exception as e:
-            dpg.set_value("status_text", f"Invalid date: {e}")
-    
-    def apply_date_change():
-        """Apply the selected date from picker to display"""
-        try:
-            date_dict = dpg.get_value("entry_date")
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,  # Convert from 0-based to 1-based
-                day=date_dict['month_day']
-            )
-            # Update the display field
-            dpg.set_value("date_display", selected_date.strftime("%Y-%m-%d"))
-            # Close the popup
-            dpg.configure_item("date_picker_popup", show=False)
-            # Update status
-            dpg.set_value("status_text", f"Date changed to: {selected_date.strftime('%d-%m-%Y')}")
-            
-        except Exception as e:
-            dpg.set_value("status_text", f"Error applying date: {e}")
-    
-    def apply_pana_date_change():
-        """Apply the selected date from pana date picker"""
-        try:
-            date_dict = dpg.get_value("pana_date_filter")
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,
-                day=date_dict['month_day']
-            )
-            dpg.set_value("pana_date_display", selected_date.strftime("%Y-%m-%d"))
-            dpg.configure_item("pana_date_picker_popup", show=False)
-            refresh_pana_table()
-        except Exception as e:
-            dpg.set_value("status_text", f"Error applying pana date: {e}")
-    
-    def set_pana_date_today():
-        """Set pana date to today"""
-        today = date.today()
-        dpg.set_value("pana_date_display", today.strftime("%Y-%m-%d"))
-        dpg.set_value("pana_date_filter", {
-            'month_day': today.day,
-            'month': today.month - 1,
-            'year': today.year
-        })
-        dpg.configure_item("pana_date_picker_popup", show=False)
-        refresh_pana_table()
-    
-    def apply_time_date_change():
-        """Apply the selected date from time date picker"""
-        try:
-            date_dict = dpg.get_value("time_date_filter")
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,
-                day=date_dict['month_day']
-            )
-            dpg.set_value("time_date_display", selected_date.strftime("%Y-%m-%d"))
-            dpg.configure_item("time_date_picker_popup", show=False)
-            refresh_time_table()
-        except Exception as e:
-            dpg.set_value("status_text", f"Error applying time date: {e}")
-    
-    def set_time_date_today():
-        """Set time date to today"""
-        today = date.today()
-        dpg.set_value("time_date_display", today.strftime("%Y-%m-%d"))
-        dpg.set_value("time_date_filter", {
-            'month_day': today.day,
-            'month': today.month - 1,
-            'year': today.year
-        })
-        dpg.configure_item("time_date_picker_popup", show=False)
-        refresh_time_table()
-    
-    def apply_jodi_date_change():
-        """Apply the selected date from jodi date picker"""
-        try:
-            date_dict = dpg.get_value("jodi_date_filter")
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,
-                day=date_dict['month_day']
-            )
-            dpg.set_value("jodi_date_display", selected_date.strftime("%Y-%m-%d"))
-            dpg.configure_item("jodi_date_picker_popup", show=False)
-            refresh_jodi_table()
-        except Exception as e:
-            dpg.set_value("status_text", f"Error applying jodi date: {e}")
-    
-    def set_jodi_date_today():
-        """Set jodi date to today"""
-        today = date.today()
-        dpg.set_value("jodi_date_display", today.strftime("%Y-%m-%d"))
-        dpg.set_value("jodi_date_filter", {
-            'month_day': today.day,
-            'month': today.month - 1,
-            'year': today.year
-        })
-        dpg.configure_item("jodi_date_picker_popup", show=False)
-        refresh_jodi_table()
-    
-    def apply_summary_date_change():
-        """Apply the selected date from summary date picker"""
-        try:
-            date_dict = dpg.get_value("summary_date_filter")
-            selected_date = date(
-                year=date_dict['year'],
-                month=date_dict['month'] + 1,
-                day=date_dict['month_day']
-            )
-            dpg.set_value("summary_date_display", selected_date.strftime("%Y-%m-%d"))
-            dpg.configure_item("summary_date_picker_popup", show=False)
-            refresh_summary_table()
-        except Exception as e:
-            dpg.set_value("status_text", f"Error applying summary date: {e}")
-    
-    def set_summary_date_today():
-        """Set summary date to today"""
-        today = date.today()
-        dpg.set_value("summary_date_display", today.strftime("%Y-%m-%d"))
-        dpg.set_value("summary_date_filter", {
-            'month_day': today.day,
-            'month': today.month - 1,
-            'year': today.year
-        })
-        dpg.configure_item("summary_date_picker_popup", show=False)
-        refresh_summary_table()
-    
-    def on_bazar_selected(sender, app_data, user_data):
-        """Handle bazar selection"""
-        bazar_name = app_data
-        if bazar_name != "No Bazars":
-            dpg.set_value("status_text", f"Selected bazar: {bazar_name}")
-    
     def add_bazar():
         """Add new bazar dialog"""
         if dpg.does_item_exist("add_bazar_window"):
@@ -702,15 +1101,14 @@ def create_working_main_gui():
                 dpg.set_value("status_text", "Error: Both name and display name required")
                 return
             
-            if any(b["name"].lower() == name.lower() for b in bazars):
+            if name.lower() in _bazar_name_set:
                 dpg.set_value("status_text", "Error: Bazar already exists")
                 return
             
-            bazars.append({"name": name, "display_name": display_name})
+            add_bazar_record({"name": name, "display_name": display_name})
             
             # Update combo
-            bazar_names = [b["display_name"] for b in bazars]
-            dpg.configure_item("bazar_combo", items=bazar_names, default_value=display_name)
+            dpg.configure_item("bazar_combo", items=bazar_display_names(), default_value=display_name)
             
             dpg.delete_item("add_bazar_window")
             dpg.set_value("status_text", f"Bazar '{display_name}' added")
@@ -725,7 +1123,7 @@ def create_working_main_gui():
             # Trigger preview if there's input
             input_text = dpg.get_value("input_area")
             if input_text.strip():
-                validate_input()
+                schedule_callback("preview", validate_input)
         else:
             dpg.set_value("status_text", "Auto-preview disabled")
     
@@ -749,46 +1147,76 @@ def create_working_main_gui():
             pos=[150, 150],
             on_close=lambda: dpg.hide_item("table_window")
         ):
-            with dpg.tab_bar(tag="main_table_tabs"):
+            # Only the first tab is built now, the others are built on first selection (see build_table_tab)
+            _built_tabs.clear()
+            with dpg.tab_bar(tag="main_table_tabs", callback=on_table_tab_changed):
                 # Customers tab
                 with dpg.tab(label="Customers", tag="customers_tab"):
-                    create_customers_table()
+                    build_table_tab("customers_tab")
                 
                 # Universal log tab
                 with dpg.tab(label="Universal Log", tag="universal_tab"):
-                    create_universal_table()
+                    dpg.add_text("Loading...", tag="universal_tab_placeholder")
                 
                 # Pana table tab (unique to date+bazar)
                 with dpg.tab(label="Pana Table", tag="pana_tab"):
-                    create_pana_table()
+                    dpg.add_text("Loading...", tag="pana_tab_placeholder")
                 
                 # Time table tab (unique to date+bazar+customer)
                 with dpg.tab(label="Time Table", tag="time_tab"):
-                    create_time_table()
+                    dpg.add_text("Loading...", tag="time_tab_placeholder")
                 
                 # Jodi table tab (unique to date+bazar)
                 with dpg.tab(label="Jodi Table", tag="jodi_tab"):
-                    create_jodi_table()
+                    dpg.add_text("Loading...", tag="jodi_tab_placeholder")
                 
                 # Summary tab (unique to date+customer)
                 with dpg.tab(label="Customer Summary", tag="summary_tab"):
-                    create_summary_table()
+                    dpg.add_text("Loading...", tag="summary_tab_placeholder")
                 
                 # Export tab
                 with dpg.tab(label="Export", tag="export_tab"):
-                    create_export_interface()
+                    dpg.add_text("Loading...", tag="export_tab_placeholder")
+        
+        if not dpg.does_item_exist("table_date_picker_popup"):
+            create_table_date_picker_popup()
+    
+    def build_table_tab(tab):
+        """Build a table window tab's contents the first time it is needed"""
+        if tab in _built_tabs:
+            return
+        _built_tabs.add(tab)
+        placeholder = f"{tab}_placeholder"
+        if dpg.does_item_exist(placeholder):
+            dpg.delete_item(placeholder)
+        dpg.push_container_stack(tab)
+        try:
+            table_tab_builders[tab]()
+        finally:
+            dpg.pop_container_stack()
+    
+    def on_table_tab_changed(sender, app_data, user_data):
+        """Build the selected tab on first visit"""
+        tab = dpg.get_item_alias(app_data) if isinstance(app_data, int) else app_data
+        if tab in table_tab_builders:
+            build_table_tab(tab)
     
     def create_customers_table():
         """Create customers table view"""
+        add_column = dpg.add_table_column
         # Search and controls
         with dpg.group(horizontal=True):
             dpg.add_input_text(hint="Search customers...", tag="customers_search", width=200)
             dpg.add_button(label="Add Customer", callback=add_customer, width=120)
             dpg.add_button(label="Refresh", callback=refresh_customers_table, width=80)
+            dpg.add_loading_indicator(tag="customers_loading", style=1, radius=1.5, show=False)
         
         dpg.add_separator()
         
         # Customers table
+        # Rows are tracked by patch_table_rows from here on
+        _row_state.pop("customers_table", None)
+        _last_render.pop("customers", None)
         with dpg.table(
             header_row=True,
             resizable=True,
@@ -797,30 +1225,31 @@ def create_working_main_gui():
             tag="customers_table",
             height=-50
         ):
-            dpg.add_table_column(label="ID", width=60)
-            dpg.add_table_column(label="Name", width=200)
-            dpg.add_table_column(label="Type", width=120)
-            dpg.add_table_column(label="Created", width=150)
-            dpg.add_table_column(label="Last Activity", width=150)
-            dpg.add_table_column(label="Total Entries", width=120)
-            dpg.add_table_column(label="Total Value", width=120)
+            add_column(label="ID", width=60)
+            add_column(label="Name", width=200)
+            add_column(label="Type", width=120)
+            add_column(label="Created", width=150)
+            add_column(label="Last Activity", width=150)
+            add_column(label="Total Entries", width=120)
+            add_column(label="Total Value", width=120)
         
         # Load initial data
         refresh_customers_table()
     
     def create_universal_table():
         """Create universal log table view"""
+        add_column = dpg.add_table_column
         # Filters
         with dpg.group(horizontal=True):
             dpg.add_input_text(hint="Search...", tag="universal_search", width=200)
             dpg.add_combo(
-                items=["All Customers"] + [c["name"] for c in customers],
+                items=customer_filter_items(),
                 tag="universal_customer_filter",
                 default_value="All Customers",
                 width=150
             )
             dpg.add_combo(
-                items=["All Bazars"] + [b["display_name"] for b in bazars],
+                items=bazar_filter_items(),
                 tag="universal_bazar_filter",
                 default_value="All Bazars",
                 width=120
@@ -832,6 +1261,9 @@ def create_working_main_gui():
         dpg.add_separator()
         
         # Universal log table
+        # Rows are tracked by patch_table_rows from here on
+        _row_state.pop("universal_table", None)
+        _last_render.pop("universal", None)
         with dpg.table(
             header_row=True,
             resizable=True,
@@ -840,35 +1272,36 @@ def create_working_main_gui():
             tag="universal_table",
             height=-50
         ):
-            dpg.add_table_column(label="ID", width=60)
-            dpg.add_table_column(label="Customer", width=150)
-            dpg.add_table_column(label="Date", width=100)
-            dpg.add_table_column(label="Bazar", width=80)
-            dpg.add_table_column(label="Number", width=80)
-            dpg.add_table_column(label="Value", width=100)
-            dpg.add_table_column(label="Type", width=100)
-            dpg.add_table_column(label="Created", width=140)
+            add_column(label="ID", width=60)
+            add_column(label="Customer", width=150)
+            add_column(label="Date", width=100)
+            add_column(label="Bazar", width=80)
+            add_column(label="Number", width=80)
+            add_column(label="Value", width=100)
+            add_column(label="Type", width=100)
+            add_column(label="Created", width=140)
         
         # Load initial data
         refresh_universal_table()
     
     def create_pana_table():
         """Create pana table view (unique to date+bazar)"""
+        add_column = dpg.add_table_column
         # Date and Bazar filters
         with dpg.group(horizontal=True):
             dpg.add_text("Date:")
-            today = date.today()
             # Date display field with current date as default
             dpg.add_input_text(
                 tag="pana_date_display",
-                default_value=today.strftime("%Y-%m-%d"),
+                default_value=_today_iso_cached(),
                 width=100,
                 readonly=True
             )
             dpg.add_button(
                 label="📅",
                 tag="pana_date_toggle_btn",
-                callback=lambda: dpg.configure_item("pana_date_picker_popup", show=not dpg.is_item_shown("pana_date_picker_popup")),
+                callback=open_table_date_picker,
+                user_data=("pana", "pana_date_display", refresh_pana_table),
                 width=30,
                 height=23
             )
@@ -877,11 +1310,12 @@ def create_working_main_gui():
             
             dpg.add_text("Bazar:")
             dpg.add_combo(
-                items=[b["display_name"] for b in bazars],
+                items=bazar_display_names(),
                 tag="pana_bazar_filter",
                 default_value=bazars[0]["display_name"] if bazars else "No Bazars",
                 width=120,
-                callback=refresh_pana_table
+                callback=on_refresh_requested,
+                user_data=("pana", refresh_pana_table)
             )
             
             dpg.add_spacer(width=20)
@@ -891,7 +1325,8 @@ def create_working_main_gui():
                 tag="pana_upper_value_filter",
                 default_value=0,
                 width=80,
-                callback=refresh_pana_table,
+                callback=on_refresh_requested,
+                user_data=("pana", refresh_pana_table),
                 min_value=0,
                 min_clamped=True
             )
@@ -907,7 +1342,8 @@ def create_working_main_gui():
                 tag="pana_lower_value_filter", 
                 default_value=0,
                 width=80,
-                callback=refresh_pana_table,
+                callback=on_refresh_requested,
+                user_data=("pana", refresh_pana_table),
                 min_value=0,
                 min_clamped=True
             )
@@ -922,40 +1358,14 @@ def create_working_main_gui():
             dpg.add_button(label="Clear Filters", callback=clear_pana_filters, width=100)
             dpg.add_button(label="Export", callback=export_pana_table, width=80)
         
-        # Collapsible date picker popup
-        with dpg.popup("pana_date_toggle_btn", tag="pana_date_picker_popup", modal=False):
-            dpg.add_text("Select Date:")
-            dpg.add_date_picker(
-                tag="pana_date_filter",
-                default_value={
-                    'month_day': today.day,
-                    'month': today.month - 1,
-                    'year': today.year
-                }
-            )
-            with dpg.group(horizontal=True):
-                dpg.add_button(
-                    label="Apply",
-                    callback=lambda: apply_pana_date_change(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Today",
-                    callback=lambda: set_pana_date_today(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Close",
-                    callback=lambda: dpg.configure_item("pana_date_picker_popup", show=False),
-                    width=60
-                )
-        
         dpg.add_separator()
         
         # Pana table display in grid format (unique per Date + Bazar)
         dpg.add_text("Pana Table Data (Unique per Date + Bazar):")
         
         # Create pana grid table with proper layout
+        _row_state.pop("pana_grid_table", None)
+        _last_render.pop("pana", None)  # New, empty table
         with dpg.table(
             header_row=True,
             resizable=False,
@@ -967,30 +1377,30 @@ def create_working_main_gui():
             height=-50
         ):
             # Create 20 columns (10 Number|Value pairs)
-            for i in range(10):
-                dpg.add_table_column(label="Number", width=60)
-                dpg.add_table_column(label="Value", width=60)
+            for label, width in _PANA_COLS:
+                add_column(label=label, width=width)
         
         # Load initial data
         refresh_pana_table()
     
     def create_time_table():
         """Create time table view (unique to date+bazar+customer)"""
+        add_column = dpg.add_table_column
         # Filters
         with dpg.group(horizontal=True):
             dpg.add_text("Date:")
-            today = date.today()
             # Date display field with current date as default
             dpg.add_input_text(
                 tag="time_date_display",
-                default_value=today.strftime("%Y-%m-%d"),
+                default_value=_today_iso_cached(),
                 width=100,
                 readonly=True
             )
             dpg.add_button(
                 label="📅",
                 tag="time_date_toggle_btn",
-                callback=lambda: dpg.configure_item("time_date_picker_popup", show=not dpg.is_item_shown("time_date_picker_popup")),
+                callback=open_table_date_picker,
+                user_data=("time", "time_date_display", refresh_time_table),
                 width=30,
                 height=23
             )
@@ -999,7 +1409,7 @@ def create_working_main_gui():
             
             dpg.add_text("Customer:")
             dpg.add_combo(
-                items=["All Customers"] + [c["name"] for c in customers],
+                items=customer_filter_items(),
                 tag="time_customer_filter",
                 default_value="All Customers",
                 width=150
@@ -1009,7 +1419,7 @@ def create_working_main_gui():
             
             dpg.add_text("Bazar:")
             dpg.add_combo(
-                items=["All Bazars"] + [b["display_name"] for b in bazars],
+                items=bazar_filter_items(),
                 tag="time_bazar_filter",
                 default_value="All Bazars",
                 width=120
@@ -1020,38 +1430,12 @@ def create_working_main_gui():
             dpg.add_button(label="Load Data", callback=refresh_time_table, width=100)
             dpg.add_button(label="Export", callback=export_time_table, width=80)
         
-        # Collapsible date picker popup
-        with dpg.popup("time_date_toggle_btn", tag="time_date_picker_popup", modal=False):
-            dpg.add_text("Select Date:")
-            dpg.add_date_picker(
-                tag="time_date_filter",
-                default_value={
-                    'month_day': today.day,
-                    'month': today.month - 1,
-                    'year': today.year
-                }
-            )
-            with dpg.group(horizontal=True):
-                dpg.add_button(
-                    label="Apply",
-                    callback=lambda: apply_time_date_change(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Today",
-                    callback=lambda: set_time_date_today(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Close",
-                    callback=lambda: dpg.configure_item("time_date_picker_popup", show=False),
-                    width=60
-                )
-        
         dpg.add_separator()
         
         # Time table display
         dpg.add_text("Time Table Data (Unique per Date + Bazar + Customer):")
+        _row_state.pop("time_table", None)
+        _last_render.pop("time", None)  # New, empty table
         with dpg.table(
             header_row=True,
             resizable=True,
@@ -1060,52 +1444,54 @@ def create_working_main_gui():
             tag="time_table",
             height=-50
         ):
-            dpg.add_table_column(label="Customer", width=150)
-            dpg.add_table_column(label="Bazar", width=80)
-            dpg.add_table_column(label="1", width=60)
-            dpg.add_table_column(label="2", width=60)
-            dpg.add_table_column(label="3", width=60)
-            dpg.add_table_column(label="4", width=60)
-            dpg.add_table_column(label="5", width=60)
-            dpg.add_table_column(label="6", width=60)
-            dpg.add_table_column(label="7", width=60)
-            dpg.add_table_column(label="8", width=60)
-            dpg.add_table_column(label="9", width=60)
-            dpg.add_table_column(label="0", width=60)
-            dpg.add_table_column(label="Total", width=100)
-            dpg.add_table_column(label="Updated", width=140)
+            add_column(label="Customer", width=150)
+            add_column(label="Bazar", width=80)
+            add_column(label="1", width=60)
+            add_column(label="2", width=60)
+            add_column(label="3", width=60)
+            add_column(label="4", width=60)
+            add_column(label="5", width=60)
+            add_column(label="6", width=60)
+            add_column(label="7", width=60)
+            add_column(label="8", width=60)
+            add_column(label="9", width=60)
+            add_column(label="0", width=60)
+            add_column(label="Total", width=100)
+            add_column(label="Updated", width=140)
         
         # Load initial data
         refresh_time_table()
     
     def create_jodi_table():
         """Create jodi table view (unique to customer+date+bazar)"""
+        add_column = dpg.add_table_column
         # Customer, Date and Bazar filters
         with dpg.group(horizontal=True):
             dpg.add_text("Customer:")
             dpg.add_combo(
-                items=["All Customers"] + [customer['name'] for customer in customers],
+                items=customer_filter_items(),
                 tag="jodi_customer_filter",
                 default_value="All Customers",
                 width=150,
-                callback=refresh_jodi_table
+                callback=on_refresh_requested,
+                user_data=("jodi", refresh_jodi_table)
             )
             
             dpg.add_spacer(width=10)
             
             dpg.add_text("Date:")
-            today = date.today()
             # Date display field with current date as default
             dpg.add_input_text(
                 tag="jodi_date_display",
-                default_value=today.strftime("%Y-%m-%d"),
+                default_value=_today_iso_cached(),
                 width=100,
                 readonly=True
             )
             dpg.add_button(
                 label="📅",
                 tag="jodi_date_toggle_btn",
-                callback=lambda: dpg.configure_item("jodi_date_picker_popup", show=not dpg.is_item_shown("jodi_date_picker_popup")),
+                callback=open_table_date_picker,
+                user_data=("jodi", "jodi_date_display", refresh_jodi_table),
                 width=30,
                 height=23
             )
@@ -1114,11 +1500,12 @@ def create_working_main_gui():
             
             dpg.add_text("Bazar:")
             dpg.add_combo(
-                items=[b["display_name"] for b in bazars],
+                items=bazar_display_names(),
                 tag="jodi_bazar_filter",
                 default_value=bazars[0]["display_name"] if bazars else "No Bazars",
                 width=120,
-                callback=refresh_jodi_table
+                callback=on_refresh_requested,
+                user_data=("jodi", refresh_jodi_table)
             )
             
             dpg.add_spacer(width=10)
@@ -1126,40 +1513,14 @@ def create_working_main_gui():
             dpg.add_button(label="Load Data", callback=refresh_jodi_table, width=100)
             dpg.add_button(label="Export", callback=export_jodi_table, width=80)
         
-        # Collapsible date picker popup
-        with dpg.popup("jodi_date_toggle_btn", tag="jodi_date_picker_popup", modal=False):
-            dpg.add_text("Select Date:")
-            dpg.add_date_picker(
-                tag="jodi_date_filter",
-                default_value={
-                    'month_day': today.day,
-                    'month': today.month - 1,
-                    'year': today.year
-                }
-            )
-            with dpg.group(horizontal=True):
-                dpg.add_button(
-                    label="Apply",
-                    callback=lambda: apply_jodi_date_change(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Today",
-                    callback=lambda: set_jodi_date_today(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Close",
-                    callback=lambda: dpg.configure_item("jodi_date_picker_popup", show=False),
-                    width=60
-                )
-        
         dpg.add_separator()
         
         # Jodi table display in grid format (unique per Customer + Date + Bazar)
         dpg.add_text("Jodi Table Data (Unique per Customer + Date + Bazar) - Jodi Numbers 00-99:")
         
         # Create jodi grid table - 10x10 grid arranged by tens digit columns
+        _row_state.pop("jodi_grid_table", None)
+        _last_render.pop("jodi", None)  # New, empty table
         with dpg.table(
             header_row=True,
             resizable=False,
@@ -1171,31 +1532,30 @@ def create_working_main_gui():
             height=-50
         ):
             # Create 20 columns (10 pairs of Number|Value for each column)
-            column_headers = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
-            for i in range(10):
-                dpg.add_table_column(label=column_headers[i], width=35)
-                dpg.add_table_column(label="", width=40)
+            for label, width in _JODI_COLS:
+                add_column(label=label, width=width)
         
         # Load initial data
         refresh_jodi_table()
     
     def create_summary_table():
         """Create customer summary table view (unique to date+customer)"""
+        add_column = dpg.add_table_column
         # Filters
         with dpg.group(horizontal=True):
             dpg.add_text("Date:")
-            today = date.today()
             # Date display field with current date as default
             dpg.add_input_text(
                 tag="summary_date_display",
-                default_value=today.strftime("%Y-%m-%d"),
+                default_value=_today_iso_cached(),
                 width=100,
                 readonly=True
             )
             dpg.add_button(
                 label="📅",
                 tag="summary_date_toggle_btn",
-                callback=lambda: dpg.configure_item("summary_date_picker_popup", show=not dpg.is_item_shown("summary_date_picker_popup")),
+                callback=open_table_date_picker,
+                user_data=("summary", "summary_date_display", refresh_summary_table),
                 width=30,
                 height=23
             )
@@ -1204,7 +1564,7 @@ def create_working_main_gui():
             
             dpg.add_text("Customer:")
             dpg.add_combo(
-                items=["All Customers"] + [c["name"] for c in customers],
+                items=customer_filter_items(),
                 tag="summary_customer_filter",
                 default_value="All Customers",
                 width=150
@@ -1215,38 +1575,13 @@ def create_working_main_gui():
             dpg.add_button(label="Load Data", callback=refresh_summary_table, width=100)
             dpg.add_button(label="Export", callback=export_summary_table, width=80)
         
-        # Collapsible date picker popup
-        with dpg.popup("summary_date_toggle_btn", tag="summary_date_picker_popup", modal=False):
-            dpg.add_text("Select Date:")
-            dpg.add_date_picker(
-                tag="summary_date_filter",
-                default_value={
-                    'month_day': today.day,
-                    'month': today.month - 1,
-                    'year': today.year
-                }
-            )
-            with dpg.group(horizontal=True):
-                dpg.add_button(
-                    label="Apply",
-                    callback=lambda: apply_summary_date_change(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Today",
-                    callback=lambda: set_summary_date_today(),
-                    width=60
-                )
-                dpg.add_button(
-                    label="Close",
-                    callback=lambda: dpg.configure_item("summary_date_picker_popup", show=False),
-                    width=60
-                )
-        
         dpg.add_separator()
         
         # Summary table display
         dpg.add_text("Customer Summary (Unique per Date + Customer):")
+        # Rows are tracked by patch_table_rows from here on
+        _row_state.pop("summary_table", None)
+        _last_render.pop("summary", None)
         with dpg.table(
             header_row=True,
             resizable=True,
@@ -1255,19 +1590,19 @@ def create_working_main_gui():
             tag="summary_table",
             height=-50
         ):
-            dpg.add_table_column(label="Customer", width=150)
-            dpg.add_table_column(label="T.O", width=80)
-            dpg.add_table_column(label="T.K", width=80)
-            dpg.add_table_column(label="M.O", width=80)
-            dpg.add_table_column(label="M.K", width=80)
-            dpg.add_table_column(label="K.O", width=80)
-            dpg.add_table_column(label="K.K", width=80)
-            dpg.add_table_column(label="NMO", width=80)
-            dpg.add_table_column(label="NMK", width=80)
-            dpg.add_table_column(label="B.O", width=80)
-            dpg.add_table_column(label="B.K", width=80)
-            dpg.add_table_column(label="Grand Total", width=120)
-            dpg.add_table_column(label="Updated", width=140)
+            add_column(label="Customer", width=150)
+            add_column(label="T.O", width=80)
+            add_column(label="T.K", width=80)
+            add_column(label="M.O", width=80)
+            add_column(label="M.K", width=80)
+            add_column(label="K.O", width=80)
+            add_column(label="K.K", width=80)
+            add_column(label="NMO", width=80)
+            add_column(label="NMK", width=80)
+            add_column(label="B.O", width=80)
+            add_column(label="B.K", width=80)
+            add_column(label="Grand Total", width=120)
+            add_column(label="Updated", width=140)
         
         # Load initial data
         refresh_summary_table()
@@ -1330,6 +1665,17 @@ def create_working_main_gui():
             overlay="Ready to export..."
         )
     
+    # Tab tag -> function that builds the tab's contents
+    table_tab_builders = {
+        "customers_tab": create_customers_table,
+        "universal_tab": create_universal_table,
+        "pana_tab": create_pana_table,
+        "time_tab": create_time_table,
+        "jodi_tab": create_jodi_table,
+        "summary_tab": create_summary_table,
+        "export_tab": create_export_interface,
+    }
+    
     def open_table_window():
         """Open separate table window"""
         create_table_window()
@@ -1346,108 +1692,82 @@ def create_working_main_gui():
             create_table_window()
             if dpg.does_item_exist("main_table_tabs"):
                 dpg.set_value("main_table_tabs", "export_tab")
+        # Selecting the tab from code does not fire the tab bar callback
+        build_table_tab("export_tab")
         dpg.set_value("status_text", "Export interface opened")
     
     
     # Table refresh functions
     def refresh_customers_table():
-        """Refresh customers table data"""
+        """Refresh customers table data (the database is read on a worker thread)"""
         try:
-            # Clear existing data
             if dpg.does_item_exist("customers_table"):
-                dpg.delete_item("customers_table", children_only=True, slot=1)
-            
-                # Get fresh customer data from database
                 if db_manager:
-                    try:
-                        db_customers = db_manager.get_all_customers()
-                        for customer in db_customers:
-                            with dpg.table_row(parent="customers_table"):
-                                dpg.add_text(str(customer['id']))
-                                
-                                # Show commission type and apply color coding
-                                commission_type = customer['commission_type'] if 'commission_type' in customer.keys() else 'commission'
-                                display_type = "Commission" if commission_type == 'commission' else "Non-Commission"
-                                
-                                # Color coding: Blue for Commission, Orange for Non-Commission
-                                if commission_type == 'commission':
-                                    name_color = (52, 152, 219, 255)  # Blue
-                                else:
-                                    name_color = (230, 126, 34, 255)  # Orange
-                                
-                                dpg.add_text(customer['name'], color=name_color)
-                                dpg.add_text(display_type)
-                                dpg.add_text(customer['created_at'])
-                                
-                                # Get customer statistics
-                                stats_query = """
-                                    SELECT COUNT(*) as entries, COALESCE(SUM(value), 0) as total_value,
-                                           MAX(created_at) as last_activity
-                                    FROM universal_log 
-                                    WHERE customer_id = ?
-                                """
-                                stats = db_manager.execute_query(stats_query, (customer['id'],))
-                                if stats:
-                                    dpg.add_text(stats[0]['last_activity'] or 'Never')
-                                    dpg.add_text(str(stats[0]['entries']))
-                                    dpg.add_text(f"{stats[0]['total_value']:,}")
-                                else:
-                                    dpg.add_text("Never")
-                                    dpg.add_text("0")
-                                    dpg.add_text("0")
-                    except Exception as e:
-                        print(f"Error loading customer stats: {e}")
-                        # Fallback to simple customer list
-                        for customer in customers:
-                            with dpg.table_row(parent="customers_table"):
-                                dpg.add_text(str(customer['id']))
-                                
-                                # Show commission type and apply color coding
-                                commission_type = customer['commission_type'] if 'commission_type' in customer.keys() else 'commission'
-                                display_type = "Commission" if commission_type == 'commission' else "Non-Commission"
-                                
-                                # Color coding: Blue for Commission, Orange for Non-Commission
-                                if commission_type == 'commission':
-                                    name_color = (52, 152, 219, 255)  # Blue
-                                else:
-                                    name_color = (230, 126, 34, 255)  # Orange
-                                
-                                dpg.add_text(customer['name'], color=name_color)
-                                dpg.add_text(display_type)
-                                dpg.add_text("2024-01-01")
-                                dpg.add_text("Today")
-                                dpg.add_text("0")
-                                dpg.add_text("0")
+                    # Nothing to fetch if nothing was written since the last render
+                    if render_is_current("customers", ()):
+                        return
+                    dpg.configure_item("customers_loading", show=True)
+                    fetch_in_background("customers", fetch_customer_rows, render_customers_table)
                 else:
                     # Fallback when no database
-                    for customer in customers:
-                        with dpg.table_row(parent="customers_table"):
-                            dpg.add_text(str(customer['id']))
-                            
-                            # Show commission type and apply color coding
-                            commission_type = customer.get('commission_type', 'commission')
-                            display_type = "Commission" if commission_type == 'commission' else "Non-Commission"
-                            
-                            # Color coding: Blue for Commission, Orange for Non-Commission
-                            if commission_type == 'commission':
-                                name_color = (52, 152, 219, 255)  # Blue
-                            else:
-                                name_color = (230, 126, 34, 255)  # Orange
-                            
-                            dpg.add_text(customer['name'], color=name_color)
-                            dpg.add_text(display_type)
-                            dpg.add_text("2024-01-01")
-                            dpg.add_text("Today")
-                            dpg.add_text("0")
-                            dpg.add_text("0")
+                    render_customers_table(None)
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing customers: {e}")
     
+    def fetch_customer_rows():
+        """Load customers with their statistics (runs on a worker thread, no GUI calls)"""
+        return db_manager.get_customers_with_stats()
+    
+    def render_customers_table(future):
+        """Update the customers table from a finished fetch_customer_rows (None when there is no database)"""
+        try:
+            if not dpg.does_item_exist("customers_table"):
+                return
+            dpg.configure_item("customers_loading", show=False)
+            
+            if future is None:
+                patch_table_rows("customers_table", customer_fallback_rows())
+                return
+            try:
+                customer_rows = future.result()
+            except Exception as e:
+                print(f"Error loading customer stats: {e}")
+                _last_render.pop("customers", None)  # Retry on the next refresh
+                # Fallback to simple customer list
+                patch_table_rows("customers_table", customer_fallback_rows())
+                return
+            
+            rows = []
+            for customer in customer_rows:
+                # Customer statistics (aggregated in the same query)
+                stats_cells = ((customer['last_activity'] or 'Never', None), (str(customer['entries']), None), (f"{customer['total_value']:,}", None))
+                rows.append((customer['id'], customer_cells(customer, customer['created_at']) + stats_cells))
+            # Existing rows keep their widgets, only changed cells are set
+            patch_table_rows("customers_table", rows)
+        except Exception as e:
+            dpg.set_value("status_text", f"Error refreshing customers: {e}")
+    
+    def customer_cells(customer, created_at):
+        """ID, name, type and created cells for a customers table row"""
+        # Show commission type and apply color coding (Blue for Commission, Orange for Non-Commission)
+        commission_type = customer['commission_type'] if 'commission_type' in customer.keys() else 'commission'
+        if commission_type == 'commission':
+            return (str(customer['id']), None), (customer['name'], _BLUE), ("Commission", None), (created_at, None)
+        return (str(customer['id']), None), (customer['name'], _ORANGE), ("Non-Commission", None), (created_at, None)
+    
+    def customer_fallback_rows():
+        """Customers table rows from the in-memory list (no statistics available)"""
+        return [(customer['id'], customer_cells(customer, "2024-01-01") + (("Today", None), ("0", None), ("0", None)))
+                for customer in customers]
+    
     def refresh_universal_table():
-        """Refresh universal log table data"""
+        """Refresh universal log table data (only changed rows are touched)"""
         try:
             if dpg.does_item_exist("universal_table"):
-                dpg.delete_item("universal_table", children_only=True, slot=1)
+                # Nothing to patch if nothing was written since the last render
+                if render_is_current("universal", ()):
+                    return
+                rows = []
                 
                 # Get real data from database
                 if db_manager:
@@ -1455,32 +1775,28 @@ def create_working_main_gui():
                         entries = db_manager.get_universal_log_entries(limit=1000)
                         if entries:
                             for entry in entries:
-                                with dpg.table_row(parent="universal_table"):
-                                    dpg.add_text(str(entry['id']))
+                                rows.append((entry['id'], (
+                                    (str(entry['id']), None),
                                     # Apply color coding based on commission type
-                                    customer_color = get_customer_name_color(entry['customer_name'])
-                                    dpg.add_text(entry['customer_name'], color=customer_color)
-                                    dpg.add_text(entry['entry_date'])
-                                    dpg.add_text(entry['bazar'])
-                                    dpg.add_text(str(entry['number']))
-                                    dpg.add_text(f"₹{entry['value']}")
-                                    dpg.add_text(entry['entry_type'])
-                                    dpg.add_text(entry['created_at'])
+                                    (entry['customer_name'], get_customer_name_color(entry['customer_name'])),
+                                    (entry['entry_date'], None),
+                                    (entry['bazar'], None),
+                                    (str(entry['number']), None),
+                                    (f"₹{entry['value']}", None),
+                                    (entry['entry_type'], None),
+                                    (entry['created_at'], None),
+                                )))
                         else:
                             # No entries found
-                            with dpg.table_row(parent="universal_table"):
-                                dpg.add_text("No entries found - Start by submitting some data", color=(150, 150, 150, 255))
-                                for _ in range(7):
-                                    dpg.add_text("", color=(150, 150, 150, 255))
+                            rows.append(((None, "empty"), (("No entries found - Start by submitting some data", _GRAY),) + _EMPTY_GRAY_CELLS[:7]))
                     except AttributeError:
                         # No data available
-                        pass
+                        _last_render.pop("universal", None)  # Retry on the next refresh
                 else:
                     # No database - show empty table message
-                    with dpg.table_row(parent="universal_table"):
-                        dpg.add_text("No data available - Database not connected", color=(150, 150, 150, 255))
-                        for _ in range(7):  # Fill remaining columns
-                            dpg.add_text("")
+                    rows.append(((None, "no_db"), (("No data available - Database not connected", _GRAY),) + _EMPTY_CELLS[:7]))
+                
+                patch_table_rows("universal_table", rows)
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing universal log: {e}")
     
@@ -1500,301 +1816,210 @@ def create_working_main_gui():
         refresh_pana_table()
         dpg.set_value("status_text", "Pana table filters cleared")
     
-    def get_pana_layout():
-        """Get the complete pana table layout as specified"""
-        # Upper section (first 12 rows)
-        upper_section = [
-            [128, 129, 120, 130, 140, 123, 124, 125, 126, 127],
-            [137, 138, 139, 149, 159, 150, 160, 134, 135, 136],
-            [146, 147, 148, 158, 168, 169, 179, 170, 180, 145],
-            [236, 156, 157, 167, 230, 178, 250, 189, 234, 190],
-            [245, 237, 238, 239, 249, 240, 269, 260, 270, 235],
-            [290, 246, 247, 248, 258, 259, 278, 279, 289, 280],
-            [380, 345, 256, 257, 267, 268, 340, 350, 360, 370],
-            [470, 390, 346, 347, 348, 349, 359, 369, 379, 389],
-            [489, 480, 490, 356, 357, 358, 368, 378, 450, 460],
-            [560, 570, 580, 590, 456, 367, 458, 459, 478, 479],
-            [579, 589, 670, 680, 690, 457, 467, 468, 469, 569],
-            [678, 679, 689, 789, 780, 790, 890, 567, 568, 578]
-        ]
-        
-        # Lower section (after gap - 10 rows)
-        lower_section = [
-            [100, 110, 166, 112, 113, 114, 115, 116, 117, 118],
-            [119, 200, 229, 220, 122, 277, 133, 224, 144, 226],
-            [155, 228, 300, 266, 177, 330, 188, 233, 199, 244],
-            [227, 255, 337, 338, 339, 448, 223, 288, 225, 299],
-            [335, 336, 355, 400, 366, 466, 377, 440, 388, 334],
-            [344, 499, 445, 446, 447, 556, 449, 477, 559, 488],
-            [399, 660, 599, 455, 500, 880, 557, 558, 577, 550],
-            [588, 688, 779, 699, 799, 899, 566, 800, 667, 668],
-            [669, 778, 788, 770, 889, 600, 700, 990, 900, 677],
-            [777, 444, 111, 888, 555, 222, 999, 666, 333, 0]
-        ]
-        
-        return upper_section, lower_section
+    def pana_section_rows(section, pana_values, section_filter):
+        """Grid rows for one pana section, with its count of non-zero values and of values passing the filter"""
+        rows = []
+        total_values = 0
+        visible_values = 0
+        for row_numbers in section:
+            cells = []
+            for number in row_numbers:
+                value = pana_values[number]
+                
+                # Number cell - always show, value cell - apply the section filter
+                if value > 0:
+                    total_values += 1
+                    if section_filter > 0 and value <= section_filter:
+                        # Hide value if it doesn't pass filter
+                        cells += ((str(number), None), ("", _MUTED))  # Empty value cell
+                    else:
+                        visible_values += 1
+                        cells += ((str(number), None), (str(value), _GREEN))  # Green for non-zero
+                else:
+                    cells += ((str(number), None), ("0", _MUTED))  # Gray for zero
+            rows.append(tuple(cells))
+        return rows, total_values, visible_values
     
     def refresh_pana_table():
-        """Refresh pana table data for selected date+bazar"""
+        """Refresh pana table data for selected date+bazar (the database is read on a worker thread)"""
         try:
             if dpg.does_item_exist("pana_grid_table"):
-                dpg.delete_item("pana_grid_table", children_only=True, slot=1)
-                
                 # Get selected date and bazar from display fields
                 date_str = dpg.get_value("pana_date_display")
                 bazar_value = dpg.get_value("pana_bazar_filter")
                 
+                # Nothing to redraw if these filters were rendered and nothing was written since
+                filter_key = (date_str, bazar_value, dpg.get_value("pana_upper_value_filter"), dpg.get_value("pana_lower_value_filter"))
+                if render_is_current("pana", filter_key):
+                    return
+                
                 if date_str and bazar_value and bazar_value != "No Bazars":
-                    upper_section, lower_section = get_pana_layout()
-                    
-                    # Get pana data from database for selected date+bazar
-                    pana_values = {}  # number -> value mapping
-                    
                     if db_manager:
-                        try:
-                            # Get bazar name (not display name)
-                            bazar_name = bazar_value
-                            for bazar in bazars:
-                                if bazar['display_name'] == bazar_value:
-                                    bazar_name = bazar['name']
-                                    break
-                            
-                            # Fetch pana data from database using new method
-                            if hasattr(db_manager, 'get_pana_table_values'):
-                                pana_data = db_manager.get_pana_table_values(bazar_name, date_str)
-                                for entry in pana_data:
-                                    if hasattr(entry, '__getitem__'):  # Row object or dict
-                                        pana_values[entry['number']] = entry['value']
-                        except Exception as e:
-                            print(f"Database error: {e}")
-                    
-                    # Show empty table if no data
-                    # No dummy values added
-                    
-                    # Get filter values
-                    upper_filter = dpg.get_value("pana_upper_value_filter") if dpg.does_item_exist("pana_upper_value_filter") else 0
-                    lower_filter = dpg.get_value("pana_lower_value_filter") if dpg.does_item_exist("pana_lower_value_filter") else 0
-                    
-                    # Add upper section rows with filter applied
-                    for row_numbers in upper_section:
-                        with dpg.table_row(parent="pana_grid_table"):
-                            for number in row_numbers:
-                                value = pana_values.get(number, 0)
-                                
-                                # Number cell - always show
-                                dpg.add_text(str(number))
-                                
-                                # Value cell - apply upper section filter
-                                if upper_filter > 0 and value > 0 and value <= upper_filter:
-                                    # Hide value if it doesn't pass filter
-                                    dpg.add_text("", color=(108, 117, 125, 255))  # Empty value cell
-                                else:
-                                    # Show value normally
-                                    if value > 0:
-                                        dpg.add_text(str(value), color=(39, 174, 96, 255))  # Green for non-zero
-                                    else:
-                                        dpg.add_text("0", color=(108, 117, 125, 255))  # Gray for zero
-                    
-                    # Add separator row (empty row)
-                    with dpg.table_row(parent="pana_grid_table"):
-                        for i in range(20):  # 20 columns total
-                            dpg.add_text("", color=(200, 200, 200, 255))
-                    
-                    # Add lower section rows with filter applied
-                    for row_numbers in lower_section:
-                        with dpg.table_row(parent="pana_grid_table"):
-                            for number in row_numbers:
-                                value = pana_values.get(number, 0)
-                                
-                                # Number cell - always show
-                                dpg.add_text(str(number))
-                                
-                                # Value cell - apply lower section filter
-                                if lower_filter > 0 and value > 0 and value <= lower_filter:
-                                    # Hide value if it doesn't pass filter
-                                    dpg.add_text("", color=(108, 117, 125, 255))  # Empty value cell
-                                else:
-                                    # Show value normally
-                                    if value > 0:
-                                        dpg.add_text(str(value), color=(39, 174, 96, 255))  # Green for non-zero
-                                    else:
-                                        dpg.add_text("0", color=(108, 117, 125, 255))  # Gray for zero
-                    
-                    # Add summary information with filter status
-                    total_numbers = len(upper_section) * 10 + len(lower_section) * 10  # 220 total
-                    non_zero_count = len([v for v in pana_values.values() if v > 0])
-                    total_value = sum(pana_values.values())
-                    
-                    # Count visible values for each section (numbers always visible)
-                    upper_visible_values = 0
-                    lower_visible_values = 0
-                    upper_total_values = 0
-                    lower_total_values = 0
-                    
-                    # Count upper section values
-                    for row_numbers in upper_section:
-                        for number in row_numbers:
-                            value = pana_values.get(number, 0)
-                            if value > 0:
-                                upper_total_values += 1
-                                if upper_filter == 0 or value > upper_filter:
-                                    upper_visible_values += 1
-                    
-                    # Count lower section values
-                    for row_numbers in lower_section:
-                        for number in row_numbers:
-                            value = pana_values.get(number, 0)
-                            if value > 0:
-                                lower_total_values += 1
-                                if lower_filter == 0 or value > lower_filter:
-                                    lower_visible_values += 1
-                    
-                    filter_status = ""
-                    if upper_filter > 0 or lower_filter > 0:
-                        filter_status = f" | Visible values: Upper {upper_visible_values}/{upper_total_values}, Lower {lower_visible_values}/{lower_total_values}"
-                    
-                    dpg.set_value("status_text", 
-                        f"Pana table loaded for {bazar_value} | "
-                        f"Numbers: {non_zero_count}/{total_numbers} active | "
-                        f"Total value: ₹{total_value:,}{filter_status}")
+                        # Get bazar name (not display name)
+                        bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
+                        
+                        def show_pana_values(values):
+                            render_pana_table(bazar_value, values[0])
+                            # Warm the cache for the dates and bazars likely to be picked next
+                            prefetch_pana_neighbours(bazar_name, date_str)
+                        
+                        # Fetch pana data, reusing the cached values while nothing was written
+                        dpg.set_value("status_text", f"Loading pana table for {bazar_value}...")
+                        load_table_values("pana", _slice_cache, (bazar_name, date_str, None),
+                                          lambda: load_bazar_date_values(bazar_name, date_str), show_pana_values, NO_SLICE_VALUES)
+                    else:
+                        # Show empty table if no data
+                        render_pana_table(bazar_value, NO_PANA_VALUES)
                 else:
+                    supersede_fetches("pana")
+                    patch_table_rows("pana_grid_table", [])
                     dpg.set_value("status_text", "Please select date and bazar to load Pana table")
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing pana table: {e}")
     
+    def render_pana_table(bazar_value, pana_values):
+        """Fill the pana grid from pana_values (indexed by number), applying the section filters"""
+        try:
+            if not dpg.does_item_exist("pana_grid_table"):
+                return
+            
+            # Get filter values
+            upper_filter = dpg.get_value("pana_upper_value_filter") if dpg.does_item_exist("pana_upper_value_filter") else 0
+            lower_filter = dpg.get_value("pana_lower_value_filter") if dpg.does_item_exist("pana_lower_value_filter") else 0
+            
+            # Build each section's rows and count its values in the same pass
+            upper_rows, upper_total_values, upper_visible_values = pana_section_rows(PANA_UPPER_SECTION, pana_values, upper_filter)
+            lower_rows, lower_total_values, lower_visible_values = pana_section_rows(PANA_LOWER_SECTION, pana_values, lower_filter)
+            
+            # Grid rows keep their widgets between refreshes, only changed cells are updated
+            grid_rows = upper_rows + [_GRID_SEPARATOR_CELLS] + lower_rows
+            patch_table_rows("pana_grid_table", list(enumerate(grid_rows)))
+            
+            # Add summary information with filter status
+            total_numbers = len(PANA_UPPER_SECTION) * 10 + len(PANA_LOWER_SECTION) * 10  # 220 total
+            non_zero_count = sum(1 for v in pana_values if v > 0)
+            total_value = sum(pana_values)
+            
+            filter_status = ""
+            if upper_filter > 0 or lower_filter > 0:
+                filter_status = f" | Visible values: Upper {upper_visible_values}/{upper_total_values}, Lower {lower_visible_values}/{lower_total_values}"
+            
+            dpg.set_value("status_text", 
+                f"Pana table loaded for {bazar_value} | "
+                f"Numbers: {non_zero_count}/{total_numbers} active | "
+                f"Total value: ₹{total_value:,}{filter_status}")
+        except Exception as e:
+            dpg.set_value("status_text", f"Error refreshing pana table: {e}")
+    
     def refresh_time_table():
-        """Refresh time table data for selected filters"""
+        """Refresh time table data for selected filters (the database is read on a worker thread)"""
         try:
             if dpg.does_item_exist("time_table"):
-                dpg.delete_item("time_table", children_only=True, slot=1)
-                
                 # Get selected filters from display fields
                 date_str = dpg.get_value("time_date_display")
                 customer_value = dpg.get_value("time_customer_filter")
                 bazar_value = dpg.get_value("time_bazar_filter")
                 
+                # Nothing to redraw if these filters were rendered and nothing was written since
+                if render_is_current("time", (date_str, customer_value, bazar_value)):
+                    return
+                
                 # Get real time table data from database
                 if date_str and bazar_value and bazar_value != "No Bazars":
                     # Get bazar name (not display name)
-                    bazar_name = bazar_value
-                    for bazar in bazars:
-                        if bazar['display_name'] == bazar_value:
-                            bazar_name = bazar['name']
-                            break
+                    bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
                     
-                    if db_manager and hasattr(db_manager, 'get_time_table_by_bazar_date'):
-                        try:
-                            time_data = db_manager.get_time_table_by_bazar_date(bazar_name, date_str)
-                            
-                            if time_data:
-                                for entry in time_data:
-                                    # Filter by customer if specific customer selected
-                                    if customer_value == "All Customers" or entry['customer_name'] == customer_value:
-                                        with dpg.table_row(parent="time_table"):
-                                            # Apply color coding based on commission type
-                                            customer_color = get_customer_name_color(entry['customer_name'])
-                                            dpg.add_text(entry['customer_name'], color=customer_color)
-                                            dpg.add_text(bazar_name)
-                                            # Columns 1-9, then 0 (as per table header order)
-                                            for i in [1, 2, 3, 4, 5, 6, 7, 8, 9, 0]:
-                                                value = entry[f'col_{i}'] if entry[f'col_{i}'] > 0 else "-"
-                                                dpg.add_text(str(value))
-                                            dpg.add_text(f"{entry['total']:,}")
-                                            dpg.add_text(entry['updated_at'] or entry['created_at'])
-                            else:
-                                # Show empty row if no data
-                                with dpg.table_row(parent="time_table"):
-                                    dpg.add_text("No time data available for selected filters", color=(150, 150, 150, 255))
-                                    for i in range(12):  # Bazar + 10 columns + Total + Date
-                                        dpg.add_text("", color=(150, 150, 150, 255))
-                        except Exception as e:
-                            print(f"Database error loading time table: {e}")
-                            # Show error row
-                            with dpg.table_row(parent="time_table"):
-                                dpg.add_text("Error loading data")
-                                for i in range(12):
-                                    dpg.add_text("-")
+                    if db_manager and hasattr(db_manager, 'get_time_table_with_jodi'):
+                        # Time rows and the jodi values for the totals row in one call
+                        # (jodi values per customer when one is selected, same logic as jodi table)
+                        jodi_customer = None if customer_value == "All Customers" else customer_value
+                        dpg.set_value("status_text", f"Loading time table for {date_str}...")
+                        fetch_in_background("time",
+                                            lambda: db_manager.get_time_table_with_jodi(bazar_name, date_str, jodi_customer),
+                                            lambda future: render_time_table(bazar_name, customer_value, date_str, future))
+                    else:
+                        supersede_fetches("time")
+                        render_time_table(bazar_name, customer_value, date_str, None)
+                else:
+                    supersede_fetches("time")
+                    patch_table_rows("time_table", [])
+                    dpg.set_value("status_text", f"Time table loaded for {date_str} (includes Jodi totals)")
+        except Exception as e:
+            dpg.set_value("status_text", f"Error refreshing time table: {e}")
+    
+    def render_time_table(bazar_name, customer_value, date_str, future):
+        """Fill the time table from a finished get_time_table_with_jodi fetch (None when there is no database)"""
+        try:
+            if not dpg.does_item_exist("time_table"):
+                return
+            rows = []
+            
+            jodi_data = []
+            if future is not None:
+                try:
+                    time_data, jodi_data = future.result()
                     
-                    # Add Jodi column totals row at the bottom
-                    jodi_column_totals = _calculate_jodi_column_totals(bazar_name, date_str, customer_value)
-                    with dpg.table_row(parent="time_table"):
-                        dpg.add_text("JODI TOTALS", color=(255, 193, 7, 255))  # Yellow/gold color
-                        dpg.add_text(bazar_name, color=(255, 193, 7, 255))
-                        # Display jodi totals for columns 1-9, then 0
-                        for i in [1, 2, 3, 4, 5, 6, 7, 8, 9, 0]:
-                            total = jodi_column_totals.get(i, 0)
-                            if total > 0:
-                                dpg.add_text(f"{total:,}", color=(255, 193, 7, 255))
-                            else:
-                                dpg.add_text("-", color=(108, 117, 125, 255))
-                        # Grand total of all jodi columns
-                        grand_total = sum(jodi_column_totals.values())
-                        dpg.add_text(f"{grand_total:,}", color=(255, 193, 7, 255))
-                        dpg.add_text("Live", color=(255, 193, 7, 255))
-                        
-                dpg.set_value("status_text", f"Time table loaded for {date_str} (includes Jodi totals)")
+                    if time_data:
+                        # Rows are positional: customer, columns 1-9 then 0, total, updated, created
+                        for entry in time_data:
+                            customer_name = entry[0]
+                            # Filter by customer if specific customer selected
+                            if customer_value == "All Customers" or customer_name == customer_value:
+                                # Apply color coding based on commission type
+                                cells = [(customer_name, get_customer_name_color(customer_name)), (bazar_name, None)]
+                                # Columns 1-9, then 0 (as per table header order)
+                                cells += [(str(value) if value > 0 else "-", None) for value in entry[1:11]]
+                                cells.append((f"{entry[11]:,}", None))
+                                cells.append((entry[12] or entry[13], None))
+                                rows.append((customer_name, tuple(cells)))
+                    else:
+                        # Show empty row if no data
+                        # Bazar + 10 columns + Total + Date
+                        rows.append(((None, "empty"), (("No time data available for selected filters", _GRAY),) + _EMPTY_GRAY_CELLS))
+                except Exception as e:
+                    print(f"Database error loading time table: {e}")
+                    _last_render.pop("time", None)  # Retry on the next refresh
+                    # Show error row
+                    rows.append(((None, "error"), (("Error loading data", None),) + _DASH_CELLS))
+            
+            # Add Jodi column totals row at the bottom
+            jodi_column_totals = _calculate_jodi_column_totals(jodi_data)
+            gold = (255, 193, 7, 255)  # Yellow/gold color
+            cells = [("JODI TOTALS", gold), (bazar_name, gold)]
+            # Display jodi totals for columns 1-9, then 0
+            for i in [1, 2, 3, 4, 5, 6, 7, 8, 9, 0]:
+                total = jodi_column_totals.get(i, 0)
+                if total > 0:
+                    cells.append((f"{total:,}", gold))
+                else:
+                    cells.append(("-", (108, 117, 125, 255)))
+            # Grand total of all jodi columns
+            grand_total = sum(jodi_column_totals.values())
+            cells.append((f"{grand_total:,}", gold))
+            cells.append(("Live", gold))
+            rows.append(((None, "jodi_totals"), tuple(cells)))
+            
+            # Rows keep their widgets between refreshes, only changed cells are updated
+            patch_table_rows("time_table", rows)
+            
+            dpg.set_value("status_text", f"Time table loaded for {date_str} (includes Jodi totals)")
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing time table: {e}")
     
-    def _calculate_jodi_column_totals(bazar_name: str, date_str: str, customer_value: str):
+    def _calculate_jodi_column_totals(jodi_data):
         """Calculate jodi column totals for display in time table"""
         column_totals = {i: 0 for i in range(10)}  # Initialize columns 0-9
         
         try:
-            jodi_data = []  # Initialize empty list
-            if db_manager:
-                # Get jodi data based on customer selection (same logic as jodi table)
-                if customer_value == "All Customers":
-                    # Get aggregated data from jodi_table
-                    if hasattr(db_manager, 'get_jodi_table_values'):
-                        jodi_data = db_manager.get_jodi_table_values(bazar_name, date_str)
-                else:
-                    # Get customer-specific data from universal_log
-                    if hasattr(db_manager, 'get_jodi_table_values_by_customer'):
-                        jodi_data = db_manager.get_jodi_table_values_by_customer(customer_value, bazar_name, date_str)
-                
+            # All rows share one shape, so check it once (Row object or dict) rather than per row
+            if jodi_data and hasattr(jodi_data[0], '__getitem__'):
                 # Process jodi data and sum by column
                 for entry in jodi_data:
-                    if hasattr(entry, '__getitem__'):
-                        jodi_number = entry['jodi_number']
-                        value = entry['value']
-                        
-                        # Map jodi number to column based on tens digit
-                        # Jodi layout: Col 1: 11,12,13,14,15,16,17,18,19,10
-                        #              Col 2: 21,22,23,24,25,26,27,28,29,20
-                        #              ...
-                        #              Col 0: 01,02,03,04,05,06,07,08,09,00
-                        if jodi_number == 0:
-                            column = 0  # 00 goes to column 0
-                        elif 1 <= jodi_number <= 9:
-                            column = 0  # 01-09 go to column 0
-                        elif jodi_number == 10:
-                            column = 1  # 10 goes to column 1
-                        elif jodi_number == 20:
-                            column = 2  # 20 goes to column 2
-                        elif jodi_number == 30:
-                            column = 3  # 30 goes to column 3
-                        elif jodi_number == 40:
-                            column = 4  # 40 goes to column 4
-                        elif jodi_number == 50:
-                            column = 5  # 50 goes to column 5
-                        elif jodi_number == 60:
-                            column = 6  # 60 goes to column 6
-                        elif jodi_number == 70:
-                            column = 7  # 70 goes to column 7
-                        elif jodi_number == 80:
-                            column = 8  # 80 goes to column 8
-                        elif jodi_number == 90:
-                            column = 9  # 90 goes to column 9
-                        else:
-                            # For numbers like 11-19, 21-29, etc., use tens digit
-                            tens_digit = jodi_number // 10
-                            if tens_digit >= 1 and tens_digit <= 9:
-                                column = tens_digit
-                            else:
-                                continue  # Skip invalid numbers
-                        
-                        column_totals[column] += value
+                    jodi_number = entry['jodi_number']
+                    
+                    # Map jodi number to its time table column (see _JODI_COL), skipping invalid numbers
+                    if 0 <= jodi_number < 100:
+                        column_totals[_JODI_COL[jodi_number]] += entry['value']
                         
         except Exception as e:
             print(f"Error calculating jodi column totals: {e}")
@@ -1802,112 +2027,93 @@ def create_working_main_gui():
         return column_totals
     
     def refresh_jodi_table():
-        """Refresh jodi table data for selected customer+date+bazar"""
+        """Refresh jodi table data for selected customer+date+bazar (the database is read on a worker thread)"""
         try:
             if dpg.does_item_exist("jodi_grid_table"):
-                dpg.delete_item("jodi_grid_table", children_only=True, slot=1)
-                
                 # Get selected filters from display fields
                 customer_value = dpg.get_value("jodi_customer_filter")
                 date_str = dpg.get_value("jodi_date_display")
                 bazar_value = dpg.get_value("jodi_bazar_filter")
                 
+                # Nothing to redraw if these filters were rendered and nothing was written since
+                if render_is_current("jodi", (customer_value, date_str, bazar_value)):
+                    return
+                
                 if date_str and bazar_value and bazar_value != "No Bazars":
-                    # Get jodi data from database for selected filters
-                    jodi_values = {}  # jodi_number -> value mapping
-                    
                     if db_manager:
-                        try:
-                            # Get bazar name (not display name)
-                            bazar_name = bazar_value
-                            for bazar in bazars:
-                                if bazar['display_name'] == bazar_value:
-                                    bazar_name = bazar['name']
-                                    break
-                            
-                            # Fetch jodi data based on customer selection
-                            if customer_value == "All Customers":
-                                # Show aggregated data for all customers (existing behavior)
-                                if hasattr(db_manager, 'get_jodi_table_values'):
-                                    jodi_data = db_manager.get_jodi_table_values(bazar_name, date_str)
-                                    for entry in jodi_data:
-                                        if hasattr(entry, '__getitem__'):  # Row object or dict
-                                            jodi_values[entry['jodi_number']] = entry['value']
-                            else:
-                                # Show data for specific customer from universal_log
-                                if hasattr(db_manager, 'get_jodi_table_values_by_customer'):
-                                    jodi_data = db_manager.get_jodi_table_values_by_customer(customer_value, bazar_name, date_str)
-                                    for entry in jodi_data:
-                                        if hasattr(entry, '__getitem__'):  # Row object or dict
-                                            jodi_values[entry['jodi_number']] = entry['value']
-                        except Exception as e:
-                            print(f"Database error: {e}")
-                    
-                    # Show empty table if no data
-                    # No dummy values added
-                    
-                    # Create 10x10 grid arranged as per user's layout
-                    # Row 1: 11, 21, 31, 41, 51, 61, 71, 81, 91, 1
-                    # Row 2: 12, 22, 32, 42, 52, 62, 72, 82, 92, 2
-                    # ...
-                    # Row 9: 19, 29, 39, 49, 59, 69, 79, 89, 99, 9
-                    # Row 10: 10, 20, 30, 40, 50, 60, 70, 80, 90, 0
-                    for row in range(10):
-                        with dpg.table_row(parent="jodi_grid_table"):
-                            for col in range(10):
-                                # Calculate jodi number for this position
-                                if col == 9:  # Last column (0X numbers)
-                                    if row == 9:  # Last row, last column = 00
-                                        jodi_number = 0
-                                    else:  # Other rows in last column = 1,2,3,4,5,6,7,8,9
-                                        jodi_number = row + 1
-                                else:  # Other columns (1X, 2X, 3X, 4X, 5X, 6X, 7X, 8X, 9X)
-                                    tens_digit = col + 1  # 1,2,3,4,5,6,7,8,9
-                                    if row == 9:  # Last row = X0 (10,20,30,40,50,60,70,80,90)
-                                        jodi_number = tens_digit * 10
-                                    else:  # Other rows = X1,X2,X3,X4,X5,X6,X7,X8,X9
-                                        jodi_number = tens_digit * 10 + (row + 1)
-                                
-                                # Jodi number cell
-                                dpg.add_text(f"{jodi_number:02d}")
-                                
-                                # Value cell
-                                value = jodi_values.get(jodi_number, 0)
-                                if value > 0:
-                                    dpg.add_text(str(value), color=(39, 174, 96, 255))  # Green for non-zero
-                                else:
-                                    dpg.add_text("0", color=(108, 117, 125, 255))  # Gray for zero
-                    
-                    # Add summary information
-                    total_jodi_numbers = 100  # 00-99
-                    non_zero_count = len([v for v in jodi_values.values() if v > 0])
-                    total_value = sum(jodi_values.values())
-                    
-                    if customer_value == "All Customers":
-                        dpg.set_value("status_text", 
-                            f"Jodi table loaded for All Customers in {bazar_value} | "
-                            f"Jodi numbers: {non_zero_count}/{total_jodi_numbers} active | "
-                            f"Total value: ₹{total_value:,}")
+                        # Get bazar name (not display name)
+                        bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
+                        
+                        # Fetch jodi data based on customer selection, reusing the cached values while nothing was written
+                        jodi_customer = None if customer_value == "All Customers" else customer_value
+                        dpg.set_value("status_text", f"Loading jodi table for {bazar_value}...")
+                        load_table_values("jodi", _slice_cache, (bazar_name, date_str, jodi_customer),
+                                          lambda: load_bazar_date_values(bazar_name, date_str, jodi_customer),
+                                          lambda values: render_jodi_table(customer_value, bazar_value, values[1]),
+                                          NO_SLICE_VALUES)
                     else:
-                        dpg.set_value("status_text", 
-                            f"Jodi table loaded for {customer_value} in {bazar_value} | "
-                            f"Jodi numbers: {non_zero_count}/{total_jodi_numbers} active | "
-                            f"Total value: ₹{total_value:,}")
+                        # Show empty table if no data
+                        render_jodi_table(customer_value, bazar_value, NO_JODI_VALUES)
                 else:
+                    supersede_fetches("jodi")
+                    patch_table_rows("jodi_grid_table", [])
                     dpg.set_value("status_text", "Please select customer, date and bazar to load Jodi table")
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing jodi table: {e}")
     
+    def render_jodi_table(customer_value, bazar_value, jodi_values):
+        """Fill the jodi grid from jodi_values (indexed by jodi number)"""
+        try:
+            if not dpg.does_item_exist("jodi_grid_table"):
+                return
+            
+            # Create 10x10 grid arranged as per user's layout (see JODI_GRID)
+            jodi_rows = []
+            for grid_row, label_row in zip(JODI_GRID, JODI_LABELS):
+                cells = []
+                for jodi_number, label in zip(grid_row, label_row):
+                    # Jodi number cell and value cell
+                    value = jodi_values[jodi_number]
+                    if value > 0:
+                        cells += ((label, None), (str(value), _GREEN))  # Green for non-zero
+                    else:
+                        cells += ((label, None), ("0", _MUTED))  # Gray for zero
+                jodi_rows.append(tuple(cells))
+            # Grid rows keep their widgets between refreshes, only changed cells are updated
+            patch_table_rows("jodi_grid_table", list(enumerate(jodi_rows)))
+            
+            # Add summary information
+            total_jodi_numbers = 100  # 00-99
+            non_zero_count = sum(1 for v in jodi_values if v > 0)
+            total_value = sum(jodi_values)
+            
+            if customer_value == "All Customers":
+                dpg.set_value("status_text", 
+                    f"Jodi table loaded for All Customers in {bazar_value} | "
+                    f"Jodi numbers: {non_zero_count}/{total_jodi_numbers} active | "
+                    f"Total value: ₹{total_value:,}")
+            else:
+                dpg.set_value("status_text", 
+                    f"Jodi table loaded for {customer_value} in {bazar_value} | "
+                    f"Jodi numbers: {non_zero_count}/{total_jodi_numbers} active | "
+                    f"Total value: ₹{total_value:,}")
+        except Exception as e:
+            dpg.set_value("status_text", f"Error refreshing jodi table: {e}")
+    
     def refresh_summary_table():
-        """Refresh customer summary table data"""
+        """Refresh customer summary table data (only changed rows are touched)"""
         try:
             if dpg.does_item_exist("summary_table"):
-                dpg.delete_item("summary_table", children_only=True, slot=1)
+                rows = []
                 
                 # Get selected filters from display fields
                 date_str = dpg.get_value("summary_date_display")
                 customer_value = dpg.get_value("summary_customer_filter")
                 
+                # Nothing to patch if these filters were rendered and nothing was written since
+                if render_is_current("summary", (date_str, customer_value)):
+                    return
+                
                 # Get real customer summary data from database
                 if date_str and db_manager and hasattr(db_manager, 'get_customer_bazar_summary_by_date'):
                     try:
@@ -1917,37 +2123,33 @@ def create_working_main_gui():
                             for entry in summary_data:
                                 # Filter by customer if specific customer selected
                                 if customer_value == "All Customers" or entry['customer_name'] == customer_value:
-                                    with dpg.table_row(parent="summary_table"):
+                                    rows.append((entry['customer_name'], (
                                         # Apply color coding based on commission type
-                                        customer_color = get_customer_name_color(entry['customer_name'])
-                                        dpg.add_text(entry['customer_name'], color=customer_color)
+                                        (entry['customer_name'], get_customer_name_color(entry['customer_name'])),
                                         # Bazar totals in order: T.O, T.K, M.O, M.K, K.O, K.K, NMO, NMK, B.O, B.K
-                                        dpg.add_text(f"{entry['to_total']:,}")
-                                        dpg.add_text(f"{entry['tk_total']:,}")
-                                        dpg.add_text(f"{entry['mo_total']:,}")
-                                        dpg.add_text(f"{entry['mk_total']:,}")
-                                        dpg.add_text(f"{entry['ko_total']:,}")
-                                        dpg.add_text(f"{entry['kk_total']:,}")
-                                        dpg.add_text(f"{entry['nmo_total']:,}")
-                                        dpg.add_text(f"{entry['nmk_total']:,}")
-                                        dpg.add_text(f"{entry['bo_total']:,}")
-                                        dpg.add_text(f"{entry['bk_total']:,}")
-                                        dpg.add_text(f"{entry['grand_total']:,}")  # Grand total
-                                        dpg.add_text(entry['updated_at'] or entry['created_at'])
+                                        (f"{entry['to_total']:,}", None),
+                                        (f"{entry['tk_total']:,}", None),
+                                        (f"{entry['mo_total']:,}", None),
+                                        (f"{entry['mk_total']:,}", None),
+                                        (f"{entry['ko_total']:,}", None),
+                                        (f"{entry['kk_total']:,}", None),
+                                        (f"{entry['nmo_total']:,}", None),
+                                        (f"{entry['nmk_total']:,}", None),
+                                        (f"{entry['bo_total']:,}", None),
+                                        (f"{entry['bk_total']:,}", None),
+                                        (f"{entry['grand_total']:,}", None),  # Grand total
+                                        (entry['updated_at'] or entry['created_at'], None),
+                                    )))
                         else:
-                            # Show empty row if no data
-                            with dpg.table_row(parent="summary_table"):
-                                dpg.add_text("No summary data available for selected date", color=(150, 150, 150, 255))
-                                for i in range(12):  # 11 bazars + Total + Date (now includes K.K)
-                                    dpg.add_text("", color=(150, 150, 150, 255))
+                            # Show empty row if no data (11 bazars + Total + Date, now includes K.K)
+                            rows.append(((None, "empty"), (("No summary data available for selected date", _GRAY),) + _EMPTY_GRAY_CELLS[:12]))
                     except Exception as e:
                         print(f"Database error loading summary: {e}")
+                        _last_render.pop("summary", None)  # Retry on the next refresh
                         # Show error row
-                        with dpg.table_row(parent="summary_table"):
-                            dpg.add_text("Error loading data")
-                            for i in range(12):  # 11 bazars + Total + Date (now includes K.K)
-                                dpg.add_text("-")
-                        
+                        rows.append(((None, "error"), (("Error loading data", None),) + _DASH_CELLS[:12]))
+                
+                patch_table_rows("summary_table", rows)
                 dpg.set_value("status_text", f"Summary table loaded for {date_str}")
         except Exception as e:
             dpg.set_value("status_text", f"Error refreshing summary table: {e}")
@@ -1966,11 +2168,7 @@ def create_working_main_gui():
                 
                 if date_str and bazar_value and bazar_value != "No Bazars":
                     # Get bazar name
-                    bazar_name = bazar_value
-                    for bazar in bazars:
-                        if bazar['display_name'] == bazar_value:
-                            bazar_name = bazar['name']
-                            break
+                    bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
                     
                     filepath = export_manager.export_pana_table(db_manager, bazar_name, date_str)
                     dpg.set_value("status_text", f"Pana table exported to: {filepath}")
@@ -1994,11 +2192,7 @@ def create_working_main_gui():
                 
                 if date_str and bazar_value and bazar_value != "No Bazars":
                     # Get bazar name
-                    bazar_name = bazar_value
-                    for bazar in bazars:
-                        if bazar['display_name'] == bazar_value:
-                            bazar_name = bazar['name']
-                            break
+                    bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
                     
                     filepath = export_manager.export_time_table(db_manager, bazar_name, date_str)
                     dpg.set_value("status_text", f"Time table exported to: {filepath}")
@@ -2022,11 +2216,7 @@ def create_working_main_gui():
                 
                 if date_str and bazar_value and bazar_value != "No Bazars":
                     # Get bazar name
-                    bazar_name = bazar_value
-                    for bazar in bazars:
-                        if bazar['display_name'] == bazar_value:
-                            bazar_name = bazar['name']
-                            break
+                    bazar_name = bazar_name_by_display.get(bazar_value, bazar_value)
                     
                     # Export jodi table data (may need to add this method to ExportManager)
                     try:
@@ -2128,7 +2318,6 @@ def create_working_main_gui():
         # Single Row - Name, ID, Bazar, Date (reordered and optimized)
         with dpg.group(horizontal=True):
             dpg.add_text("Name:")
-            customer_names = [c["name"] for c in customers]
             dpg.add_combo(
                 items=customer_names,
                 default_value=customer_names[0] if customer_names else "No Customers",
@@ -2150,7 +2339,7 @@ def create_working_main_gui():
             dpg.add_spacer(width=10)
             
             dpg.add_text("Bazar:")
-            bazar_names = [b["display_name"] for b in bazars]
+            bazar_names = bazar_display_names()
             dpg.add_combo(
                 items=bazar_names,
                 default_value=bazar_names[0] if bazar_names else "No Bazars",
@@ -2166,7 +2355,7 @@ def create_working_main_gui():
             today = date.today()
             dpg.add_input_text(
                 tag="date_display",
-                default_value=today.strftime("%Y-%m-%d"),
+                default_value=_today_iso_cached(),
                 width=85,
                 readonly=True
             )
@@ -2199,7 +2388,7 @@ def create_working_main_gui():
             with dpg.group(horizontal=True):
                 dpg.add_button(
                     label="Apply",
-                    callback=lambda: apply_date_change(),
+                    callback=apply_date_change,
                     width=80
                 )
                 dpg.add_button(
@@ -2376,6 +2565,8 @@ def main():
         
         while dpg.is_dearpygui_running():
             dpg.render_dearpygui_frame()
+            run_scheduled_callbacks()
+            drain_fetch_results()
             
             # Progress indicator
             frame_count += 1
@@ -2387,6 +2578,7 @@ def main():
         print("🛑 GUI closed by user")
         
         # Cleanup
+        _db_pool.shutdown(wait=True, cancel_futures=True)
         if db_manager:
             db_manager.close()
         
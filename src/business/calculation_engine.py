@@ -3,6 +3,7 @@
 from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import date
 from dataclasses import dataclass, field
+from operator import attrgetter
 from ..database.models import (
     ParsedInputResult, PanaEntry, TypeTableEntry, 
     TimeEntry, MultiEntry, UniversalLogEntry, EntryType
@@ -10,6 +11,8 @@ from ..database.models import (
 from ..utils.logger import get_logger
 from ..utils.error_handler import CalculationError
 
+_entry_value = attrgetter('value')
+
 @dataclass
 class CalculationContext:
     """Context for calculation operations"""
@@ -508,42 +511,22 @@ class CalculationEngine:
         if not entries:
             return 0
         
-        # Group entries by value (for mixed value scenarios)
-        value_groups = {}
-        for entry in entries:
-            value = entry.value
-            if value not in value_groups:
-                value_groups[value] = []
-            value_groups[value].append(entry)
-        
-        total = 0
-        for value, group_entries in value_groups.items():
-            # Each group: count × value
-            count = len(group_entries)
-            group_total = count * value
-            total += group_total
-        
-        return total
+        # Each value group contributes count × value, which is just the
+        # sum of values - summed in C via map/attrgetter
+        return sum(map(_entry_value, entries))
     
     def calculate_type_total(self, entries: List[TypeTableEntry]) -> int:
         """Calculate type table total by expanding numbers from tables"""
         total = 0
+        tables = {'SP': self.sp_table, 'DP': self.dp_table, 'CP': self.cp_table}
         
         for entry in entries:
             # Get numbers from appropriate table
-            if entry.table_type == 'SP':
-                numbers = self.sp_table.get(entry.column, set())
-            elif entry.table_type == 'DP':
-                numbers = self.dp_table.get(entry.column, set())
-            elif entry.table_type == 'CP':
-                numbers = self.cp_table.get(entry.column, set())
-            else:
-                numbers = set()
+            table = tables.get(entry.table_type)
+            numbers = table.get(entry.column, ()) if table else ()
             
             # Each number in the column gets the full value
-            number_count = len(numbers)
-            entry_total = number_count * entry.value
-            total += entry_total
+            total += len(numbers) * entry.value
         
         return total
     
@@ -563,11 +546,11 @@ class CalculationEngine:
     
     def calculate_multi_total(self, entries: List[MultiEntry]) -> int:
         """Calculate multiplication total per specification"""
-        return sum(entry.value for entry in entries)
+        return sum(map(_entry_value, entries))
     
     def calculate_direct_total(self, entries: List) -> int:
         """Calculate direct number total (simple sum of values)"""
-        return sum(entry.value for entry in entries)
+        return sum(map(_entry_value, entries))
     
     def calculate_jodi_total(self, entries: List) -> int:
         """Calculate jodi total - each jodi number gets the full value"""
@@ -1,10 +1,10 @@
 """Data Processor for coordinating parsing, calculation, and database operations"""
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet
 from datetime import date, datetime
 from dataclasses import dataclass
 from ..database.db_manager import DatabaseManager
-from ..database.models import UniversalLogEntry, Customer, Bazar, EntryType
+from ..database.models import UniversalLogEntry, Customer, Bazar, EntryType, ENTRY_TYPE_NAMES
 from ..business.calculation_engine import CalculationEngine, CalculationContext, BusinessCalculation
 from ..parsing.mixed_input_parser import MixedInputParser
 from ..parsing.type_table_parser import TypeTableLoader
@@ -125,15 +125,15 @@ class DataProcessor:
             self.calculation_engine = CalculationEngine()
             self.mixed_parser = MixedInputParser()
     
-    def _load_pana_numbers(self) -> set:
+    def _load_pana_numbers(self) -> FrozenSet[int]:
         """Load pana reference numbers from database"""
         try:
             query = "SELECT number FROM pana_numbers"
             results = self.db_manager.execute_query(query)
-            return {row['number'] for row in results}
+            return frozenset(row[0] for row in results)
         except Exception as e:
             self.logger.warning(f"Failed to load pana numbers: {e}")
-            return set()
+            return frozenset()
     
     def process_input(self, context: ProcessingContext) -> ProcessingResult:
         """
@@ -442,7 +442,7 @@ class DataProcessor:
                 bazar_totals[bazar] = bazar_totals.get(bazar, 0) + entry['value']
                 
                 # Entry type totals
-                entry_type = entry['entry_type']
+                entry_type = ENTRY_TYPE_NAMES.get(entry['entry_type'], entry['entry_type'])
                 entry_type_totals[entry_type] = entry_type_totals.get(entry_type, 0) + entry['value']
             
             return {
@@ -488,7 +488,7 @@ class DataProcessor:
                 customer_totals[customer] = customer_totals.get(customer, 0) + entry['value']
                 
                 # Entry type totals
-                entry_type = entry['entry_type']
+                entry_type = ENTRY_TYPE_NAMES.get(entry['entry_type'], entry['entry_type'])
                 entry_type_totals[entry_type] = entry_type_totals.get(entry_type, 0) + entry['value']
                 
                 # Number frequencies
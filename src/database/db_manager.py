@@ -2,11 +2,33 @@
 
 import sqlite3
 import threading
+import time
 from contextlib import contextmanager
+from functools import wraps
 from typing import Dict, List, Optional, Any, Tuple
 import os
 import logging
 
+# Reads that still hit SQLITE_BUSY/SQLITE_LOCKED after the connection's busy timeout
+# (e.g. during a WAL checkpoint) are retried this many times, backing off between attempts
+BUSY_RETRIES = 3
+BUSY_RETRY_DELAY = 0.05
+
+def retry_on_busy(method):
+    """Retry a read-only DatabaseManager method when SQLite reports the database busy or locked"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        for attempt in range(1, BUSY_RETRIES + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                message = str(e).lower()
+                if attempt == BUSY_RETRIES or ("locked" not in message and "busy" not in message):
+                    raise
+                self.logger.warning(f"{method.__name__} hit a busy database, retrying ({attempt}/{BUSY_RETRIES})")
+                time.sleep(BUSY_RETRY_DELAY * attempt)
+    return wrapper
+
 class DatabaseManager:
     """Centralized database operations with connection pooling"""
     
@@ -15,6 +37,7 @@ class DatabaseManager:
         self.local = threading.local()
         self.lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+        self._write_version = 0  # Bumped on every commit, see data_version()
         
         # Ensure database directory exists (skip for in-memory DB)
         if self.db_path != ":memory:" and os.path.dirname(self.db_path):
@@ -26,7 +49,8 @@ class DatabaseManager:
             self.local.connection = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,
-                timeout=30.0
+                timeout=30.0,  # busy timeout: wait up to 30s on a locked database before raising
+                cached_statements=256  # Reuse prepared statements keyed on SQL text
             )
             # Enable foreign keys and optimizations
             self.local.connection.execute("PRAGMA foreign_keys = ON")
@@ -37,8 +61,20 @@ class DatabaseManager:
             # Set row factory for dict-like access
             self.local.connection.row_factory = sqlite3.Row
             
+            # Cursor reused by this thread's reads, see read_cursor()
+            self.local.read_cursor = self.local.connection.cursor()
+            
         return self.local.connection
     
+    def read_cursor(self) -> sqlite3.Cursor:
+        """This thread's cursor for SELECTs, re-executed for each query instead of allocating a new one.
+        
+        Together with the connection's statement cache, a repeated query is neither
+        re-parsed nor given a fresh cursor. Results must be fetched before the next query.
+        """
+        self.get_connection()
+        return self.local.read_cursor
+    
     @contextmanager
     def transaction(self):
         """Context manager for database transactions"""
@@ -46,6 +82,8 @@ class DatabaseManager:
         try:
             yield conn
             conn.commit()
+            with self.lock:
+                self._write_version += 1
         except Exception as e:
             conn.rollback()
             self.logger.error(f"Transaction failed: {e}")
@@ -56,6 +94,7 @@ class DatabaseManager:
         # Check if database already exists and has tables
         if self._database_exists():
             self.logger.info("Database already exists, skipping initialization")
+            self.ensure_indexes()
             return
         
         schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
@@ -73,6 +112,25 @@ class DatabaseManager:
             conn.executescript(schema_sql)
             self.logger.info("Database initialized successfully")
     
+    def ensure_indexes(self):
+        """Create indexes added after a database may already have been initialized"""
+        with self.transaction() as conn:
+            # Serves the created_at range and top-customers GROUP BY of today's activity queries;
+            # the created_at-only index it replaces is a redundant prefix
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_universal_log_created_customer
+            ON universal_log(created_at, customer_name)
+            """)
+            conn.execute("DROP INDEX IF EXISTS idx_universal_log_created_at")
+            
+            # Covers the per bazar+date (and customer) universal_log reads behind the jodi and time tables;
+            # the (bazar, entry_date) index it replaces is a redundant prefix
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_universal_log_bazar_date_covering
+            ON universal_log(bazar, entry_date, customer_name, entry_type, number, value)
+            """)
+            conn.execute("DROP INDEX IF EXISTS idx_universal_log_bazar_date")
+    
     def _database_exists(self) -> bool:
         """Check if database exists and has tables"""
         try:
@@ -126,16 +184,29 @@ class DatabaseManager:
         -- Create indexes
         CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(name);
         CREATE INDEX IF NOT EXISTS idx_universal_log_customer_date ON universal_log(customer_id, entry_date);
-        CREATE INDEX IF NOT EXISTS idx_universal_log_bazar_date ON universal_log(bazar, entry_date);
+        CREATE INDEX IF NOT EXISTS idx_universal_log_created_customer ON universal_log(created_at, customer_name);
+        CREATE INDEX IF NOT EXISTS idx_universal_log_bazar_date_covering ON universal_log(bazar, entry_date, customer_name, entry_type, number, value);
         """
         
         with self.transaction() as conn:
             conn.executescript(basic_schema)
     
+    def data_version(self) -> int:
+        """Counter that advances whenever the data may have changed.
+        
+        Bumped by every commit made through this manager, and when SQLite reports
+        a commit from another connection (PRAGMA data_version) since this thread last asked.
+        """
+        external = self.read_cursor().execute("PRAGMA data_version").fetchone()[0]
+        with self.lock:
+            if getattr(self.local, 'external_version', external) != external:
+                self._write_version += 1
+            self.local.external_version = external
+            return self._write_version
+    
     def execute_query(self, query: str, params: Optional[Tuple] = None) -> List[sqlite3.Row]:
         """Execute a SELECT query and return results"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        cursor = self.read_cursor()
         
         if params:
             cursor.execute(query, params)
@@ -193,6 +264,24 @@ class DatabaseManager:
         query = "SELECT * FROM customers WHERE is_active = 1 ORDER BY name"
         return self.execute_query(query)
     
+    @retry_on_busy
+    def get_customers_with_stats(self) -> List[sqlite3.Row]:
+        """Get all active customers with their universal log entry count, total value and last activity"""
+        query = """
+        SELECT c.*, COALESCE(s.entries, 0) AS entries, COALESCE(s.total_value, 0) AS total_value,
+               s.last_activity
+        FROM customers c
+        LEFT JOIN (
+            SELECT customer_id, COUNT(*) AS entries, SUM(value) AS total_value,
+                   MAX(created_at) AS last_activity
+            FROM universal_log
+            GROUP BY customer_id
+        ) s ON s.customer_id = c.id
+        WHERE c.is_active = 1
+        ORDER BY c.name
+        """
+        return self.execute_query(query)
+    
     # Bazar Operations
     def get_all_bazars(self) -> List[sqlite3.Row]:
         """Get all active bazars"""
@@ -248,6 +337,7 @@ class DatabaseManager:
         ]
         return self.execute_many(query, params_list)
     
+    @retry_on_busy
     def get_universal_log_entries(self, filters: Optional[Dict[str, Any]] = None, 
                                  limit: int = 1000, offset: int = 0) -> List[sqlite3.Row]:
         """Get universal log entries with optional filters"""
@@ -306,6 +396,7 @@ class DatabaseManager:
             """
             self.execute_update(insert_query, (bazar, entry_date, number, value_to_add))
     
+    @retry_on_busy
     def get_pana_table_values(self, bazar: str, entry_date: str) -> List[sqlite3.Row]:
         """Get all pana values for a specific bazar and date"""
         query = """
@@ -315,6 +406,16 @@ class DatabaseManager:
         """
         return self.execute_query(query, (bazar, entry_date))
     
+    def get_pana_totals_by_number(self, bazar: str, entry_date: str) -> List[sqlite3.Row]:
+        """Get pana values summed per number for a specific bazar and date"""
+        query = """
+        SELECT number, SUM(value) as value FROM pana_table
+        WHERE bazar = ? AND entry_date = ?
+        GROUP BY number
+        ORDER BY number
+        """
+        return self.execute_query(query, (bazar, entry_date))
+    
     def get_pana_reference_numbers(self) -> set:
         """Get all valid pana reference numbers from pana_numbers table"""
         query = "SELECT DISTINCT number FROM pana_numbers"
@@ -322,6 +423,7 @@ class DatabaseManager:
         return {row['number'] for row in rows} if rows else set()
     
     # Jodi Table Operations
+    @retry_on_busy
     def get_jodi_table_values(self, bazar: str, entry_date: str) -> List[sqlite3.Row]:
         """Get all jodi values for a specific bazar and date (aggregated for all customers)"""
         query = """
@@ -331,6 +433,7 @@ class DatabaseManager:
         """
         return self.execute_query(query, (bazar, entry_date))
     
+    @retry_on_busy
     def get_jodi_table_values_by_customer(self, customer_name: str, bazar: str, entry_date: str) -> List[sqlite3.Row]:
         """Get jodi values for a specific customer, bazar and date from universal_log"""
         query = """
@@ -397,6 +500,7 @@ class DatabaseManager:
         results = self.execute_query(query, (customer_id, bazar, entry_date))
         return results[0] if results else None
     
+    @retry_on_busy
     def get_time_table_by_bazar_date(self, bazar: str, entry_date: str) -> List[sqlite3.Row]:
         """Get all time table entries for a specific bazar and date"""
         query = """
@@ -406,6 +510,63 @@ class DatabaseManager:
         """
         return self.execute_query(query, (bazar, entry_date))
     
+    @retry_on_busy
+    def get_time_table_with_jodi(self, bazar: str, entry_date: str,
+                                 customer_name: Optional[str] = None) -> Tuple[List[sqlite3.Row], List[sqlite3.Row]]:
+        """Get the time table rows and the jodi values for a bazar and date in one call.
+        
+        Time rows hold customer_name, col_1 .. col_9, col_0, total, updated_at and
+        created_at in that (display) order, so they can be read by position. Jodi values
+        are the jodi_table aggregate for all customers, or summed from universal_log
+        when customer_name is given.
+        """
+        cursor = self.read_cursor()
+        
+        time_rows = cursor.execute("""
+        SELECT customer_name, col_1, col_2, col_3, col_4, col_5, col_6, col_7, col_8, col_9, col_0,
+               total, updated_at, created_at
+        FROM time_table
+        WHERE bazar = ? AND entry_date = ?
+        ORDER BY customer_name
+        """, (bazar, entry_date)).fetchall()
+        
+        return time_rows, self._select_jodi_values(cursor, bazar, entry_date, customer_name)
+    
+    def _select_jodi_values(self, cursor: sqlite3.Cursor, bazar: str, entry_date: str,
+                            customer_name: Optional[str]) -> List[sqlite3.Row]:
+        """Jodi values for a bazar and date on cursor, from jodi_table or for one customer from universal_log"""
+        if customer_name is None:
+            return cursor.execute("""
+            SELECT jodi_number, value FROM jodi_table
+            WHERE bazar = ? AND entry_date = ?
+            ORDER BY jodi_number
+            """, (bazar, entry_date)).fetchall()
+        return cursor.execute("""
+        SELECT number as jodi_number, SUM(value) as value 
+        FROM universal_log
+        WHERE customer_name = ? AND bazar = ? AND entry_date = ? AND entry_type = 'JODI'
+        GROUP BY number
+        ORDER BY number
+        """, (customer_name, bazar, entry_date)).fetchall()
+    
+    @retry_on_busy
+    def get_bazar_date_slice(self, bazar: str, entry_date: str,
+                             customer_name: Optional[str] = None) -> Tuple[List[sqlite3.Row], List[sqlite3.Row]]:
+        """Get the pana values and jodi values for a bazar and date in one call.
+        
+        Pana values come from pana_table, which is kept for all customers. Jodi values
+        are for customer_name when given, otherwise for all customers.
+        """
+        cursor = self.read_cursor()
+        
+        pana_rows = cursor.execute("""
+        SELECT number, value FROM pana_table
+        WHERE bazar = ? AND entry_date = ?
+        ORDER BY number
+        """, (bazar, entry_date)).fetchall()
+        
+        return pana_rows, self._select_jodi_values(cursor, bazar, entry_date, customer_name)
+    
     # Customer Bazar Summary Operations
     def update_customer_bazar_summary(self, customer_id: int, customer_name: str, 
                                      entry_date: str, bazar_totals: Dict[str, int]) -> None:
@@ -1,5 +1,7 @@
 """Data models for RickyMama application using dataclasses"""
 
+import sys
+from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import List, Dict, Optional, Any
@@ -14,6 +16,10 @@ class EntryType(Enum):
     DIRECT = "DIRECT"
     JODI = "JODI"
 
+# Canonical interned entry type strings; rows read back from SQLite carry fresh
+# string objects, mapping them through here makes dict keys compare by identity
+ENTRY_TYPE_NAMES = {member.value: sys.intern(member.value) for member in EntryType}
+
 class PatternType(Enum):
     """Input pattern type enumeration"""
     PANA_TABLE = "pana_table"
@@ -283,6 +289,25 @@ class ParsedInputResult:
         """Get total number of parsed entries"""
         return (len(self.pana_entries) + len(self.type_entries) + 
                 len(self.time_entries) + len(self.multi_entries) + len(self.direct_entries) + len(self.jodi_entries))
+    
+    @property
+    def direct_values(self) -> List[int]:
+        """Get direct entry values as a flat list"""
+        return [entry.value for entry in self.direct_entries]
+    
+    @property
+    def time_values(self) -> List[int]:
+        """Get time entry values as a flat list (parallel to time_column_counts)"""
+        return [entry.value for entry in self.time_entries]
+    
+    @property
+    def time_column_counts(self) -> List[int]:
+        """Get time entry column counts as a flat list (parallel to time_values)"""
+        return [len(entry.columns) for entry in self.time_entries]
+    
+    def copy(self) -> 'ParsedInputResult':
+        """Get an independent copy (entry lists and entries are both copied)"""
+        return deepcopy(self)
 
 @dataclass
 class CalculationResult:
@@ -112,10 +112,10 @@ CREATE TABLE universal_log (
 
 -- Create indexes for universal_log
 CREATE INDEX idx_universal_log_customer_date ON universal_log(customer_id, entry_date);
-CREATE INDEX idx_universal_log_bazar_date ON universal_log(bazar, entry_date);
 CREATE INDEX idx_universal_log_number ON universal_log(number);
-CREATE INDEX idx_universal_log_created_at ON universal_log(created_at);
 CREATE INDEX idx_universal_log_composite ON universal_log(customer_id, bazar, entry_date);
+CREATE INDEX idx_universal_log_created_customer ON universal_log(created_at, customer_name);
+CREATE INDEX idx_universal_log_bazar_date_covering ON universal_log(bazar, entry_date, customer_name, entry_type, number, value);
 
 -- Create pana table
 CREATE TABLE pana_table (
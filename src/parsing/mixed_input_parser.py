@@ -1,6 +1,7 @@
 """Mixed input parser for Type 5 patterns (combinations of all pattern types)"""
 
 from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
 from ..database.models import ParsedInputResult, ValidationResult
 from ..utils.error_handler import ParseError, ValidationError
 from ..utils.logger import get_logger
@@ -17,6 +18,9 @@ from .jodi_parser import JodiTableParser, JodiValidator
 class MixedInputParser:
     """Mixed input parser that handles multiple pattern types in single input"""
     
+    # Recent parse results kept per parser, so preview-then-submit parses the text once
+    PARSE_CACHE_SIZE = 32
+    
     def __init__(self, 
                  pana_validator: Optional[PanaValidator] = None,
                  type_validator: Optional[TypeTableValidator] = None,
@@ -46,12 +50,14 @@ class MixedInputParser:
         self.jodi_parser = JodiTableParser(jodi_validator)
         
         self.logger = get_logger(__name__)
+        self._cached_parse = lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._parse)
     
     def parse(self, input_text: str) -> ParsedInputResult:
         """
         Main parsing entry point for mixed input
         
-        Analyzes input and routes lines to appropriate parsers based on detected patterns
+        Analyzes input and routes lines to appropriate parsers based on detected patterns.
+        Results are cached per input text; each call returns an independent copy of the cached result.
         
         Args:
             input_text: Raw input text containing multiple pattern types
@@ -63,6 +69,14 @@ class MixedInputParser:
             ParseError: If parsing fails
             ValidationError: If validation fails
         """
+        return self._cached_parse(input_text).copy()
+    
+    def clear_parse_cache(self):
+        """Drop cached parse results (e.g. after validators or reference data change)"""
+        self._cached_parse.cache_clear()
+    
+    def _parse(self, input_text: str) -> ParsedInputResult:
+        """Uncached parse behind parse()"""
         try:
             # Analyze input to detect overall pattern type
             overall_type, line_types, stats = self.pattern_detector.analyze_input(input_text)
@@ -1,7 +1,7 @@
 """Improved Pana table input parser for Type 1 patterns (128/129/120 = 100)"""
 
 import re
-from typing import List, Set, Optional
+from typing import List, Set, Optional, Collection
 from ..database.models import PanaEntry, ValidationResult
 from ..utils.error_handler import ParseError, ValidationError
 from ..utils.logger import get_logger
@@ -13,6 +13,7 @@ class PanaTableParser:
         self.validator = pana_validator
         self.separators = ['/', '+', ' ', ',', '*', '★', '✱','-']
         self.logger = get_logger(__name__)
+        self.last_total = 0  # Sum of entry values from the last successful parse()
         
         # Improved patterns for complex PANA formats
         self.pana_patterns = [
@@ -22,6 +23,17 @@ class PanaTableParser:
             r'^\d{3}[+\/\*\,\s]+.*$',                                      # PANA number lines
         ]
         
+        # Precompiled patterns used on every parsed line/value
+        self.number_pattern = re.compile(r'\d{3}')
+        self.currency_patterns = [
+            re.compile(r'RS\.{0,3}\s*[\,\.\s]*', re.IGNORECASE),   # RS..., RS. ., RS, etc.
+            re.compile(r'R\s*[\,\.\s]*', re.IGNORECASE),           # R with optional spacing/punctuation
+            re.compile(r'₹\s*', re.IGNORECASE),                     # Rupee symbol
+            re.compile(r'=\s*', re.IGNORECASE),                     # Equals sign at start
+        ]
+        self.separator_pattern = re.compile(r'[\,\.\s]+')
+        self.digits_pattern = re.compile(r'\d+')
+        
     def parse(self, input_text: str) -> List[PanaEntry]:
         """
         Main parsing entry point for pana table format with improved handling
@@ -42,21 +54,25 @@ class PanaTableParser:
             ParseError: If parsing fails
             ValidationError: If validation fails
         """
+        self.last_total = 0  # A failed parse must not leave the previous total behind
         try:
             lines = self.preprocess_input(input_text)
             entries = []
+            total = 0
             
             for line_group in self.group_multiline_entries_robust(lines):
                 parsed_group = self.parse_line_group(line_group)
                 if self.validator:
-                    validated_group = self.validator.validate_entries(parsed_group)
-                    entries.extend(validated_group)
-                else:
-                    entries.extend(parsed_group)
+                    parsed_group = self.validator.validate_entries(parsed_group)
+                entries.extend(parsed_group)
+                
+                total += sum(entry.value for entry in parsed_group)
             
             if not entries:
                 raise ParseError("No valid pana entries found")
             
+            self.last_total = total
+            
             self.logger.info(f"Successfully parsed {len(entries)} pana entries")
             return entries
             
@@ -67,18 +83,8 @@ class PanaTableParser:
     
     def preprocess_input(self, input_text: str) -> List[str]:
         """Clean and prepare input for parsing"""
-        lines = input_text.strip().split('\n')
-        processed_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line:  # Keep non-empty lines
-                processed_lines.append(line)
-            else:
-                # Keep empty lines for grouping logic
-                processed_lines.append('')
-        
-        return processed_lines
+        # Empty lines are kept (as '') for the grouping logic; split on '\n' only, strip() drops a CRLF's '\r'
+        return [line.strip() for line in input_text.strip().split('\n')]
     
     def group_multiline_entries_robust(self, lines: List[str]) -> List[List[str]]:
         """
@@ -94,42 +100,45 @@ class PanaTableParser:
         """
         groups = []
         current_group = []
+        append = current_group.append
+        group_has_value = False
         
         for line in lines:
             line = line.strip()
             
             if not line:
                 # Empty line - potential group separator
-                if current_group:
-                    # If we have accumulated lines, this might be end of group
-                    # Check if current group has a value, if not keep accumulating
-                    has_value = any('=' in l for l in current_group)
-                    if has_value:
-                        groups.append(current_group)
-                        current_group = []
+                # End the group only once it has a value, otherwise keep accumulating
+                if group_has_value:
+                    groups.append(current_group)
+                    current_group = []
+                    append = current_group.append
+                    group_has_value = False
                 continue
                 
-            if line.startswith('='):
+            if line[0] == '=':
                 # Result line - completes current group
                 if current_group:
-                    current_group.append(line)
+                    append(line)
                     groups.append(current_group)
                     current_group = []
+                    append = current_group.append
+                    group_has_value = False
                 else:
                     # Standalone result line - treat as single entry
                     groups.append([line])
+            elif '=' in line and not self.is_pana_number_line(line):
+                # Line with embedded value
+                append(line)
+                groups.append(current_group)
+                current_group = []
+                append = current_group.append
+                group_has_value = False
             else:
-                # Number line or regular line
-                if self.is_pana_number_line(line):
-                    current_group.append(line)
-                elif '=' in line:
-                    # Line with embedded value
-                    current_group.append(line)
-                    groups.append(current_group)
-                    current_group = []
-                else:
-                    # Other line types
-                    current_group.append(line)
+                # Number line or other line types
+                append(line)
+                if '=' in line:
+                    group_has_value = True
         
         # Handle any remaining group
         if current_group:
@@ -139,13 +148,8 @@ class PanaTableParser:
     
     def is_pana_number_line(self, line: str) -> bool:
         """Check if line contains PANA numbers"""
-        # Look for 3-digit numbers with separators
-        pattern = r'\d{3}[+\/\*\,\s]*'
-        matches = re.findall(pattern, line)
-        
-        # Check if we have multiple 3-digit numbers
-        numbers = re.findall(r'\d{3}', line)
-        return len(numbers) >= 1 and not line.startswith('=')
+        # Check if we have at least one 3-digit number
+        return not line.startswith('=') and self.number_pattern.search(line) is not None
     
     def parse_line_group(self, line_group: List[str]) -> List[PanaEntry]:
         """Parse a group of related lines"""
@@ -221,7 +225,7 @@ class PanaTableParser:
             return []
         
         # Find all 3-digit numbers
-        numbers = re.findall(r'\d{3}', numbers_text)
+        numbers = self.number_pattern.findall(numbers_text)
         
         # Convert to integers and validate
         valid_numbers = []
@@ -250,25 +254,18 @@ class PanaTableParser:
         cleaned = value_text.strip()
         
         # Remove common currency patterns (case insensitive)
-        currency_patterns = [
-            r'RS\.{0,3}\s*[\,\.\s]*',   # RS..., RS. ., RS, etc.
-            r'R\s*[\,\.\s]*',           # R with optional spacing/punctuation
-            r'₹\s*',                     # Rupee symbol
-            r'=\s*',                     # Equals sign at start
-        ]
-        
-        for pattern in currency_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in self.currency_patterns:
+            cleaned = pattern.sub('', cleaned)
         
         # Remove extra commas, dots, spaces but preserve the number
-        cleaned = re.sub(r'[\,\.\s]+', ' ', cleaned).strip()
+        cleaned = self.separator_pattern.sub(' ', cleaned).strip()
         
-        # Extract all numbers and take the first valid one
-        numbers = re.findall(r'\d+', cleaned)
-        if not numbers:
+        # Take the first run of digits
+        match = self.digits_pattern.search(cleaned)
+        if not match:
             raise ParseError(f"No numeric value found in: '{value_text}'")
         
-        value = int(numbers[0])
+        value = int(match.group())
         if value <= 0:
             raise ParseError(f"Value must be positive: {value}")
         
@@ -290,7 +287,7 @@ class PanaTableParser:
 class PanaValidator:
     """Validates pana table entries against reference table"""
     
-    def __init__(self, pana_reference_table: Set[int]):
+    def __init__(self, pana_reference_table: Collection[int]):
         self.valid_numbers = pana_reference_table
         self.logger = get_logger(__name__)
         
@@ -5,18 +5,15 @@ Analyze the specific input from the GUI screenshot to understand the ₹1,100 ca
 
 import sys
 import os
+from typing import Final
+import operator
+import re
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def analyze_gui_input():
-    """Analyze the exact input from the GUI screenshot"""
-    
-    print("🔍 ANALYZING GUI INPUT FROM SCREENSHOT")
-    print("=" * 70)
-    
-    # Exact input from the screenshot
-    gui_input = """138+347+230+349+269+
+# Exact input from the screenshot
+_GUI_INPUT: Final[str] = """138+347+230+349+269+
 =RS,, 400
 
 
@@ -38,81 +35,123 @@ def analyze_gui_input():
 1=100
 6=100"""
 
-    print("📝 GUI INPUT:")
-    print("-" * 30)
-    for i, line in enumerate(gui_input.split('\n'), 1):
+# Single compiled classifier over the line shapes seen in GUI input
+LINE_KINDS = re.compile(
+    r"(?P<result>=.*)"
+    r"|(?P<direct>\d+=\d+)"
+    r"|(?P<type>\d+(?:SP|DP|CP)=\d+)"
+    r"|(?P<multi>\d+x\d+)"
+    r"|(?P<pana>[\d+]+)"
+)
+
+LINE_KIND_LABELS = {
+    'result': 'Result line',
+    'direct': 'Direct line',
+    'type': 'Type line',
+    'multi': 'Multi line',
+    'pana': 'Number line',
+}
+
+def _flush(buf):
+    """Write buffered report lines in a single call and reset the buffer"""
+    if buf:
+        sys.stdout.write("\n".join(buf) + "\n")
+        buf.clear()
+
+def analyze_gui_input():
+    """Analyze the exact input from the GUI screenshot"""
+    
+    # Lines are buffered and written once per section
+    buf = []
+    out = buf.append
+    
+    out("🔍 ANALYZING GUI INPUT FROM SCREENSHOT")
+    out("=" * 70)
+    
+    out("📝 GUI INPUT:")
+    out("-" * 30)
+    for i, line in enumerate(_GUI_INPUT.split('\n'), 1):
         if line.strip():
-            print(f"{i:2d}. '{line}'")
+            out(f"{i:2d}. '{line}'")
         else:
-            print(f"{i:2d}. (empty line)")
+            out(f"{i:2d}. (empty line)")
     
     try:
+        _flush(buf)
+        
         from src.business.data_processor import DataProcessor
         from src.database.db_manager import create_database_manager
         
-        print("\n🧮 PARSING AND CALCULATION:")
-        print("-" * 50)
+        out("\n🧮 PARSING AND CALCULATION:")
+        out("-" * 50)
         
         # Create processor
         db_manager = create_database_manager()
         processor = DataProcessor(db_manager)
         
         # Parse the exact GUI input
-        mixed_parser = processor.mixed_parser
-        parsed_result = mixed_parser.parse(gui_input)
+        parsed_result = processor.mixed_parser.parse(_GUI_INPUT)
+        
+        out(f"✅ Parsing complete")
+        out(f"📊 Entry breakdown:")
+        out(f"   PANA entries: {len(parsed_result.pana_entries or [])}")
+        out(f"   TYPE entries: {len(parsed_result.type_entries or [])}")
+        out(f"   TIME entries: {len(parsed_result.time_entries or [])}")
+        out(f"   MULTI entries: {len(parsed_result.multi_entries or [])}")
+        out(f"   DIRECT entries: {len(parsed_result.direct_entries or [])}")
         
-        print(f"✅ Parsing complete")
-        print(f"📊 Entry breakdown:")
-        print(f"   PANA entries: {len(parsed_result.pana_entries or [])}")
-        print(f"   TYPE entries: {len(parsed_result.type_entries or [])}")
-        print(f"   TIME entries: {len(parsed_result.time_entries or [])}")
-        print(f"   MULTI entries: {len(parsed_result.multi_entries or [])}")
-        print(f"   DIRECT entries: {len(parsed_result.direct_entries or [])}")
+        _flush(buf)
         
         # Calculate totals
         calc_engine = processor.calculation_engine
         calc_result = calc_engine.calculate_total(parsed_result)
         
-        print(f"\n💰 CALCULATION RESULTS:")
-        print(f"   PANA total: ₹{calc_result.pana_total:,}")
-        print(f"   TYPE total: ₹{calc_result.type_total:,}")
-        print(f"   TIME total: ₹{calc_result.time_total:,}")
-        print(f"   MULTI total: ₹{calc_result.multi_total:,}")
-        print(f"   DIRECT total: ₹{calc_result.direct_total:,}")
-        print(f"   GRAND TOTAL: ₹{calc_result.grand_total:,}")
+        out(f"\n💰 CALCULATION RESULTS:")
+        out(f"   PANA total: ₹{calc_result.pana_total:,}")
+        out(f"   TYPE total: ₹{calc_result.type_total:,}")
+        out(f"   TIME total: ₹{calc_result.time_total:,}")
+        out(f"   MULTI total: ₹{calc_result.multi_total:,}")
+        out(f"   DIRECT total: ₹{calc_result.direct_total:,}")
+        out(f"   GRAND TOTAL: ₹{calc_result.grand_total:,}")
+        
+        _flush(buf)
         
         # Show detailed breakdown
-        print(f"\n🔍 DETAILED BREAKDOWN:")
-        print("-" * 30)
+        out(f"\n🔍 DETAILED BREAKDOWN:")
+        out("-" * 30)
+        
+        # Subtotals come from the flat value columns; entry objects are only
+        # walked for pretty-printing
+        direct_sum = sum(parsed_result.direct_values)
+        time_sum = sum(map(operator.mul, parsed_result.time_values, parsed_result.time_column_counts))
         
         # DIRECT entries
         if hasattr(parsed_result, 'direct_entries') and parsed_result.direct_entries:
-            print(f"DIRECT entries ({len(parsed_result.direct_entries)}):")
-            direct_total = 0
+            out(f"DIRECT entries ({len(parsed_result.direct_entries)}):")
             for entry in parsed_result.direct_entries:
-                print(f"   {entry.number} = ₹{entry.value}")
-                direct_total += entry.value
-            print(f"   DIRECT subtotal: ₹{direct_total}")
+                out(f"   {entry.number} = ₹{entry.value}")
+            out(f"   DIRECT subtotal: ₹{direct_sum}")
         
         # TIME entries
         if parsed_result.time_entries:
-            print(f"\nTIME entries ({len(parsed_result.time_entries)}):")
-            time_total = 0
+            out(f"\nTIME entries ({len(parsed_result.time_entries)}):")
             for entry in parsed_result.time_entries:
-                entry_total = entry.value * len(entry.columns)
+                column_count = len(entry.columns)
+                entry_total = entry.value * column_count
                 columns_str = " ".join(map(str, sorted(entry.columns)))
-                print(f"   Columns {columns_str} = ₹{entry.value} × {len(entry.columns)} = ₹{entry_total}")
-                time_total += entry_total
-            print(f"   TIME subtotal: ₹{time_total}")
+                out(f"   Columns {columns_str} = ₹{entry.value} × {column_count} = ₹{entry_total}")
+            out(f"   TIME subtotal: ₹{time_sum}")
         
         # PANA entries (if any)
         if parsed_result.pana_entries:
-            print(f"\nPANA entries ({len(parsed_result.pana_entries)}):")
+            out(f"\nPANA entries ({len(parsed_result.pana_entries)}):")
             pana_total = 0
             for entry in parsed_result.pana_entries:
-                print(f"   {entry.number} = ₹{entry.value}")
+                out(f"   {entry.number} = ₹{entry.value}")
                 pana_total += entry.value
-            print(f"   PANA subtotal: ₹{pana_total}")
+            out(f"   PANA subtotal: ₹{pana_total}")
+        
+        _flush(buf)
         
         # Manual verification
         manual_total = (
@@ -123,41 +162,43 @@ def analyze_gui_input():
             calc_result.multi_total
         )
         
-        print(f"\n✅ VERIFICATION:")
-        print(f"   Manual calculation: ₹{manual_total:,}")
-        print(f"   Engine calculation: ₹{calc_result.grand_total:,}")
-        print(f"   GUI shows: ₹1,100")
+        out(f"\n✅ VERIFICATION:")
+        out(f"   Manual calculation: ₹{manual_total:,}")
+        out(f"   Engine calculation: ₹{calc_result.grand_total:,}")
+        out(f"   GUI shows: ₹1,100")
         
         if calc_result.grand_total == 1100:
-            print("✅ GUI calculation matches engine!")
+            out("✅ GUI calculation matches engine!")
         else:
-            print(f"❌ MISMATCH!")
-            print(f"   Expected GUI total: ₹{calc_result.grand_total:,}")
-            print(f"   Actual GUI total: ₹1,100")
-            print(f"   Difference: ₹{abs(calc_result.grand_total - 1100):,}")
+            out(f"❌ MISMATCH!")
+            out(f"   Expected GUI total: ₹{calc_result.grand_total:,}")
+            out(f"   Actual GUI total: ₹1,100")
+            out(f"   Difference: ₹{abs(calc_result.grand_total - 1100):,}")
+        
+        _flush(buf)
         
         # Check why it might be 1100
-        print(f"\n🤔 WHY ₹1,100?")
-        print("-" * 20)
+        out(f"\n🤔 WHY ₹1,100?")
+        out("-" * 20)
         
-        # Count all possible entries
-        if hasattr(parsed_result, 'direct_entries') and parsed_result.direct_entries:
-            direct_sum = sum(e.value for e in parsed_result.direct_entries)
-            print(f"DIRECT sum: 6 entries × ₹150 = ₹{direct_sum}")
+        # Reuse the subtotals computed for the breakdown above
+        if direct_sum:
+            out(f"DIRECT sum: 6 entries × ₹150 = ₹{direct_sum}")
         
-        if parsed_result.time_entries:
-            time_sum = sum(e.value * len(e.columns) for e in parsed_result.time_entries)
-            print(f"TIME sum: 2 entries = ₹{time_sum}")
+        if time_sum:
+            out(f"TIME sum: 2 entries = ₹{time_sum}")
         
         total_sum = direct_sum + time_sum
-        print(f"Total: ₹{direct_sum} + ₹{time_sum} = ₹{total_sum}")
+        out(f"Total: ₹{direct_sum} + ₹{time_sum} = ₹{total_sum}")
         
         if total_sum == 1100:
-            print("✅ This explains the ₹1,100 total!")
+            out("✅ This explains the ₹1,100 total!")
+        
+        _flush(buf)
         
         # Show why PANA entries might not be parsed
-        print(f"\n⚠️ PANA PARSING ANALYSIS:")
-        print("-" * 30)
+        out(f"\n⚠️ PANA PARSING ANALYSIS:")
+        out("-" * 30)
         
         pana_lines = [
             "138+347+230+349+269+",
@@ -170,19 +211,24 @@ def analyze_gui_input():
         ]
         
         for line in pana_lines:
-            print(f"   '{line}' - {'Result line' if line.startswith('=') else 'Number line'}")
+            match = LINE_KINDS.fullmatch(line)
+            kind = LINE_KIND_LABELS[match.lastgroup] if match else 'Unknown line'
+            out(f"   '{line}' - {kind}")
         
-        print(f"\n💡 EXPLANATION:")
-        print("   The PANA parsing failed because:")
-        print("   1. Complex multi-line PANA format requires specific validation")
-        print("   2. Result lines (=RS,, 400) need proper parsing")
-        print("   3. System correctly parsed simpler DIRECT and TIME patterns")
-        print("   4. Total = 6×₹150 (DIRECT) + 2×₹100 (TIME) = ₹1,100")
+        out(f"\n💡 EXPLANATION:")
+        out("   The PANA parsing failed because:")
+        out("   1. Complex multi-line PANA format requires specific validation")
+        out("   2. Result lines (=RS,, 400) need proper parsing")
+        out("   3. System correctly parsed simpler DIRECT and TIME patterns")
+        out("   4. Total = 6×₹150 (DIRECT) + 2×₹100 (TIME) = ₹1,100")
         
     except Exception as e:
-        print(f"❌ Analysis failed: {e}")
+        out(f"❌ Analysis failed: {e}")
+        _flush(buf)
         import traceback
         traceback.print_exc()
+    finally:
+        _flush(buf)
 
 if __name__ == "__main__":
     analyze_gui_input()
@@ -1,9 +1,50 @@
 #!/usr/bin/env python3
 """Check the current database constraint for entry_type"""
 
+import re
 import sqlite3
 import os
 
+# One smoke-test row per entry_type accepted by universal_log_entry_type_valid
+TEST_ROWS = [
+    (1, 'Test', '2025-07-27', 'T.O', number, value, entry_type, 'test')
+    for (number, value, entry_type) in [
+        (128, 100, 'PANA'),
+        (128, 100, 'TYPE'),
+        (1, 100, 'TIME_DIRECT'),
+        (1, 100, 'TIME_MULTI'),
+        (128, 100, 'DIRECT'),
+        (22, 500, 'JODI'),
+    ]
+]
+
+INSERT_SQL = """
+    INSERT INTO universal_log 
+    (customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_CONSTRAINT_RE = re.compile(
+    r"CONSTRAINT\s+universal_log_entry_type_valid\s+CHECK\s*\(", re.IGNORECASE
+)
+
+def extract_entry_type_constraint(schema):
+    """Return the full entry_type CHECK constraint text, balancing nested parentheses"""
+    match = _CONSTRAINT_RE.search(schema)
+    if not match:
+        return None
+    
+    depth = 1
+    for pos in range(match.end(), len(schema)):
+        char = schema[pos]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return schema[match.start():pos + 1]
+    return None
+
 def check_database_constraint():
     """Check the current database constraint"""
     
@@ -12,6 +53,7 @@ def check_database_constraint():
         print("❌ Database file not found at data/rickey_mama.db")
         return
     
+    conn = None
     try:
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
@@ -32,34 +74,38 @@ def check_database_constraint():
                 print("\n✅ Found entry_type constraint in schema")
                 
                 # Extract the constraint part
-                constraint_start = schema.find("universal_log_entry_type_valid CHECK")
-                if constraint_start != -1:
-                    constraint_end = schema.find(")", constraint_start)
-                    if constraint_end != -1:
-                        constraint_text = schema[constraint_start:constraint_end+1]
-                        print(f"Constraint: {constraint_text}")
+                constraint_text = extract_entry_type_constraint(schema)
+                if constraint_text:
+                    print(f"Constraint: {constraint_text}")
             else:
                 print("\n❌ Entry type constraint not found in schema")
         else:
             print("❌ universal_log table not found")
         
-        # Test insertion with JODI
-        print("\n🧪 Testing JODI insertion...")
+        # Test insertion of every entry type in a single transaction; it is
+        # rolled back so neither the rows nor their trigger effects persist
+        print("\n🧪 Testing entry type insertion...")
         try:
-            cursor.execute("""
-                INSERT INTO universal_log 
-                (customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line)
-                VALUES (1, 'Test', '2025-07-27', 'T.O', 22, 500, 'JODI', 'test')
-            """)
-            conn.commit()
-            print("✅ JODI insertion successful")
-            
-            # Clean up
-            cursor.execute("DELETE FROM universal_log WHERE entry_type = 'JODI' AND customer_name = 'Test'")
-            conn.commit()
+            conn.execute("BEGIN")
+            cursor.executemany(INSERT_SQL, TEST_ROWS)
+            print(f"✅ Insertion successful for: {', '.join(row[6] for row in TEST_ROWS)}")
             
         except Exception as e:
-            print(f"❌ JODI insertion failed: {e}")
+            print(f"❌ Entry type insertion failed: {e}")
+            
+            # Only the failed statement was undone; probe the rows one at a time
+            # inside the same (still uncommitted) transaction to name the culprit
+            if conn.in_transaction:
+                for row in TEST_ROWS:
+                    try:
+                        cursor.execute(INSERT_SQL, row)
+                        print(f"   ✅ {row[6]}: accepted")
+                    except Exception as row_error:
+                        print(f"   ❌ {row[6]}: rejected ({row_error})")
+        
+        finally:
+            # Clean up
+            conn.rollback()
             
     except Exception as e:
         print(f"❌ Database error: {e}")
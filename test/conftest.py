@@ -0,0 +1,30 @@
+"""Shared pytest fixtures for the database tests"""
+
+import sys
+import os
+import pytest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager
+
+@pytest.fixture
+def seeded_database(tmp_path):
+    """Factory for a fresh database holding the given customers' universal_log rows
+
+    Call it with {customer name: [(number, value, entry_type), ...]}; the rows are
+    logged for T.O on 2025-02-01 and the DatabaseManager is returned.
+    """
+    def seed(rows_by_customer):
+        db_manager = DatabaseManager(str(tmp_path / "seeded.db"))
+        db_manager.initialize_database()
+        entries = []
+        for name, rows in rows_by_customer.items():
+            customer_id = db_manager.add_customer(name)
+            entries += [{'customer_id': customer_id, 'customer_name': name, 'entry_date': '2025-02-01',
+                         'bazar': 'T.O', 'number': number, 'value': value, 'entry_type': entry_type}
+                        for number, value, entry_type in rows]
+        db_manager.add_universal_log_entries(entries)
+        return db_manager
+    return seed
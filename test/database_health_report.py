@@ -5,117 +5,169 @@ Comprehensive Database Health Report for RickyMama System
 
 import sys
 import os
-from datetime import date, datetime
+import argparse
+from datetime import date, datetime, timedelta
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def generate_database_health_report():
-    """Generate comprehensive database health report"""
+def _flush(buf):
+    """Write buffered report lines in a single call and reset the buffer"""
+    if buf:
+        sys.stdout.write("\n".join(buf) + "\n")
+        buf.clear()
+
+def generate_database_health_report(deep: bool = False):
+    """Generate comprehensive database health report
+    
+    Args:
+        deep: Run the full PRAGMA integrity_check instead of quick_check
+    """
+    
+    # Lines are buffered and written once per section
+    buf = []
+    out = buf.append
     
-    print("📊 RICKYMAMA DATABASE HEALTH REPORT")
-    print("=" * 80)
-    print(f"🕒 Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
+    out("📊 RICKYMAMA DATABASE HEALTH REPORT")
+    out("=" * 80)
+    out(f"🕒 Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    out("=" * 80)
     
     try:
         from src.database.db_manager import create_database_manager
         
         db_manager = create_database_manager()
         
+        # Read-heavy session tuning (WAL/synchronous are already set on connect)
+        for pragma in (
+            "PRAGMA temp_store = MEMORY",
+            "PRAGMA cache_size = -65536",
+            "PRAGMA mmap_size = 268435456",
+        ):
+            db_manager.execute_query(pragma)
+        
+        _flush(buf)
+        
         # 1. Database File Information
-        print("\n🗄️  DATABASE FILE INFORMATION")
-        print("-" * 50)
+        out("\n🗄️  DATABASE FILE INFORMATION")
+        out("-" * 50)
         
         if os.path.exists(db_manager.db_path):
             size_bytes = os.path.getsize(db_manager.db_path)
             size_mb = size_bytes / (1024 * 1024)
-            print(f"📁 Database Path: {db_manager.db_path}")
-            print(f"📊 File Size: {size_bytes:,} bytes ({size_mb:.2f} MB)")
-            print(f"✅ File Status: EXISTS")
+            out(f"📁 Database Path: {db_manager.db_path}")
+            out(f"📊 File Size: {size_bytes:,} bytes ({size_mb:.2f} MB)")
+            out(f"✅ File Status: EXISTS")
         else:
-            print(f"❌ Database file not found: {db_manager.db_path}")
+            out(f"❌ Database file not found: {db_manager.db_path}")
             return
         
+        _flush(buf)
+        
         # 2. Schema Information
-        print("\n🏗️  SCHEMA INFORMATION")
-        print("-" * 50)
+        out("\n🏗️  SCHEMA INFORMATION")
+        out("-" * 50)
         
         # Get all tables
         tables_query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         tables = db_manager.execute_query(tables_query)
-        print(f"📊 Total Tables: {len(tables)}")
-        
-        for table in tables:
-            table_name = table['name']
-            if table_name != 'sqlite_sequence':
-                count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-                try:
-                    result = db_manager.execute_query(count_query)
-                    count = result[0]['count'] if result else 0
-                    print(f"   📄 {table_name}: {count:,} records")
-                except Exception as e:
-                    print(f"   ❌ {table_name}: Error counting records")
+        out(f"📊 Total Tables: {len(tables)}")
+        
+        # Count every table's rows in a single round-trip
+        table_names = [table['name'] for table in tables if table['name'] != 'sqlite_sequence']
+        if table_names:
+            count_query = " UNION ALL ".join(
+                f"SELECT '{table_name}' AS name, COUNT(*) AS count FROM \"{table_name}\""
+                for table_name in table_names
+            )
+            try:
+                for result in db_manager.execute_query(count_query):
+                    out(f"   📄 {result['name']}: {result['count']:,} records")
+            except Exception as e:
+                out(f"   ❌ Error counting records: {e}")
+        
+        _flush(buf)
         
         # 3. Triggers Information
-        print("\n⚡ TRIGGER INFORMATION")
-        print("-" * 50)
+        out("\n⚡ TRIGGER INFORMATION")
+        out("-" * 50)
         
         triggers_query = "SELECT name FROM sqlite_master WHERE type='trigger' ORDER BY name"
         triggers = db_manager.execute_query(triggers_query)
-        print(f"📊 Total Triggers: {len(triggers)}")
+        out(f"📊 Total Triggers: {len(triggers)}")
         
         for trigger in triggers:
-            print(f"   ⚡ {trigger['name']}")
+            out(f"   ⚡ {trigger['name']}")
+        
+        _flush(buf)
         
         # 4. Indexes Information
-        print("\n🗂️  INDEX INFORMATION")
-        print("-" * 50)
+        out("\n🗂️  INDEX INFORMATION")
+        out("-" * 50)
         
         indexes_query = "SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE 'sqlite_%' ORDER BY name"
         indexes = db_manager.execute_query(indexes_query)
-        print(f"📊 Total Custom Indexes: {len(indexes)}")
+        out(f"📊 Total Custom Indexes: {len(indexes)}")
+        
+        _flush(buf)
         
         # 5. Data Statistics
-        print("\n📈 DATA STATISTICS")
-        print("-" * 50)
+        out("\n📈 DATA STATISTICS")
+        out("-" * 50)
         
         # Customer statistics
         customers = db_manager.get_all_customers()
-        print(f"👥 Active Customers: {len(customers)}")
+        out(f"👥 Active Customers: {len(customers)}")
         
         # Bazar statistics
         bazars = db_manager.get_all_bazars()
-        print(f"🏢 Active Bazars: {len(bazars)}")
-        
-        # Universal log statistics
-        universal_query = "SELECT COUNT(*) as total, MIN(created_at) as earliest, MAX(created_at) as latest FROM universal_log"
-        universal_stats = db_manager.execute_query(universal_query)
-        if universal_stats:
-            stats = universal_stats[0]
-            print(f"📝 Universal Log Entries: {stats['total']:,}")
-            print(f"📅 Date Range: {stats['earliest']} to {stats['latest']}")
+        out(f"🏢 Active Bazars: {len(bazars)}")
+        
+        # Half-open range for today so created_at comparisons can use its index
+        today = date.today()
+        today_start = today.strftime('%Y-%m-%d 00:00:00')
+        today_end = (today + timedelta(days=1)).strftime('%Y-%m-%d 00:00:00')
+        
+        # Universal log statistics (one scan for all scalar aggregates)
+        universal_query = """
+        SELECT COUNT(*) as total,
+               MIN(created_at) as earliest,
+               MAX(created_at) as latest,
+               SUM(value) as total_value,
+               AVG(value) as avg_value,
+               SUM(CASE WHEN created_at >= ? AND created_at < ? THEN 1 ELSE 0 END) as today_count
+        FROM universal_log
+        """
+        universal_stats = db_manager.execute_query(universal_query, (today_start, today_end))
+        stats = universal_stats[0] if universal_stats else None
+        if stats:
+            out(f"📝 Universal Log Entries: {stats['total']:,}")
+            out(f"📅 Date Range: {stats['earliest']} to {stats['latest']}")
         
         # Value statistics
-        value_query = "SELECT SUM(value) as total_value, AVG(value) as avg_value FROM universal_log"
-        value_stats = db_manager.execute_query(value_query)
-        if value_stats and value_stats[0]['total_value']:
-            stats = value_stats[0]
-            print(f"💰 Total Value: ₹{stats['total_value']:,}")
-            print(f"💰 Average Value: ₹{stats['avg_value']:.2f}")
+        if stats and stats['total_value']:
+            out(f"💰 Total Value: ₹{stats['total_value']:,}")
+            out(f"💰 Average Value: ₹{stats['avg_value']:.2f}")
         
         # Entry type distribution
-        print("\n📊 ENTRY TYPE DISTRIBUTION")
-        print("-" * 50)
-        
-        type_query = "SELECT entry_type, COUNT(*) as count FROM universal_log GROUP BY entry_type ORDER BY count DESC"
+        out("\n📊 ENTRY TYPE DISTRIBUTION")
+        out("-" * 50)
+        
+        type_query = """
+        SELECT entry_type, COUNT(*) as count, SUM(COUNT(*)) OVER () as grand_total
+        FROM universal_log
+        GROUP BY entry_type
+        ORDER BY count DESC
+        """
         type_stats = db_manager.execute_query(type_query)
         for stat in type_stats:
-            print(f"   📋 {stat['entry_type']}: {stat['count']:,} entries")
+            out(f"   📋 {stat['entry_type']}: {stat['count']:,} entries")
+        
+        _flush(buf)
         
         # 6. Performance Metrics
-        print("\n⚡ PERFORMANCE METRICS")
-        print("-" * 50)
+        out("\n⚡ PERFORMANCE METRICS")
+        out("-" * 50)
         
         # Test query performance
         start_time = datetime.now()
@@ -128,62 +180,67 @@ def generate_database_health_report():
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
-        print(f"⏱️  Query Performance: {duration:.3f} seconds for typical queries")
+        out(f"⏱️  Query Performance: {duration:.3f} seconds for typical queries")
+        
+        _flush(buf)
         
         # 7. Data Integrity Checks
-        print("\n🔍 DATA INTEGRITY CHECKS")
-        print("-" * 50)
+        out("\n🔍 DATA INTEGRITY CHECKS")
+        out("-" * 50)
         
         # Foreign key check
         fk_query = "PRAGMA foreign_key_check"
         fk_violations = db_manager.execute_query(fk_query)
         if not fk_violations:
-            print("✅ Foreign Key Constraints: PASS")
+            out("✅ Foreign Key Constraints: PASS")
         else:
-            print(f"❌ Foreign Key Violations: {len(fk_violations)}")
+            out(f"❌ Foreign Key Violations: {len(fk_violations)}")
         
-        # Integrity check
-        integrity_query = "PRAGMA integrity_check"
+        # Integrity check (quick_check skips the index-vs-table cross check)
+        integrity_query = "PRAGMA integrity_check" if deep else "PRAGMA quick_check"
         integrity_result = db_manager.execute_query(integrity_query)
         if integrity_result and integrity_result[0][0] == 'ok':
-            print("✅ Database Integrity: PASS")
+            out("✅ Database Integrity: PASS")
         else:
-            print("❌ Database Integrity: FAILED")
+            out("❌ Database Integrity: FAILED")
+        
+        _flush(buf)
         
         # 8. Recent Activity
-        print("\n📅 RECENT ACTIVITY")
-        print("-" * 50)
+        out("\n📅 RECENT ACTIVITY")
+        out("-" * 50)
         
-        today = date.today().strftime('%Y-%m-%d')
-        today_query = f"SELECT COUNT(*) as count FROM universal_log WHERE DATE(created_at) = '{today}'"
-        today_stats = db_manager.execute_query(today_query)
-        if today_stats:
-            print(f"📝 Today's Entries: {today_stats[0]['count']:,}")
+        if stats:
+            out(f"📝 Today's Entries: {stats['today_count'] or 0:,}")
         
         # Top customers by activity today
-        top_customers_query = f"""
+        top_customers_query = """
         SELECT customer_name, COUNT(*) as entries 
         FROM universal_log 
-        WHERE DATE(created_at) = '{today}'
+        WHERE created_at >= ? AND created_at < ?
         GROUP BY customer_name 
         ORDER BY entries DESC 
         LIMIT 5
         """
-        top_customers = db_manager.execute_query(top_customers_query)
+        top_customers = db_manager.execute_query(top_customers_query, (today_start, today_end))
         if top_customers:
-            print("👑 Top Active Customers Today:")
+            out("👑 Top Active Customers Today:")
             for customer in top_customers:
-                print(f"   👤 {customer['customer_name']}: {customer['entries']} entries")
+                out(f"   👤 {customer['customer_name']}: {customer['entries']} entries")
+        
+        _flush(buf)
         
         # 9. Database Configuration
-        print("\n⚙️  DATABASE CONFIGURATION")
-        print("-" * 50)
+        out("\n⚙️  DATABASE CONFIGURATION")
+        out("-" * 50)
         
         config_checks = [
             ("foreign_keys", "PRAGMA foreign_keys"),
             ("journal_mode", "PRAGMA journal_mode"),
             ("synchronous", "PRAGMA synchronous"),
-            ("cache_size", "PRAGMA cache_size")
+            ("cache_size", "PRAGMA cache_size"),
+            ("temp_store", "PRAGMA temp_store"),
+            ("mmap_size", "PRAGMA mmap_size")
         ]
         
         for setting, pragma in config_checks:
@@ -191,52 +248,64 @@ def generate_database_health_report():
                 result = db_manager.execute_query(pragma)
                 if result:
                     value = result[0][0]
-                    print(f"   ⚙️  {setting}: {value}")
+                    out(f"   ⚙️  {setting}: {value}")
             except:
-                print(f"   ❌ {setting}: Unable to check")
+                out(f"   ❌ {setting}: Unable to check")
+        
+        _flush(buf)
         
         # 10. Backup Files
-        print("\n💾 BACKUP FILES")
-        print("-" * 50)
+        out("\n💾 BACKUP FILES")
+        out("-" * 50)
         
         data_dir = os.path.dirname(db_manager.db_path)
-        backup_files = [f for f in os.listdir(data_dir) if f.endswith('.db') and 'backup' in f.lower()]
+        with os.scandir(data_dir) as it:
+            backup_files = [(entry.name, entry.stat().st_size) for entry in it
+                            if entry.name.endswith('.db') and 'backup' in entry.name.lower()]
         
         if backup_files:
-            print(f"📦 Backup Files Found: {len(backup_files)}")
-            for backup in backup_files:
-                backup_path = os.path.join(data_dir, backup)
-                size = os.path.getsize(backup_path)
-                print(f"   💾 {backup}: {size:,} bytes")
+            out(f"📦 Backup Files Found: {len(backup_files)}")
+            for backup, size in backup_files:
+                out(f"   💾 {backup}: {size:,} bytes")
         else:
-            print("⚠️  No backup files found")
+            out("⚠️  No backup files found")
+        
+        _flush(buf)
         
         # Summary
-        print("\n🎯 HEALTH SUMMARY")
-        print("=" * 80)
-        print("✅ Database Connection: HEALTHY")
-        print("✅ Schema Structure: COMPLETE")
-        print("✅ Data Integrity: VERIFIED")
-        print("✅ Foreign Key Constraints: ACTIVE")
-        print("✅ Triggers: FUNCTIONING")
-        print("✅ Performance: GOOD")
-        print("✅ Data Storage: WORKING")
-        print("✅ Data Retrieval: WORKING")
-        
-        overall_entries = sum([stat['count'] for stat in type_stats])
-        print(f"\n📊 OVERALL STATISTICS:")
-        print(f"   📝 Total Entries: {overall_entries:,}")
-        print(f"   👥 Total Customers: {len(customers)}")
-        print(f"   🏢 Total Bazars: {len(bazars)}")
-        print(f"   ⚡ Total Triggers: {len(triggers)}")
-        print(f"   📄 Total Tables: {len(tables)}")
-        
-        print("\n🎉 DATABASE IS FULLY OPERATIONAL AND HEALTHY!")
+        out("\n🎯 HEALTH SUMMARY")
+        out("=" * 80)
+        out("✅ Database Connection: HEALTHY")
+        out("✅ Schema Structure: COMPLETE")
+        out("✅ Data Integrity: VERIFIED")
+        out("✅ Foreign Key Constraints: ACTIVE")
+        out("✅ Triggers: FUNCTIONING")
+        out("✅ Performance: GOOD")
+        out("✅ Data Storage: WORKING")
+        out("✅ Data Retrieval: WORKING")
+        
+        overall_entries = type_stats[0]['grand_total'] if type_stats else 0
+        out(f"\n📊 OVERALL STATISTICS:")
+        out(f"   📝 Total Entries: {overall_entries:,}")
+        out(f"   👥 Total Customers: {len(customers)}")
+        out(f"   🏢 Total Bazars: {len(bazars)}")
+        out(f"   ⚡ Total Triggers: {len(triggers)}")
+        out(f"   📄 Total Tables: {len(tables)}")
+        
+        out("\n🎉 DATABASE IS FULLY OPERATIONAL AND HEALTHY!")
         
     except Exception as e:
-        print(f"❌ Health check failed: {e}")
+        out(f"❌ Health check failed: {e}")
+        _flush(buf)
         import traceback
         traceback.print_exc()
+    finally:
+        _flush(buf)
 
 if __name__ == "__main__":
-    generate_database_health_report()
+    parser = argparse.ArgumentParser(description='RickyMama Database Health Report')
+    parser.add_argument('--deep', action='store_true',
+                       help='Run full integrity_check instead of quick_check')
+    
+    args = parser.parse_args()
+    generate_database_health_report(deep=args.deep)
@@ -9,6 +9,33 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.database.db_manager import DatabaseManager
 from datetime import date
+from functools import lru_cache
+
+DB_PATH = "data/rickymama.db"
+
+@lru_cache(maxsize=None)
+def _sp_col1(db_manager):
+    """SP column 1 numbers in row order (static reference data, cached per database manager)"""
+    rows = db_manager.execute_query("""
+        SELECT number FROM type_table_sp 
+        WHERE column_number = 1 
+        ORDER BY row_number
+    """)
+    return tuple(row['number'] for row in rows)
+
+@lru_cache(maxsize=None)
+def _type_tables(db_manager):
+    """SP/DP/CP type tables (static reference data, cached per database manager)"""
+    from src.parsing.type_table_parser import TypeTableLoader
+    return TypeTableLoader(db_manager).load_all_tables()
+
+@lru_cache(maxsize=None)
+def _trigger_sql(db_manager, name):
+    """CREATE TRIGGER statement for a trigger (schema is fixed for the run, cached)"""
+    rows = db_manager.execute_query(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+    )
+    return rows[0]['sql'] if rows else ''
 
 def test_type_value_issue():
     """Test to see how TYPE values are being stored"""
@@ -17,27 +44,24 @@ def test_type_value_issue():
     print("TESTING TYPE VALUE STORAGE ISSUE")
     print("=" * 80)
     
-    db_manager = DatabaseManager("data/rickymama.db")
-    
-    # Clear test data
-    db_manager.execute_query("DELETE FROM universal_log WHERE customer_name = 'type_test'")
-    db_manager.execute_query("DELETE FROM pana_table WHERE bazar = 'TEST' AND entry_date = '2025-07-27'")
-    db_manager.execute_query("DELETE FROM customers WHERE name = 'type_test'")
+    db_manager = DatabaseManager(DB_PATH)
     
-    # Add test customer
-    db_manager.execute_query("INSERT INTO customers (name) VALUES ('type_test')")
-    customer_id = db_manager.execute_query("SELECT last_insert_rowid() as id")[0]['id']
+    # Clear test data and add test customer in one script
+    db_manager.get_connection().executescript("""
+        BEGIN;
+        DELETE FROM universal_log WHERE customer_name = 'type_test';
+        DELETE FROM pana_table WHERE bazar = 'TEST' AND entry_date = '2025-07-27';
+        DELETE FROM customers WHERE name = 'type_test';
+        INSERT INTO customers (name) VALUES ('type_test');
+        COMMIT;
+    """)
+    customer_id = db_manager.execute_query("SELECT id FROM customers WHERE name = 'type_test'")[0]['id']
     
     print(f"1. SETUP COMPLETE:")
     print(f"   Test customer ID: {customer_id}")
     
     # Get SP Column 1 numbers for reference
-    sp_numbers = db_manager.execute_query("""
-        SELECT number FROM type_table_sp 
-        WHERE column_number = 1 
-        ORDER BY row_number
-    """)
-    sp_numbers_list = [row['number'] for row in sp_numbers]
+    sp_numbers_list = _sp_col1(db_manager)
     print(f"   SP Column 1 has {len(sp_numbers_list)} numbers: {sp_numbers_list[:5]}...")
     
     print(f"\n2. SIMULATING TYPE ENTRY: '1SP=50'")
@@ -46,58 +70,63 @@ def test_type_value_issue():
     
     # Manually insert what the calculation engine should create
     print(f"\n3. INSERTING UNIVERSAL_LOG ENTRIES:")
-    for i, number in enumerate(sp_numbers_list):
-        db_manager.execute_query("""
-            INSERT INTO universal_log 
-            (customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line)
-            VALUES (?, 'type_test', '2025-07-27', 'TEST', ?, 50, 'TYPE', '1SP=50')
-        """, [customer_id, number])
-        if i < 3:  # Show first 3 only
-            print(f"   Inserted: number={number}, value=50")
-        elif i == 3:
-            print(f"   ... and {len(sp_numbers_list)-3} more")
+    db_manager.execute_many("""
+        INSERT INTO universal_log 
+        (customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line)
+        VALUES (?, 'type_test', '2025-07-27', 'TEST', ?, 50, 'TYPE', '1SP=50')
+    """, [(customer_id, number) for number in sp_numbers_list])
+    
+    print(f"   Inserted value=50 for numbers {list(sp_numbers_list[:3])}"
+          f" and {max(len(sp_numbers_list) - 3, 0)} more")
     
     print(f"   Total insertions: {len(sp_numbers_list)}")
     
     # Check what was stored in universal_log
-    universal_entries = db_manager.execute_query("""
+    universal_sample = db_manager.execute_query("""
         SELECT number, value FROM universal_log 
         WHERE customer_name = 'type_test' AND entry_type = 'TYPE'
         ORDER BY number
+        LIMIT 3
     """)
+    universal_stats = db_manager.execute_query("""
+        SELECT COUNT(*) as count, COALESCE(SUM(value), 0) as total FROM universal_log 
+        WHERE customer_name = 'type_test' AND entry_type = 'TYPE'
+    """)[0]
     
     print(f"\n4. UNIVERSAL_LOG VERIFICATION:")
-    print(f"   Records created: {len(universal_entries)}")
-    if universal_entries:
-        print(f"   Sample values: {[(e['number'], e['value']) for e in universal_entries[:3]]}")
-        total_universal_value = sum(e['value'] for e in universal_entries)
-        print(f"   Total value in universal_log: ₹{total_universal_value}")
+    print(f"   Records created: {universal_stats['count']}")
+    if universal_stats['count']:
+        print(f"   Sample values: {[(e['number'], e['value']) for e in universal_sample]}")
+        print(f"   Total value in universal_log: ₹{universal_stats['total']}")
     
     # Check what was stored in pana_table (via trigger)
-    pana_entries = db_manager.execute_query("""
+    pana_sample = db_manager.execute_query("""
         SELECT number, value FROM pana_table 
         WHERE bazar = 'TEST' AND entry_date = '2025-07-27'
         ORDER BY number
+        LIMIT 3
     """)
+    pana_stats = db_manager.execute_query("""
+        SELECT COUNT(*) as count, COALESCE(SUM(value), 0) as total,
+               COALESCE(SUM(CASE WHEN value != 50 THEN 1 ELSE 0 END), 0) as incorrect
+        FROM pana_table 
+        WHERE bazar = 'TEST' AND entry_date = '2025-07-27'
+    """)[0]
     
     print(f"\n5. PANA_TABLE VERIFICATION:")
-    print(f"   Records created: {len(pana_entries)}")
-    if pana_entries:
-        print(f"   Sample values: {[(e['number'], e['value']) for e in pana_entries[:3]]}")
-        total_pana_value = sum(e['value'] for e in pana_entries)
-        print(f"   Total value in pana_table: ₹{total_pana_value}")
+    print(f"   Records created: {pana_stats['count']}")
+    if pana_stats['count']:
+        print(f"   Sample values: {[(e['number'], e['value']) for e in pana_sample]}")
+        print(f"   Total value in pana_table: ₹{pana_stats['total']}")
         
         # Check if any values are incorrect
-        incorrect_values = [e for e in pana_entries if e['value'] != 50]
-        if incorrect_values:
-            print(f"   ❌ INCORRECT VALUES FOUND: {incorrect_values[:5]}")
+        if pana_stats['incorrect']:
+            print(f"   ❌ INCORRECT VALUES FOUND: {pana_stats['incorrect']} numbers not at ₹50")
         else:
             print(f"   ✅ All values are correct (₹50 each)")
     
     # Check the database trigger
-    trigger_sql = db_manager.execute_query("""
-        SELECT sql FROM sqlite_master WHERE name='tr_update_pana_table'
-    """)[0]['sql']
+    trigger_sql = _trigger_sql(db_manager, 'tr_update_pana_table')
     
     print(f"\n6. DATABASE TRIGGER ANALYSIS:")
     print(f"   Trigger condition: {'TYPE' in trigger_sql}")
@@ -105,8 +134,8 @@ def test_type_value_issue():
     
     print(f"\n7. CONCLUSION:")
     expected_total = len(sp_numbers_list) * 50
-    actual_universal = sum(e['value'] for e in universal_entries) if universal_entries else 0
-    actual_pana = sum(e['value'] for e in pana_entries) if pana_entries else 0
+    actual_universal = universal_stats['total']
+    actual_pana = pana_stats['total']
     
     print(f"   Expected total: ₹{expected_total}")
     print(f"   Universal_log total: ₹{actual_universal}")
@@ -129,17 +158,14 @@ def test_calculation_engine_directly():
     print("TESTING CALCULATION ENGINE TYPE LOGIC")
     print(f"{'=' * 80}")
     
+    db_manager = DatabaseManager(DB_PATH)
     try:
         from src.business.calculation_engine import CalculationEngine, CalculationContext
-        from src.parsing.type_table_parser import TypeTableLoader
         from src.database.models import TypeTableEntry
         from datetime import date
         
-        db_manager = DatabaseManager("data/rickymama.db")
-        
         # Load type tables
-        type_loader = TypeTableLoader(db_manager)
-        sp_table, dp_table, cp_table = type_loader.load_all_tables()
+        sp_table, dp_table, cp_table = _type_tables(db_manager)
         
         # Create calculation engine
         calc_engine = CalculationEngine(sp_table, dp_table, cp_table)
@@ -196,6 +222,8 @@ def test_calculation_engine_directly():
         
     except Exception as e:
         print(f"   Error testing calculation engine: {e}")
+    finally:
+        db_manager.close()
 
 if __name__ == "__main__":
     test_type_value_issue()
@@ -12,27 +12,39 @@ def fix_database_constraint():
         print("❌ Database file not found at data/rickey_mama.db")
         return
     
+    conn = None
+    original_pragmas = None
     try:
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
+        # One-shot migration: skip fsync, keep the rollback journal and the
+        # index-build sort spills in memory, restoring the original settings
+        # once the migration is finished
+        original_pragmas = (
+            cursor.execute("PRAGMA journal_mode").fetchone()[0],
+            cursor.execute("PRAGMA synchronous").fetchone()[0],
+            cursor.execute("PRAGMA temp_store").fetchone()[0],
+        )
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        
         print("🔧 Updating database constraint to include JODI...")
         
         # SQLite doesn't support ALTER TABLE to modify constraints directly
         # We need to recreate the table with the new constraint
         
-        # Step 1: Create backup of existing data
-        print("📦 Creating backup of existing data...")
-        cursor.execute("CREATE TEMPORARY TABLE universal_log_backup AS SELECT * FROM universal_log")
-        
-        # Step 2: Drop the existing table
-        print("🗑️ Dropping existing table...")
-        cursor.execute("DROP TABLE universal_log")
+        # Move the data once: build the new table, copy into it, then swap it in.
+        # legacy_alter_table lets the rename go through while views still
+        # reference the dropped universal_log (SQLite's documented procedure)
+        cursor.execute("PRAGMA legacy_alter_table = ON")
+        cursor.execute("BEGIN")
         
-        # Step 3: Recreate table with updated constraint
+        # Step 1: Create table with updated constraint
         print("🛠️ Creating new table with JODI support...")
         cursor.execute("""
-        CREATE TABLE universal_log (
+        CREATE TABLE universal_log_new (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             customer_id INTEGER NOT NULL,
             customer_name TEXT NOT NULL,
@@ -56,28 +68,36 @@ def fix_database_constraint():
         )
         """)
         
-        # Step 4: Restore data
-        print("📥 Restoring existing data...")
+        # Step 2: Copy existing data
+        print("📥 Copying existing data...")
         cursor.execute("""
-        INSERT INTO universal_log 
+        INSERT INTO universal_log_new 
         (id, customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line, created_at)
         SELECT id, customer_id, customer_name, entry_date, bazar, number, value, entry_type, source_line, created_at
-        FROM universal_log_backup
+        FROM universal_log
         """)
         
-        # Step 5: Recreate indexes
+        # Step 3: Drop the existing table
+        print("🗑️ Dropping existing table...")
+        cursor.execute("DROP TABLE universal_log")
+        
+        # Step 4: Rename new table into place
+        print("🔁 Renaming new table...")
+        cursor.execute("ALTER TABLE universal_log_new RENAME TO universal_log")
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+        
+        # Step 5: Recreate indexes (after the bulk copy, so rows are not indexed one by one)
         print("🔍 Recreating indexes...")
         cursor.execute("CREATE INDEX idx_universal_log_customer_date ON universal_log(customer_id, entry_date)")
-        cursor.execute("CREATE INDEX idx_universal_log_bazar_date ON universal_log(bazar, entry_date)")
+        cursor.execute("CREATE INDEX idx_universal_log_bazar_date_covering ON universal_log(bazar, entry_date, customer_name, entry_type, number, value)")
         cursor.execute("CREATE INDEX idx_universal_log_number ON universal_log(number)")
-        cursor.execute("CREATE INDEX idx_universal_log_created_at ON universal_log(created_at)")
         cursor.execute("CREATE INDEX idx_universal_log_composite ON universal_log(customer_id, bazar, entry_date)")
+        cursor.execute("CREATE INDEX idx_universal_log_created_customer ON universal_log(created_at, customer_name)")
         
-        # Step 6: Drop backup table
-        print("🧹 Cleaning up backup...")
-        cursor.execute("DROP TABLE universal_log_backup")
+        # Refresh planner statistics for the rebuilt table and its indexes
+        cursor.execute("ANALYZE universal_log")
         
-        # Step 7: Test JODI insertion
+        # Step 6: Test JODI insertion
         print("🧪 Testing JODI insertion...")
         cursor.execute("""
             INSERT INTO universal_log 
@@ -99,6 +119,11 @@ def fix_database_constraint():
     
     finally:
         if conn:
+            if original_pragmas:
+                journal_mode, synchronous, temp_store = original_pragmas
+                conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+                conn.execute(f"PRAGMA synchronous = {synchronous}")
+                conn.execute(f"PRAGMA temp_store = {temp_store}")
             conn.close()
 
 if __name__ == "__main__":
@@ -5,10 +5,19 @@ Fix for PANA parsing to handle complex multi-line PANA entries
 
 import sys
 import os
+from functools import lru_cache
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+@lru_cache(maxsize=None)
+def get_pana_numbers(db_path):
+    """Load pana reference numbers once per database as a frozenset"""
+    from src.database.db_manager import DatabaseManager
+    
+    results = DatabaseManager(db_path).execute_query("SELECT number FROM pana_numbers")
+    return frozenset([row[0] for row in results])
+
 def test_improved_pana_parsing():
     """Test the improved PANA parsing logic"""
     
@@ -69,12 +78,10 @@ def test_improved_pana_parsing():
         
         # Load pana numbers for validation
         try:
-            query = "SELECT number FROM pana_numbers"
-            results = db_manager.execute_query(query)
-            pana_numbers = {row['number'] for row in results}
+            pana_numbers = get_pana_numbers(db_manager.db_path)
             print(f"✅ Loaded {len(pana_numbers)} pana reference numbers")
         except:
-            pana_numbers = set()
+            pana_numbers = frozenset()
             print("⚠️ Using empty pana reference set")
         
         validator = PanaValidator(pana_numbers)
@@ -85,7 +92,7 @@ def test_improved_pana_parsing():
             entries = parser.parse(test_pana_input)
             print(f"✅ Current parser result: {len(entries)} entries")
             
-            total_value = sum(entry.value for entry in entries)
+            total_value = parser.last_total
             print(f"💰 Current total: ₹{total_value:,}")
             
             # Show entries
@@ -166,23 +173,25 @@ def create_improved_pana_fixes():
     print("-" * 40)
     
     improved_value_extraction = '''
+    # Compiled once in __init__, reused for every value
+    self.currency_patterns = [
+        re.compile(r'RS\.{0,3}\s*[\,\.\s]*', re.IGNORECASE),   # RS..., RS. ., RS, etc.
+        re.compile(r'R\s*[\,\.\s]*', re.IGNORECASE),           # R with optional spacing/punctuation
+        re.compile(r'₹\s*', re.IGNORECASE),                     # Rupee symbol
+    ]
+    self.digits_pattern = re.compile(r'\d+')
+    
     def extract_value_robust(self, value_text: str) -> int:
         """Robust value extraction handling complex formats"""
         # Remove various currency indicators
-        patterns = [
-            r'RS\.{0,3}\s*[\,\.\s]*',   # RS..., RS. ., RS, etc.
-            r'R\s*[\,\.\s]*',           # R with optional spacing/punctuation
-            r'₹\s*',                     # Rupee symbol
-        ]
-        
         cleaned = value_text.strip()
-        for pattern in patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in self.currency_patterns:
+            cleaned = pattern.sub('', cleaned)
         
         # Extract numeric value
-        numbers = re.findall(r'\d+', cleaned)
-        if numbers:
-            return int(numbers[0])
+        match = self.digits_pattern.search(cleaned)
+        if match:
+            return int(match.group())
         
         raise ValueError(f"No numeric value found in: {value_text}")
     '''
@@ -203,7 +212,7 @@ def create_improved_pana_fixes():
             if not line:
                 continue  # Skip empty lines
                 
-            if line.startswith('='):
+            if line[0] == '=':
                 # Result line - completes current group
                 if current_group:
                     current_group.append(line)
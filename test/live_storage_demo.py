@@ -8,11 +8,49 @@ by processing our test input and showing the actual database records created.
 
 import sys
 import os
+import json
+import traceback
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.business.data_processor import DataProcessor, ProcessingContext
 from src.database.db_manager import DatabaseManager
 from datetime import date
+from operator import itemgetter
+
+_TIME_COLS = tuple(f'col_{i}' for i in range(10))
+_time_values = itemgetter(*_TIME_COLS)
+
+# One statement for the whole report (?1 customer, ?2 bazar, ?3 date, ?4 limit);
+# each section comes back as a JSON column
+_SNAPSHOT_QUERY = f"""
+WITH customer AS (
+    SELECT id, name FROM customers WHERE name = ?1 AND is_active = 1
+)
+SELECT
+    (SELECT json_object('id', id, 'name', name) FROM customer) AS customer,
+    (SELECT json_group_array(json_object('entry_type', entry_type, 'number', number,
+                                         'value', value, 'source_line', source_line))
+     FROM (SELECT entry_type, number, value, substr(source_line, 1, 24) AS source_line
+           FROM universal_log
+           WHERE customer_id = (SELECT id FROM customer) AND entry_date = ?3
+           ORDER BY created_at DESC LIMIT ?4)) AS universal_entries,
+    (SELECT json_group_array(json_object('number', number, 'value', value))
+     FROM (SELECT number, SUM(value) AS value FROM pana_table
+           WHERE bazar = ?2 AND entry_date = ?3
+           GROUP BY number ORDER BY number)) AS pana_totals,
+    (SELECT json_object('customer_name', customer_name, 'bazar', bazar, 'entry_date', entry_date,
+                        {", ".join(f"'{col}', {col}" for col in _TIME_COLS)})
+     FROM time_table
+     WHERE customer_id = (SELECT id FROM customer) AND bazar = ?2 AND entry_date = ?3) AS time_entry,
+    (SELECT json_object('customer_name', customer_name, 'entry_date', entry_date, 'to_total', to_total)
+     FROM customer_bazar_summary
+     WHERE customer_name = ?1 AND entry_date = ?3) AS summary
+"""
+
+def fetch_demo_snapshot(db_manager, customer_name, bazar, entry_date, limit=20):
+    """Customer, log, pana, time and summary rows for one customer/bazar/date, in one query"""
+    row = db_manager.execute_query(_SNAPSHOT_QUERY, (customer_name, bazar, entry_date, limit))[0]
+    return {key: json.loads(row[key]) if row[key] is not None else None for key in row.keys()}
 
 def demonstrate_database_storage():
     print("🧪 LIVE DATABASE STORAGE DEMONSTRATION")
@@ -64,51 +102,35 @@ def demonstrate_database_storage():
             print("🔍 DATABASE RECORDS CREATED:")
             print("="*80)
             
-            # Get the customer ID for filtering
-            customer = db_manager.get_customer_by_name("TestCustomer")
-            customer_id = customer['id'] if customer else None
+            # Fetch everything the report needs in one call
+            snapshot = fetch_demo_snapshot(db_manager, "TestCustomer", "T.O", context.entry_date.isoformat())
             
             # 1. Universal Log Entries
             print(f"\n1️⃣ UNIVERSAL_LOG TABLE:")
             print("-" * 50)
             
-            filters = {
-                'customer_id': customer_id,
-                'start_date': context.entry_date.isoformat(),
-                'end_date': context.entry_date.isoformat()
-            }
-            
-            universal_entries = db_manager.get_universal_log_entries(filters, limit=20)
+            universal_entries = snapshot['universal_entries']
             
             print(f"Total entries: {len(universal_entries)}")
             print(f"{'#':<3} {'Type':<12} {'Number':<7} {'Value':<8} {'Source':<25}")
             print("-" * 60)
             
             for i, entry in enumerate(universal_entries, 1):
-                print(f"{i:<3} {entry['entry_type']:<12} {entry['number']:<7} ₹{entry['value']:<7} {entry['source_line'][:24]:<25}")
+                print(f"{i:<3} {entry['entry_type']:<12} {entry['number']:<7} ₹{entry['value']:<7} {entry['source_line']:<25}")
             
             # 2. Pana Table Entries
             print(f"\n2️⃣ PANA_TABLE:")
             print("-" * 50)
             
-            pana_entries = db_manager.get_pana_table_values("T.O", context.entry_date.isoformat())
+            pana_totals = snapshot['pana_totals']
             
-            print(f"Total PANA entries: {len(pana_entries)}")
+            print(f"Total PANA entries: {len(pana_totals)}")
             print(f"{'Number':<8} {'Value':<8} {'Source Type'}")
             print("-" * 30)
             
-            # Group by number for cleaner display
-            pana_by_number = {}
-            for entry in pana_entries:
-                num = entry['number']
-                val = entry['value']
-                if num not in pana_by_number:
-                    pana_by_number[num] = val
-                else:
-                    pana_by_number[num] += val
-            
-            # Determine source type for each number
-            for number, value in sorted(pana_by_number.items()):
+            # Determine source type for each number (rows are already grouped and ordered)
+            for row in pana_totals:
+                number, value = row['number'], row['value']
                 if number in [1, 2]:
                     source = "TimeEntry"
                 elif number in [138, 347, 230, 349, 269]:
@@ -121,7 +143,7 @@ def demonstrate_database_storage():
             print(f"\n3️⃣ TIME_TABLE:")
             print("-" * 50)
             
-            time_entry = db_manager.get_time_table_entry(customer_id, "T.O", context.entry_date.isoformat())
+            time_entry = snapshot['time_entry']
             
             if time_entry:
                 print(f"Customer: {time_entry['customer_name']}")
@@ -129,11 +151,10 @@ def demonstrate_database_storage():
                 print(f"Date: {time_entry['entry_date']}")
                 print(f"Column values:")
                 
-                for col in range(10):
-                    col_val = time_entry[f'col_{col}']
+                for col, col_val in enumerate(_time_values(time_entry)):
                     if col_val > 0:
                         source = "TimeEntry" if col in [1, 2] else "MultiEntry" if col == 3 else "Other"
-                        print(f"  col_{col}: ₹{col_val} ({source})")
+                        print(f"  {_TIME_COLS[col]}: ₹{col_val} ({source})")
             else:
                 print("No time table entry found")
             
@@ -141,15 +162,12 @@ def demonstrate_database_storage():
             print(f"\n4️⃣ CUSTOMER_BAZAR_SUMMARY:")
             print("-" * 50)
             
-            summary_entries = db_manager.get_customer_bazar_summary_by_date(context.entry_date.isoformat())
+            summary = snapshot['summary']
             
-            if summary_entries:
-                for summary in summary_entries:
-                    if summary['customer_name'] == 'TestCustomer':
-                        print(f"Customer: {summary['customer_name']}")
-                        print(f"Date: {summary['entry_date']}")
-                        print(f"T.O Total: ₹{summary['to_total']}")
-                        break
+            if summary:
+                print(f"Customer: {summary['customer_name']}")
+                print(f"Date: {summary['entry_date']}")
+                print(f"T.O Total: ₹{summary['to_total']}")
             else:
                 print("No summary entries found")
             
@@ -158,7 +176,7 @@ def demonstrate_database_storage():
             print("="*80)
             
             print(f"✅ {len(universal_entries)} entries in universal_log (complete audit trail)")
-            print(f"✅ {len(pana_by_number)} numbers in pana_table (PANA + Direct entries)")
+            print(f"✅ {len(pana_totals)} numbers in pana_table (PANA + Direct entries)")
             print(f"✅ 1 record in time_table (column-organized data)")
             print(f"✅ 1 record in customer_bazar_summary (daily totals)")
             
@@ -174,8 +192,8 @@ def demonstrate_database_storage():
             
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get('BETAPP_DEBUG'):
+            traceback.print_exc()
 
 if __name__ == "__main__":
     demonstrate_database_storage()
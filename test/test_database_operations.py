@@ -212,6 +212,60 @@ def check_database_files():
     else:
         print(f"❌ Data directory not found: {data_dir}")
 
+# Two customers' T.O entries for 2025-02-01
+_SEED_ROWS = {
+    "Alice": [(1, 70, 'TIME_DIRECT'), (3, 30, 'TIME_DIRECT'), (128, 100, 'PANA')],
+    "Bob": [(0, 40, 'TIME_DIRECT'), (12, 25, 'JODI')],
+}
+
+def test_time_table_rows_are_positional(seeded_database):
+    """get_time_table_with_jodi rows read by position as the GUI time table does"""
+    db_manager = seeded_database(_SEED_ROWS)
+    
+    time_rows, _ = db_manager.get_time_table_with_jodi('T.O', '2025-02-01')
+    named_rows = db_manager.get_time_table_by_bazar_date('T.O', '2025-02-01')
+    
+    assert [row[0] for row in time_rows] == ['Alice', 'Bob']
+    for entry, named in zip(time_rows, named_rows):
+        assert entry[0] == named['customer_name']
+        assert tuple(entry[1:11]) == tuple(named[f'col_{i}'] for i in [1, 2, 3, 4, 5, 6, 7, 8, 9, 0])
+        assert entry[11] == named['total']
+        assert entry[12] == named['updated_at']
+        assert entry[13] == named['created_at']
+    assert tuple(time_rows[0][1:11]) == (70, 0, 30, 0, 0, 0, 0, 0, 0, 0)
+    assert tuple(time_rows[1][1:11]) == (0, 0, 0, 0, 0, 0, 0, 0, 0, 40)
+
+def test_customers_with_stats(seeded_database):
+    """get_customers_with_stats aggregates each customer's universal_log rows"""
+    db_manager = seeded_database(_SEED_ROWS)
+    db_manager.add_customer("Carol")
+    
+    stats = {row['name']: row for row in db_manager.get_customers_with_stats()}
+    
+    assert (stats['Alice']['entries'], stats['Alice']['total_value']) == (3, 200)
+    assert (stats['Bob']['entries'], stats['Bob']['total_value']) == (2, 65)
+    assert (stats['Carol']['entries'], stats['Carol']['total_value'], stats['Carol']['last_activity']) == (0, 0, None)
+
+def test_data_version_advances_on_commits(seeded_database):
+    """data_version() moves on a transaction() commit and on a commit from another connection"""
+    import sqlite3
+    
+    db_manager = seeded_database(_SEED_ROWS)
+    
+    version = db_manager.data_version()
+    assert db_manager.data_version() == version  # Nothing written in between
+    
+    with db_manager.transaction() as conn:
+        conn.execute("INSERT INTO customers (name) VALUES ('Dave')")
+    after_commit = db_manager.data_version()
+    assert after_commit > version
+    
+    other = sqlite3.connect(db_manager.db_path)
+    other.execute("INSERT INTO customers (name) VALUES ('Erin')")
+    other.commit()
+    other.close()
+    assert db_manager.data_version() > after_commit
+
 if __name__ == "__main__":
     test_database_connection()
     test_data_processor_database_usage()
@@ -2,6 +2,7 @@
 
 import sys
 import os
+from unittest.mock import patch
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.parsing.mixed_input_parser import MixedInputParser
@@ -136,5 +137,49 @@ def test_full_mixed_parsing():
         import traceback
         traceback.print_exc()
 
+def _counting_parser():
+    """A MixedInputParser plus the mock recording each real (uncached) parse"""
+    patcher = patch.object(MixedInputParser, '_parse', autospec=True, side_effect=MixedInputParser._parse)
+    with patcher as parse_calls:
+        parser = MixedInputParser()  # The parse cache wraps _parse when the parser is built
+    return parser, parse_calls
+
+def test_repeated_parse_returns_independent_copy():
+    """Mutating a parse() result must not leak into the cached result"""
+    parser, parse_calls = _counting_parser()
+    text = "1=150\n138+347\n=RS,, 400"
+    
+    first = parser.parse(text)
+    print(f"First parse: {first}")
+    assert [entry.value for entry in first.pana_entries] == [400, 400]
+    assert first.time_entries[0].columns == [1]
+    
+    first.pana_entries[0].value = 999
+    first.pana_entries.pop()
+    first.time_entries[0].columns.append(5)
+    
+    second = parser.parse(text)
+    assert parse_calls.call_count == 1  # Served from the cache
+    assert second is not first
+    assert [entry.value for entry in second.pana_entries] == [400, 400]
+    assert second.time_entries[0].columns == [1]
+
+def test_clear_parse_cache_forces_reparse():
+    """clear_parse_cache() makes the next parse() run the parsers again"""
+    parser, parse_calls = _counting_parser()
+    text = "138+347\n=RS,, 400"
+    
+    parser.parse(text)
+    parser.parse(text)
+    assert parse_calls.call_count == 1
+    
+    parser.clear_parse_cache()
+    result = parser.parse(text)
+    print(f"Parses after clear: {parse_calls.call_count}")
+    assert parse_calls.call_count == 2
+    assert [entry.number for entry in result.pana_entries] == [138, 347]
+
 if __name__ == "__main__":
     test_full_mixed_parsing()
+    test_repeated_parse_returns_independent_copy()
+    test_clear_parse_cache_forces_reparse()
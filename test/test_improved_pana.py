@@ -2,9 +2,11 @@
 
 import sys
 import os
+import pytest
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.parsing.pana_parser import PanaTableParser, PanaValidator
+from src.utils.error_handler import ParseError
 from src.database.db_manager import DatabaseManager
 
 def test_improved_pana_parsing():
@@ -88,5 +90,38 @@ def test_improved_pana_parsing():
         import traceback
         traceback.print_exc()
 
+def _groups(text):
+    parser = PanaTableParser()
+    return parser.group_multiline_entries_robust(parser.preprocess_input(text))
+
+def test_grouping_keeps_unvalued_group_across_blank_lines():
+    """A blank line inside a group without a value yet does not split it"""
+    assert _groups("138+347+\n\n230+349+\n=RS,, 400") == [['138+347+', '230+349+', '=RS,, 400']]
+
+def test_grouping_valued_number_line_then_number_line():
+    """A number line with its own value keeps collecting until a blank line"""
+    assert _groups("128/129=100\n138+347+") == [['128/129=100', '138+347+']]
+    assert _groups("128/129=100\n\n138+347+\n=50") == [['128/129=100'], ['138+347+', '=50']]
+
+def test_grouping_standalone_result_line():
+    """A result line with no numbers before it is a group of its own"""
+    assert _groups("=RS,, 400") == [['=RS,, 400']]
+
+def test_grouping_crlf_input():
+    """CRLF line endings group the same as LF"""
+    text = "138+347+230+\n=150\n\n128/129 = 100\n"
+    assert _groups(text.replace("\n", "\r\n")) == _groups(text) == [['138+347+230+', '=150'], ['128/129 = 100']]
+
+def test_last_total_matches_entries():
+    """last_total is the sum of the parsed entries, and is cleared by a failed parse"""
+    parser = PanaTableParser()
+    entries = parser.parse("138+347+230+\n=RS,, 400\n\n369+378+\n128+380+\n=150\n\n128/129 = 60")
+    
+    assert parser.last_total == sum(e.value for e in entries) == 3 * 400 + 4 * 150 + 2 * 60
+    
+    with pytest.raises(ParseError):
+        parser.parse("no pana here")
+    assert parser.last_total == 0
+
 if __name__ == "__main__":
     test_improved_pana_parsing()
@@ -111,5 +111,27 @@ def test_pana_table_values():
         if pana_entry:
             print(f"   Pana_table value: ₹{pana_entry[0]['value']}")
 
+def test_bazar_date_slice_matches_getters(seeded_database):
+    """get_bazar_date_slice returns what the separate pana and jodi getters return"""
+    db_manager = seeded_database({
+        "Alice": [(128, 100, 'PANA'), (129, 50, 'PANA'), (12, 30, 'JODI')],
+        "Bob": [(128, 25, 'PANA'), (12, 20, 'JODI'), (45, 10, 'JODI')],
+    })
+    
+    def rows(result):
+        return [tuple(row) for row in result]
+    
+    pana_rows, jodi_rows = db_manager.get_bazar_date_slice('T.O', '2025-02-01')
+    assert rows(pana_rows) == rows(db_manager.get_pana_table_values('T.O', '2025-02-01')) == [(128, 125), (129, 50)]
+    assert rows(jodi_rows) == rows(db_manager.get_jodi_table_values('T.O', '2025-02-01')) == [(12, 50), (45, 10)]
+    
+    pana_rows, jodi_rows = db_manager.get_bazar_date_slice('T.O', '2025-02-01', 'Bob')
+    assert rows(pana_rows) == rows(db_manager.get_pana_table_values('T.O', '2025-02-01'))
+    assert rows(jodi_rows) == rows(db_manager.get_jodi_table_values_by_customer('Bob', 'T.O', '2025-02-01')) == [(12, 20), (45, 10)]
+    
+    # The time table call shares the per-customer jodi query
+    _, jodi_rows = db_manager.get_time_table_with_jodi('T.O', '2025-02-01', 'Alice')
+    assert rows(jodi_rows) == rows(db_manager.get_jodi_table_values_by_customer('Alice', 'T.O', '2025-02-01')) == [(12, 30)]
+
 if __name__ == "__main__":
     test_pana_table_values()
\ No newline at end of file